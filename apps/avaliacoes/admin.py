@@ -23,7 +23,8 @@ class AvaliacaoAdmin(admin.ModelAdmin):
     ]
     readonly_fields = ['avaliado_em']
     date_hierarchy = 'avaliado_em'
-    raw_id_fields = ['submissao', 'avaliador']
+    autocomplete_fields = ['avaliador']
+    raw_id_fields = ['submissao']
 
     fieldsets = (
         (None, {'fields': ('submissao', 'avaliador')}),
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('avaliacoes', '0001_initial'),
+        ('projetos', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='avaliacao',
+            index=models.Index(fields=['avaliado_em', 'id'], name='avaliacoes__avaliad_62be07_idx'),
+        ),
+    ]
@@ -7,8 +7,10 @@ Este módulo contém:
 from django.conf import settings
 from django.db import models
 
+from apps.core.models import AuditavelMixin
 
-class Avaliacao(models.Model):
+
+class Avaliacao(AuditavelMixin, models.Model):
     """
     Avaliação de uma submissão.
 
@@ -56,6 +58,7 @@ class Avaliacao(models.Model):
             models.Index(fields=['submissao', 'avaliado_em']),
             models.Index(fields=['avaliador']),
             models.Index(fields=['resultado']),
+            models.Index(fields=['avaliado_em', 'id']),
         ]
 
     def __str__(self):
@@ -0,0 +1,183 @@
+"""
+Avaliação de submissões.
+
+Este módulo contém:
+- TRANSICOES: status da submissão e do projeto para cada resultado
+- AvaliacaoRecusada: motivo (código e mensagem) de uma avaliação não realizada
+- avaliar: registra a avaliação (usado pela API e pelas views de template)
+
+A avaliação é feita em uma transação, sem carregar a submissão nem o projeto:
+
+1. UPDATE condicional da submissão para o novo status, apenas se ela ainda
+   está ENVIADA ou EM_AVALIACAO, com `RETURNING projeto_id`. Avaliações
+   simultâneas da mesma submissão são serializadas pelo bloqueio da linha:
+   só a primeira é registrada.
+2. INSERT da Avaliacao.
+3. UPDATE do status do projeto pela chave primária.
+
+Só quando a avaliação é recusada o motivo é apurado (submissão inexistente
+ou já avaliada). Os UPDATEs não disparam signals, então a auditoria das
+mudanças de status e a ação AVALIAR são registradas aqui.
+"""
+from collections import namedtuple
+
+from django.db import connection, transaction
+
+from apps.core import auditoria
+from apps.core.middleware import contexto_auditoria
+from apps.core.models import LogAuditoria
+from apps.projetos.models import Projeto, Submissao
+
+from .models import Avaliacao
+
+# Resultado da avaliação -> (status da submissão, status do projeto)
+TRANSICOES = {
+    Avaliacao.Resultado.APROVADO: (Submissao.Status.APROVADA, Projeto.Status.APROVADO),
+    Avaliacao.Resultado.REPROVADO: (Submissao.Status.REPROVADA, Projeto.Status.REPROVADO),
+    Avaliacao.Resultado.NECESSITA_AJUSTES: (
+        Submissao.Status.AJUSTES_SOLICITADOS,
+        Projeto.Status.AJUSTES,
+    ),
+}
+
+# Status da submissão que ainda aceitam avaliação
+STATUS_AVALIAVEIS = [Submissao.Status.ENVIADA, Submissao.Status.EM_AVALIACAO]
+
+# Avaliação registrada e os novos status (sem reler submissão e projeto)
+Avaliado = namedtuple(
+    'Avaliado',
+    ['avaliacao', 'projeto_id', 'status_submissao', 'status_projeto'],
+)
+
+
+class AvaliacaoRecusada(Exception):
+    """
+    Avaliação não realizada.
+
+    Atributos:
+        codigo: 'submissao_inexistente' ou 'ja_avaliada'
+        mensagem: Texto para o usuário
+    """
+
+    def __init__(self, codigo, mensagem):
+        super().__init__(mensagem)
+        self.codigo = codigo
+        self.mensagem = mensagem
+
+
+def _atualizar_submissao(submissao_id, status):
+    """
+    Muda o status da submissão se ela ainda aceita avaliação.
+
+    PostgreSQL e SQLite fazem isso em um `UPDATE ... RETURNING`; nos demais
+    bancos a linha é bloqueada e lida antes do UPDATE.
+
+    Returns:
+        ID do projeto da submissão, ou None se nenhuma linha foi alterada
+    """
+    if connection.vendor not in ('postgresql', 'sqlite'):
+        pendente = Submissao.objects.select_for_update().filter(
+            pk=submissao_id,
+            status__in=STATUS_AVALIAVEIS,
+        )
+        projeto_id = pendente.values_list('projeto_id', flat=True).first()
+        if projeto_id is not None:
+            pendente.update(status=status)
+        return projeto_id
+
+    meta = Submissao._meta
+    quote = connection.ops.quote_name
+    colunas = {
+        nome: quote(meta.get_field(nome).column)
+        for nome in ('id', 'status', 'deleted_at', 'projeto')
+    }
+    sql = (
+        'UPDATE {tabela} SET {status} = %s '
+        'WHERE {id} = %s AND {deleted_at} IS NULL AND {status} IN ({avaliaveis}) '
+        'RETURNING {projeto}'
+    ).format(
+        tabela=quote(meta.db_table),
+        avaliaveis=', '.join(['%s'] * len(STATUS_AVALIAVEIS)),
+        **colunas,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [status, submissao_id, *STATUS_AVALIAVEIS])
+        linha = cursor.fetchone()
+    return linha[0] if linha else None
+
+
+def _motivo(submissao_id):
+    if not Submissao.objects.filter(pk=submissao_id).exists():
+        return AvaliacaoRecusada('submissao_inexistente', 'Submissão não encontrada.')
+    return AvaliacaoRecusada('ja_avaliada', 'Esta submissão já foi avaliada.')
+
+
+def _auditar(avaliador, avaliado):
+    _, ip, user_agent = contexto_auditoria()
+    extras = {'ip_address': ip, 'user_agent': user_agent}
+    avaliacao = avaliado.avaliacao
+    auditoria.registrar(
+        avaliador,
+        LogAuditoria.Acao.ATUALIZAR,
+        'Submissao',
+        avaliacao.submissao_id,
+        dados_novos={'status': avaliado.status_submissao},
+        **extras,
+    )
+    auditoria.registrar(
+        avaliador,
+        LogAuditoria.Acao.ATUALIZAR,
+        'Projeto',
+        avaliado.projeto_id,
+        dados_novos={'status': avaliado.status_projeto},
+        **extras,
+    )
+    auditoria.registrar(
+        avaliador,
+        LogAuditoria.Acao.AVALIAR,
+        'Avaliacao',
+        avaliacao.pk,
+        dados_novos={'submissao': avaliacao.submissao_id, 'resultado': avaliacao.resultado},
+        **extras,
+    )
+
+
+def avaliar(avaliador, submissao_id, resultado, comentarios):
+    """
+    Avalia uma submissão ainda não avaliada.
+
+    Args:
+        avaliador: Administrador que avalia
+        submissao_id: ID da submissão (ENVIADA ou EM_AVALIACAO)
+        resultado: Valor de Avaliacao.Resultado
+        comentarios: Parecer
+
+    Returns:
+        Avaliado: (avaliacao, projeto_id, status_submissao, status_projeto)
+
+    Raises:
+        AvaliacaoRecusada: Submissão inexistente ou já avaliada
+    """
+    status_submissao, status_projeto = TRANSICOES[resultado]
+
+    with transaction.atomic():
+        projeto_id = _atualizar_submissao(submissao_id, status_submissao)
+        if projeto_id is None:
+            avaliado = None
+        else:
+            avaliacao = Avaliacao.objects.create(
+                submissao_id=submissao_id,
+                avaliador=avaliador,
+                resultado=resultado,
+                comentarios=comentarios,
+            )
+            Projeto.objects.filter(pk=projeto_id).update(
+                status=status_projeto,
+                updated_at=avaliacao.avaliado_em,
+            )
+            avaliado = Avaliado(avaliacao, projeto_id, status_submissao, status_projeto)
+            _auditar(avaliador, avaliado)
+
+    if avaliado is None:
+        raise _motivo(submissao_id)
+    return avaliado
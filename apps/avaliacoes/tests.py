@@ -0,0 +1,116 @@
+"""
+Testes do app avaliacoes.
+"""
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.contas.models import Usuario
+from apps.core.models import LogAuditoria
+from apps.editais.models import Edital
+from apps.projetos.models import Projeto, Submissao
+
+from .models import Avaliacao
+from .pareceres import AvaliacaoRecusada, avaliar
+
+
+@override_settings(AUDITORIA_SINCRONA=True)
+class AvaliarTest(TestCase):
+    """Avaliação por UPDATE ... RETURNING da submissão, com o motivo das recusas."""
+
+    def setUp(self):
+        self.admin = Usuario.objects.create_user(
+            cpf='00000000001', email='admin@ypetec.test', password='x', name='Admin', role='ADMIN',
+        )
+        aluno = Usuario.objects.create_user(
+            cpf='00000000002', email='aluno@ypetec.test', password='x', name='Aluno',
+        )
+        agora = timezone.now()
+        edital = Edital.objects.create(
+            titulo='Edital', descricao='d', status=Edital.Status.PUBLICADO,
+            inicio=agora - timedelta(days=1), fim=agora + timedelta(days=1), criado_por=self.admin,
+        )
+        self.projeto = Projeto.objects.create(
+            responsavel=aluno, titulo='Projeto', resumo='r', area='TI',
+            status=Projeto.Status.SUBMETIDO,
+        )
+        self.submissao = Submissao.objects.create(projeto=self.projeto, edital=edital)
+
+    def _avaliar(self, resultado=Avaliacao.Resultado.APROVADO, submissao_id=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return avaliar(self.admin, submissao_id or self.submissao.pk, resultado, 'Parecer')
+
+    def _recusa(self, codigo, mensagem, **kwargs):
+        with self.assertRaises(AvaliacaoRecusada) as contexto:
+            self._avaliar(**kwargs)
+        self.assertEqual(contexto.exception.codigo, codigo)
+        self.assertEqual(contexto.exception.mensagem, mensagem)
+
+    def test_avaliacao_registrada(self):
+        avaliado = self._avaliar()
+
+        self.assertEqual(avaliado.projeto_id, self.projeto.pk)
+        self.assertEqual(avaliado.status_submissao, Submissao.Status.APROVADA)
+        self.assertEqual(avaliado.status_projeto, Projeto.Status.APROVADO)
+        self.submissao.refresh_from_db()
+        self.projeto.refresh_from_db()
+        self.assertEqual(self.submissao.status, Submissao.Status.APROVADA)
+        self.assertEqual(self.projeto.status, Projeto.Status.APROVADO)
+        avaliacao = Avaliacao.objects.get()
+        self.assertEqual(avaliacao, avaliado.avaliacao)
+        self.assertEqual(avaliacao.avaliador, self.admin)
+
+        # CRIAR da Avaliacao vem do AuditavelMixin (usuário da requisição, aqui nenhum);
+        # os UPDATEs e a ação AVALIAR são auditados em pareceres.py, em nome do avaliador
+        self.assertCountEqual(
+            LogAuditoria.objects.values_list('acao', 'entidade', 'entidade_id'),
+            [
+                (LogAuditoria.Acao.CRIAR, 'Avaliacao', avaliacao.pk),
+                (LogAuditoria.Acao.ATUALIZAR, 'Submissao', self.submissao.pk),
+                (LogAuditoria.Acao.ATUALIZAR, 'Projeto', self.projeto.pk),
+                (LogAuditoria.Acao.AVALIAR, 'Avaliacao', avaliacao.pk),
+            ],
+        )
+        logs = LogAuditoria.objects.exclude(acao=LogAuditoria.Acao.CRIAR)
+        self.assertEqual({log.usuario_id for log in logs}, {self.admin.pk})
+        self.assertEqual(
+            logs.get(acao=LogAuditoria.Acao.ATUALIZAR, entidade='Projeto').dados_novos,
+            {'status': Projeto.Status.APROVADO},
+        )
+
+    def test_ajustes_devolvem_o_projeto_ao_aluno(self):
+        self._avaliar(Avaliacao.Resultado.NECESSITA_AJUSTES)
+
+        self.submissao.refresh_from_db()
+        self.projeto.refresh_from_db()
+        self.assertEqual(self.submissao.status, Submissao.Status.AJUSTES_SOLICITADOS)
+        self.assertEqual(self.projeto.status, Projeto.Status.AJUSTES)
+
+    def test_ja_avaliada(self):
+        self._avaliar(Avaliacao.Resultado.REPROVADO)
+        LogAuditoria.objects.all().delete()
+
+        self._recusa('ja_avaliada', 'Esta submissão já foi avaliada.')
+
+        self.submissao.refresh_from_db()
+        self.projeto.refresh_from_db()
+        self.assertEqual(self.submissao.status, Submissao.Status.REPROVADA)
+        self.assertEqual(self.projeto.status, Projeto.Status.REPROVADO)
+        self.assertEqual(Avaliacao.objects.count(), 1)
+        self.assertFalse(LogAuditoria.objects.exists())
+
+    def test_submissao_inexistente(self):
+        self._recusa(
+            'submissao_inexistente', 'Submissão não encontrada.',
+            submissao_id=self.submissao.pk + 1,
+        )
+        self.assertFalse(Avaliacao.objects.exists())
+
+    def test_submissao_excluida(self):
+        self.submissao.delete()
+
+        self._recusa('submissao_inexistente', 'Submissão não encontrada.')
+
+        self.projeto.refresh_from_db()
+        self.assertEqual(self.projeto.status, Projeto.Status.SUBMETIDO)
@@ -18,10 +18,13 @@ class AvaliacaoViewSet(viewsets.ModelViewSet):
     POST /api/evaluations/              - Cria avaliação (admin)
     GET  /api/evaluations/              - Lista avaliações (admin)
     GET  /api/evaluations/?submission=X - Avaliações de uma submissão
+
+    Listagem paginada por cursor com ?page_size= ou ?cursor=.
     """
 
     serializer_class = AvaliacaoSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
+    cursor_ordering = ('-avaliado_em', '-id')
 
     def get_queryset(self):
         queryset = Avaliacao.objects.select_related(
@@ -46,6 +49,10 @@ class AvaliacaoViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         avaliacao = serializer.save()
 
-        # Retorna a avaliação criada
+        # Retorna a avaliação criada (submissão/projeto e avaliador em uma consulta)
+        avaliacao = Avaliacao.objects.select_related(
+            'submissao__projeto',
+            'avaliador'
+        ).get(pk=avaliacao.pk)
         output_serializer = AvaliacaoSerializer(avaliacao)
         return Response(output_serializer.data, status=status.HTTP_201_CREATED)
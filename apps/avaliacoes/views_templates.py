@@ -3,13 +3,15 @@ Views de templates para o app Avaliações.
 """
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.shortcuts import get_object_or_404, redirect
+from django.http import Http404
+from django.shortcuts import redirect
 from django.views import View
 from django.views.generic import ListView
 
 from apps.projetos.models import Projeto, Submissao
 
 from .models import Avaliacao
+from .pareceres import TRANSICOES, AvaliacaoRecusada, avaliar
 
 
 class AdminRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
@@ -40,47 +42,29 @@ class AvaliarSubmissaoView(AdminRequiredMixin, View):
     """View para avaliar uma submissão."""
 
     def post(self, request, submissao_pk):
-        submissao = get_object_or_404(Submissao, pk=submissao_pk)
         resultado = request.POST.get('resultado')
         comentarios = request.POST.get('comentarios', '').strip()
 
         # Validar resultado
-        resultados_validos = ['APROVADO', 'REPROVADO', 'NECESSITA_AJUSTES']
-        if resultado not in resultados_validos:
+        if resultado not in TRANSICOES:
             messages.error(request, 'Selecione um resultado válido.')
             return redirect('avaliacoes:lista')
 
-        # Verificar se submissão pode ser avaliada
-        if submissao.status not in [Submissao.Status.ENVIADA, Submissao.Status.EM_AVALIACAO]:
-            messages.warning(request, 'Esta submissão já foi avaliada.')
+        try:
+            avaliar(request.user, submissao_pk, resultado, comentarios)
+        except AvaliacaoRecusada as recusa:
+            if recusa.codigo == 'submissao_inexistente':
+                raise Http404(recusa.mensagem)
+            messages.warning(request, recusa.mensagem)
             return redirect('avaliacoes:lista')
 
-        # Criar avaliação
-        Avaliacao.objects.create(
-            submissao=submissao,
-            avaliador=request.user,
-            resultado=resultado,
-            comentarios=comentarios
-        )
-
-        # Atualizar status da submissão e projeto
-        projeto = submissao.projeto
-
-        if resultado == 'APROVADO':
-            submissao.status = Submissao.Status.APROVADA
-            projeto.status = Projeto.Status.APROVADO
-            msg = f'Submissão de "{projeto.titulo}" APROVADA!'
-        elif resultado == 'REPROVADO':
-            submissao.status = Submissao.Status.REPROVADA
-            projeto.status = Projeto.Status.REPROVADO
-            msg = f'Submissão de "{projeto.titulo}" reprovada.'
-        else:  # NECESSITA_AJUSTES
-            submissao.status = Submissao.Status.AJUSTES_SOLICITADOS
-            projeto.status = Projeto.Status.AJUSTES
-            msg = f'Ajustes solicitados para "{projeto.titulo}".'
-
-        submissao.save()
-        projeto.save()
-
-        messages.success(request, msg)
+        titulo = Projeto.objects.filter(submissoes__pk=submissao_pk).values_list(
+            'titulo', flat=True
+        ).first()
+        mensagens = {
+            Avaliacao.Resultado.APROVADO: f'Submissão de "{titulo}" APROVADA!',
+            Avaliacao.Resultado.REPROVADO: f'Submissão de "{titulo}" reprovada.',
+            Avaliacao.Resultado.NECESSITA_AJUSTES: f'Ajustes solicitados para "{titulo}".',
+        }
+        messages.success(request, mensagens[resultado])
         return redirect('avaliacoes:lista')
@@ -0,0 +1 @@
+# App busca - busca textual em projetos, editais e publicações
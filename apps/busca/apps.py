@@ -0,0 +1,14 @@
+"""Configuração do app busca."""
+from django.apps import AppConfig
+
+
+class BuscaConfig(AppConfig):
+    """Configuração do app busca - busca textual (PostgreSQL tsvector / SQLite FTS5)."""
+
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.busca'
+    verbose_name = 'Busca'
+
+    def ready(self):
+        """Registra os signals do app."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,128 @@
+"""
+Indexação dos objetos pesquisáveis.
+
+Este módulo contém:
+- FONTES: o que indexar de cada modelo (Projeto, Edital, Publicacao)
+- indexar: grava/atualiza os documentos de objetos salvos
+- remover: apaga os documentos de objetos excluídos
+- reindexar: reconstrói os documentos de um tipo (ou de todos), em lotes
+
+Os documentos são gravados com INSERT ... ON CONFLICT DO UPDATE (um
+comando por lote); o índice textual acompanha sozinho (coluna gerada no
+PostgreSQL, triggers no SQLite — ver motor.py).
+"""
+from apps.editais.models import Edital
+from apps.projetos.models import Projeto
+from apps.publicacoes.models import Publicacao
+
+from . import motor
+from .models import DocumentoBusca
+
+Tipo = DocumentoBusca.Tipo
+
+# Documentos gravados por comando na reindexação
+TAMANHO_LOTE = 500
+
+
+def _projeto(projeto):
+    return {
+        'titulo': projeto.titulo,
+        'conteudo': f'{projeto.area}\n{projeto.resumo}',
+        'responsavel_id': projeto.responsavel_id,
+        'publico': False,
+    }
+
+
+def _edital(edital):
+    return {
+        'titulo': edital.titulo,
+        'conteudo': edital.descricao,
+        'responsavel_id': None,
+        'publico': edital.status != Edital.Status.RASCUNHO,
+    }
+
+
+def _publicacao(publicacao):
+    return {
+        'titulo': publicacao.projeto.titulo,
+        'conteudo': publicacao.descricao,
+        'responsavel_id': None,
+        'publico': publicacao.ativo,
+    }
+
+
+# tipo: (modelo, documento(instância) -> campos, select_related)
+FONTES = {
+    Tipo.PROJETO: (Projeto, _projeto, ()),
+    Tipo.EDITAL: (Edital, _edital, ()),
+    Tipo.PUBLICACAO: (Publicacao, _publicacao, ('projeto',)),
+}
+
+TIPO_POR_MODELO = {modelo: tipo for tipo, (modelo, _doc, _rel) in FONTES.items()}
+
+CAMPOS_DOCUMENTO = ['titulo', 'conteudo', 'responsavel_id', 'publico', 'atualizado_em']
+
+
+def indexar(tipo, instancias):
+    """Grava os documentos das instâncias (soft-deleted são removidas do índice)."""
+    _modelo, documento, _rel = FONTES[tipo]
+    vivas = [obj for obj in instancias if getattr(obj, 'deleted_at', None) is None]
+    excluidas = [obj.pk for obj in instancias if getattr(obj, 'deleted_at', None) is not None]
+
+    if vivas:
+        DocumentoBusca.objects.bulk_create(
+            [DocumentoBusca(tipo=tipo, objeto_id=obj.pk, **documento(obj)) for obj in vivas],
+            update_conflicts=True,
+            unique_fields=['tipo', 'objeto_id'],
+            update_fields=CAMPOS_DOCUMENTO,
+        )
+    if excluidas:
+        remover(tipo, excluidas)
+
+
+def indexar_ids(tipo, ids):
+    """Relê os objetos do banco e indexa (ex.: após restauração em lote)."""
+    modelo, _doc, select_related = FONTES[tipo]
+    ids = list(ids)
+    for inicio in range(0, len(ids), TAMANHO_LOTE):
+        lote = ids[inicio:inicio + TAMANHO_LOTE]
+        indexar(tipo, list(modelo.objects.select_related(*select_related).filter(pk__in=lote)))
+
+
+def remover(tipo, ids):
+    """Apaga os documentos dos objetos `ids`."""
+    return DocumentoBusca.objects.filter(tipo=tipo, objeto_id__in=list(ids)).delete()[0]
+
+
+def reindexar(tipos=None):
+    """
+    Reconstrói os documentos dos tipos informados (padrão: todos).
+
+    Returns:
+        dict: {tipo: documentos indexados}
+    """
+    resultado = {}
+    for tipo in tipos or FONTES:
+        modelo, _doc, select_related = FONTES[tipo]
+        objetos = modelo.objects.select_related(*select_related).order_by('pk')
+
+        total = 0
+        lote = []
+        for obj in objetos.iterator(chunk_size=TAMANHO_LOTE):
+            lote.append(obj)
+            if len(lote) == TAMANHO_LOTE:
+                indexar(tipo, lote)
+                total += len(lote)
+                lote = []
+        if lote:
+            indexar(tipo, lote)
+            total += len(lote)
+
+        # Documentos de objetos que não existem mais (ou foram excluídos)
+        DocumentoBusca.objects.filter(tipo=tipo).exclude(
+            objeto_id__in=modelo.objects.values('pk')
+        ).delete()
+        resultado[tipo] = total
+
+    motor.reconstruir_indice()
+    return resultado
@@ -0,0 +1,32 @@
+"""
+Comando: reconstrói os documentos de busca.
+
+Necessário após a instalação do app (objetos já existentes) ou depois de
+alterações em massa que não passam pelos signals (ex.: QuerySet.update).
+
+Uso:
+    python manage.py reindexar_busca
+    python manage.py reindexar_busca --tipo PROJETO --tipo EDITAL
+"""
+from django.core.management.base import BaseCommand
+
+from apps.busca import indexacao
+from apps.busca.models import DocumentoBusca
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói os documentos da busca textual.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tipo',
+            action='append',
+            choices=DocumentoBusca.Tipo.values,
+            help='Tipo a reindexar (pode repetir; padrão: todos).',
+        )
+
+    def handle(self, *args, **options):
+        resultado = indexacao.reindexar(options['tipo'])
+        for tipo, total in resultado.items():
+            self.stdout.write(f'{tipo}: {total} documentos indexados')
+        self.stdout.write(self.style.SUCCESS('Índice de busca reconstruído.'))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentoBusca',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('PROJETO', 'Projeto'), ('EDITAL', 'Edital'), ('PUBLICACAO', 'Publicação')], max_length=20, verbose_name='tipo')),
+                ('objeto_id', models.BigIntegerField(verbose_name='ID do objeto')),
+                ('titulo', models.CharField(max_length=200, verbose_name='título')),
+                ('conteudo', models.TextField(blank=True, default='', verbose_name='conteúdo')),
+                ('publico', models.BooleanField(default=False, verbose_name='público')),
+                ('atualizado_em', models.DateTimeField(auto_now=True, verbose_name='atualizado em')),
+                ('responsavel', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='responsável')),
+            ],
+            options={
+                'verbose_name': 'documento de busca',
+                'verbose_name_plural': 'documentos de busca',
+                'constraints': [models.UniqueConstraint(fields=('tipo', 'objeto_id'), name='unique_documento_busca')],
+            },
+        ),
+    ]
@@ -0,0 +1,92 @@
+"""
+Índice textual de DocumentoBusca, conforme o banco (consultado por apps/busca/motor.py).
+
+PostgreSQL: coluna gerada `vetor` (tsvector, 'portuguese') + índice GIN.
+SQLite: tabela FTS5 de conteúdo externo + triggers de sincronização.
+
+O SQL fica nesta migração (e não no código da aplicação) para que ela continue
+aplicando exatamente o mesmo esquema mesmo que o módulo de busca mude depois.
+"""
+from django.db import migrations
+
+DDL_POSTGRESQL = [
+    """
+    ALTER TABLE busca_documentobusca ADD COLUMN vetor tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese'::regconfig, coalesce(titulo, '')), 'A') ||
+        setweight(to_tsvector('portuguese'::regconfig, coalesce(conteudo, '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX busca_documentobusca_vetor_idx ON busca_documentobusca USING GIN (vetor)',
+]
+
+DDL_POSTGRESQL_REVERSO = [
+    'DROP INDEX IF EXISTS busca_documentobusca_vetor_idx',
+    'ALTER TABLE busca_documentobusca DROP COLUMN IF EXISTS vetor',
+]
+
+DDL_SQLITE = [
+    """
+    CREATE VIRTUAL TABLE busca_documentobusca_fts USING fts5(
+        titulo, conteudo,
+        content='busca_documentobusca', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER busca_documentobusca_fts_ai AFTER INSERT ON busca_documentobusca BEGIN
+        INSERT INTO busca_documentobusca_fts(rowid, titulo, conteudo)
+        VALUES (new.id, new.titulo, new.conteudo);
+    END
+    """,
+    """
+    CREATE TRIGGER busca_documentobusca_fts_ad AFTER DELETE ON busca_documentobusca BEGIN
+        INSERT INTO busca_documentobusca_fts(busca_documentobusca_fts, rowid, titulo, conteudo)
+        VALUES ('delete', old.id, old.titulo, old.conteudo);
+    END
+    """,
+    """
+    CREATE TRIGGER busca_documentobusca_fts_au AFTER UPDATE ON busca_documentobusca BEGIN
+        INSERT INTO busca_documentobusca_fts(busca_documentobusca_fts, rowid, titulo, conteudo)
+        VALUES ('delete', old.id, old.titulo, old.conteudo);
+        INSERT INTO busca_documentobusca_fts(rowid, titulo, conteudo)
+        VALUES (new.id, new.titulo, new.conteudo);
+    END
+    """,
+]
+
+DDL_SQLITE_REVERSO = [
+    'DROP TRIGGER IF EXISTS busca_documentobusca_fts_au',
+    'DROP TRIGGER IF EXISTS busca_documentobusca_fts_ad',
+    'DROP TRIGGER IF EXISTS busca_documentobusca_fts_ai',
+    'DROP TABLE IF EXISTS busca_documentobusca_fts',
+]
+
+
+# Banco -> (criação, remoção); nos demais bancos não há índice textual
+DDL = {
+    'postgresql': (DDL_POSTGRESQL, DDL_POSTGRESQL_REVERSO),
+    'sqlite': (DDL_SQLITE, DDL_SQLITE_REVERSO),
+}
+
+
+def criar_indice(apps, schema_editor):
+    criacao, _ = DDL.get(schema_editor.connection.vendor, ([], []))
+    for comando in criacao:
+        schema_editor.execute(comando)
+
+
+def remover_indice(apps, schema_editor):
+    _, remocao = DDL.get(schema_editor.connection.vendor, ([], []))
+    for comando in remocao:
+        schema_editor.execute(comando)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('busca', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indice, remover_indice),
+    ]
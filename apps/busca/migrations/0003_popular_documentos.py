@@ -0,0 +1,76 @@
+"""
+Documentos de busca dos projetos, editais e publicações já existentes.
+
+Depois desta migração os signals mantêm os documentos em dia; não é preciso
+rodar `reindexar_busca` no deploy. Usa os modelos históricos e os mesmos
+campos de apps/busca/indexacao.py (copiados aqui para que a migração não
+mude se a indexação mudar). Documentos já existentes não são alterados.
+"""
+from django.db import migrations
+
+TAMANHO_LOTE = 500
+
+
+def _gravar(DocumentoBusca, documentos):
+    for inicio in range(0, len(documentos), TAMANHO_LOTE):
+        DocumentoBusca.objects.bulk_create(
+            documentos[inicio:inicio + TAMANHO_LOTE],
+            ignore_conflicts=True,
+        )
+
+
+def popular_documentos(apps, schema_editor):
+    DocumentoBusca = apps.get_model('busca', 'DocumentoBusca')
+    Projeto = apps.get_model('projetos', 'Projeto')
+    Edital = apps.get_model('editais', 'Edital')
+    Publicacao = apps.get_model('publicacoes', 'Publicacao')
+
+    _gravar(DocumentoBusca, [
+        DocumentoBusca(
+            tipo='PROJETO',
+            objeto_id=projeto.pk,
+            titulo=projeto.titulo,
+            conteudo=f'{projeto.area}\n{projeto.resumo}',
+            responsavel_id=projeto.responsavel_id,
+            publico=False,
+        )
+        for projeto in Projeto._base_manager.filter(deleted_at__isnull=True).iterator()
+    ])
+    _gravar(DocumentoBusca, [
+        DocumentoBusca(
+            tipo='EDITAL',
+            objeto_id=edital.pk,
+            titulo=edital.titulo,
+            conteudo=edital.descricao,
+            publico=edital.status != 'RASCUNHO',
+        )
+        for edital in Edital._base_manager.filter(deleted_at__isnull=True).iterator()
+    ])
+    publicacoes = Publicacao._base_manager.filter(
+        deleted_at__isnull=True,
+        projeto__deleted_at__isnull=True,
+    ).select_related('projeto')
+    _gravar(DocumentoBusca, [
+        DocumentoBusca(
+            tipo='PUBLICACAO',
+            objeto_id=publicacao.pk,
+            titulo=publicacao.projeto.titulo,
+            conteudo=publicacao.descricao,
+            publico=publicacao.ativo,
+        )
+        for publicacao in publicacoes.iterator()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('busca', '0002_indice_textual'),
+        ('editais', '0003_sem_indice_completo_status'),
+        ('projetos', '0007_submissao_unica_viva'),
+        ('publicacoes', '0003_exclusao_logica'),
+    ]
+
+    operations = [
+        migrations.RunPython(popular_documentos, migrations.RunPython.noop),
+    ]
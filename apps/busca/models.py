@@ -0,0 +1,83 @@
+"""
+Modelos da busca textual do sistema YpeTec.
+
+Este módulo contém:
+- DocumentoBusca: texto indexado de um projeto, edital ou publicação
+
+O índice textual não aparece nos campos do modelo: é criado pela migração
+0002 conforme o banco (ver motor.py) — coluna `vetor` tsvector gerada a
+partir de título/conteúdo com índice GIN no PostgreSQL, tabela FTS5
+sincronizada por triggers no SQLite.
+"""
+from django.conf import settings
+from django.db import models
+
+
+class DocumentoBusca(models.Model):
+    """
+    Documento indexado para a busca (um por objeto de origem).
+
+    Mantido pelos signals do app (ver indexacao.py) e reconstruído com
+    `python manage.py reindexar_busca`.
+
+    Atributos:
+        tipo: Tipo do objeto de origem
+        objeto_id: ID do objeto de origem
+        titulo: Texto de maior peso na relevância
+        conteudo: Demais textos indexados
+        responsavel: Dono do objeto (vê o documento mesmo se não público)
+        publico: Visível para qualquer usuário
+    """
+
+    class Tipo(models.TextChoices):
+        """Tipos de objeto indexados."""
+        PROJETO = 'PROJETO', 'Projeto'
+        EDITAL = 'EDITAL', 'Edital'
+        PUBLICACAO = 'PUBLICACAO', 'Publicação'
+
+    tipo = models.CharField(
+        'tipo',
+        max_length=20,
+        choices=Tipo.choices,
+    )
+    objeto_id = models.BigIntegerField(
+        'ID do objeto',
+    )
+    titulo = models.CharField(
+        'título',
+        max_length=200,
+    )
+    conteudo = models.TextField(
+        'conteúdo',
+        blank=True,
+        default='',
+    )
+    responsavel = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='responsável',
+    )
+    publico = models.BooleanField(
+        'público',
+        default=False,
+    )
+    atualizado_em = models.DateTimeField(
+        'atualizado em',
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = 'documento de busca'
+        verbose_name_plural = 'documentos de busca'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tipo', 'objeto_id'],
+                name='unique_documento_busca',
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.get_tipo_display()} #{self.objeto_id}: {self.titulo}'
@@ -0,0 +1,86 @@
+"""
+Índice textual dependente do banco.
+
+Este módulo contém:
+- reconstruir_indice: reconstrói o índice a partir de DocumentoBusca
+- filtrar: aplica a busca e anota a relevância em um QuerySet de DocumentoBusca
+
+PostgreSQL: coluna `vetor` tsvector GERADA a partir de título (peso A) e
+conteúdo (peso B) com a configuração 'portuguese' (radicais, stopwords) e
+índice GIN. A coluna é recalculada pelo próprio banco a cada INSERT/UPDATE.
+
+SQLite: tabela virtual FTS5 de conteúdo externo, mantida por triggers
+sobre a tabela de documentos, com tokenizer que ignora acentos.
+Relevância por bm25 (título com peso 10).
+
+Outros bancos: busca por icontains, sem relevância.
+
+O índice (coluna/tabela FTS, triggers) é criado pela migração busca/0002.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import DocumentoBusca
+
+TABELA = DocumentoBusca._meta.db_table
+TABELA_FTS = f'{TABELA}_fts'
+CONFIGURACAO_PG = 'portuguese'
+
+# Termos considerados por busca (o resto da frase é ignorado)
+MAX_TERMOS = 8
+
+
+def reconstruir_indice():
+    """Reconstrói a tabela FTS5 (SQLite); no PostgreSQL a coluna gerada dispensa."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {TABELA_FTS}({TABELA_FTS}) VALUES ('rebuild')")
+
+
+def termos(texto):
+    """Palavras da busca (letras/dígitos), em minúsculas, no máximo MAX_TERMOS."""
+    return re.findall(r'[^\W_]+', texto.lower())[:MAX_TERMOS]
+
+
+def filtrar(queryset, texto):
+    """
+    Filtra documentos que contêm todos os termos (por prefixo) e anota `relevancia`.
+
+    Returns:
+        QuerySet: Documentos encontrados, ordenados por relevância
+    """
+    palavras = termos(texto)
+    if not palavras:
+        return queryset.none()
+
+    vendor = connection.vendor
+    if vendor == 'postgresql':
+        consulta = ' & '.join(f'{palavra}:*' for palavra in palavras)
+        tsquery = f"to_tsquery('{CONFIGURACAO_PG}'::regconfig, %s)"
+        queryset = queryset.filter(
+            RawSQL(f'{TABELA}.vetor @@ {tsquery}', [consulta], output_field=BooleanField())
+        ).annotate(
+            relevancia=RawSQL(f'ts_rank_cd({TABELA}.vetor, {tsquery})', [consulta], output_field=FloatField())
+        )
+    elif vendor == 'sqlite':
+        consulta = ' '.join(f'"{palavra}"*' for palavra in palavras)
+        queryset = queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s', [consulta])
+        ).annotate(
+            # bm25 é menor quanto mais relevante
+            relevancia=RawSQL(
+                f'(SELECT -bm25({TABELA_FTS}, 10.0, 1.0) FROM {TABELA_FTS} '
+                f'WHERE {TABELA_FTS} MATCH %s AND rowid = {TABELA}.id)',
+                [consulta],
+                output_field=FloatField(),
+            )
+        )
+    else:
+        for palavra in palavras:
+            queryset = queryset.filter(Q(titulo__icontains=palavra) | Q(conteudo__icontains=palavra))
+        queryset = queryset.annotate(relevancia=Value(0.0, output_field=FloatField()))
+
+    return queryset.order_by('-relevancia', '-id')
@@ -0,0 +1,27 @@
+"""
+Serializers do app busca.
+"""
+from rest_framework import serializers
+
+from .models import DocumentoBusca
+
+# Caracteres do conteúdo exibidos em cada resultado
+TAMANHO_TRECHO = 240
+
+
+class DocumentoBuscaSerializer(serializers.ModelSerializer):
+    """Resultado de busca: tipo e id do objeto de origem, título e trecho."""
+
+    id = serializers.IntegerField(source='objeto_id')
+    trecho = serializers.SerializerMethodField()
+    relevancia = serializers.FloatField()
+
+    class Meta:
+        model = DocumentoBusca
+        fields = ['id', 'tipo', 'titulo', 'trecho', 'relevancia']
+
+    def get_trecho(self, obj):
+        conteudo = ' '.join(obj.conteudo.split())
+        if len(conteudo) <= TAMANHO_TRECHO:
+            return conteudo
+        return conteudo[:TAMANHO_TRECHO].rsplit(' ', 1)[0] + '…'
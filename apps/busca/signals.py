@@ -0,0 +1,57 @@
+"""
+Signals do app busca.
+
+Mantém os documentos de busca em dia: salvar projeto, edital ou publicação
+atualiza o documento; excluir (definitiva ou logicamente) o remove; a
+restauração em lote (ver core/exclusao.py) o recria.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.exclusao import excluidos_logicamente, restaurados
+from apps.editais.models import Edital
+from apps.projetos.models import Projeto
+from apps.publicacoes.models import Publicacao
+
+from . import indexacao
+from .models import DocumentoBusca
+
+
+@receiver(post_save, sender=Projeto)
+@receiver(post_save, sender=Edital)
+@receiver(post_save, sender=Publicacao)
+def indexar_objeto(sender, instance, raw=False, **kwargs):
+    """Objeto criado ou alterado: regrava o documento."""
+    if raw:
+        return
+    indexacao.indexar(indexacao.TIPO_POR_MODELO[sender], [instance])
+
+    # O título da publicação é o do projeto
+    if sender is Projeto:
+        publicacao = Publicacao.objects.filter(projeto_id=instance.pk).select_related('projeto').first()
+        if publicacao:
+            indexacao.indexar(DocumentoBusca.Tipo.PUBLICACAO, [publicacao])
+
+
+@receiver(post_delete, sender=Projeto)
+@receiver(post_delete, sender=Edital)
+@receiver(post_delete, sender=Publicacao)
+def remover_objeto(sender, instance, **kwargs):
+    """Objeto removido do banco: apaga o documento."""
+    indexacao.remover(indexacao.TIPO_POR_MODELO[sender], [instance.pk])
+
+
+@receiver(excluidos_logicamente, sender=Projeto)
+@receiver(excluidos_logicamente, sender=Edital)
+@receiver(excluidos_logicamente, sender=Publicacao)
+def remover_excluidos(sender, pks, **kwargs):
+    """Soft delete em lote: apaga os documentos."""
+    indexacao.remover(indexacao.TIPO_POR_MODELO[sender], pks)
+
+
+@receiver(restaurados, sender=Projeto)
+@receiver(restaurados, sender=Edital)
+@receiver(restaurados, sender=Publicacao)
+def indexar_restaurados(sender, pks, **kwargs):
+    """Restauração em lote: recria os documentos."""
+    indexacao.indexar_ids(indexacao.TIPO_POR_MODELO[sender], pks)
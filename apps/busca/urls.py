@@ -0,0 +1,10 @@
+"""
+URLs do app busca.
+"""
+from django.urls import path
+
+from .views import BuscaView
+
+urlpatterns = [
+    path('search', BuscaView.as_view(), name='busca'),
+]
@@ -0,0 +1,63 @@
+"""
+Views do app busca.
+"""
+from django.db.models import Q
+from rest_framework import generics, status
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from . import motor
+from .models import DocumentoBusca
+from .serializers import DocumentoBuscaSerializer
+
+
+class BuscaPagination(PageNumberPagination):
+    """Paginação numerada: a ordem por relevância não permite cursor."""
+
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+
+
+class BuscaView(generics.ListAPIView):
+    """
+    GET /api/search?q=termos
+
+    Busca textual em projetos, editais e publicações, ordenada por
+    relevância e paginada (?page=, ?page_size=). Todos os termos devem
+    aparecer (por prefixo); `?tipo=PROJETO,EDITAL` restringe os tipos.
+
+    Visibilidade: anônimos veem editais publicados e publicações ativas;
+    usuários autenticados também os próprios projetos; admin vê tudo.
+    """
+
+    permission_classes = [AllowAny]
+    serializer_class = DocumentoBuscaSerializer
+    pagination_class = BuscaPagination
+
+    def list(self, request, *args, **kwargs):
+        if not motor.termos(request.query_params.get('q', '')):
+            return Response(
+                {'detail': 'Informe o parâmetro q com os termos da busca.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return super().list(request, *args, **kwargs)
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = DocumentoBusca.objects.all()
+
+        if not user.is_authenticated:
+            queryset = queryset.filter(publico=True)
+        elif user.role != 'ADMIN':
+            queryset = queryset.filter(Q(publico=True) | Q(responsavel_id=user.pk))
+
+        tipos = [
+            tipo for tipo in self.request.query_params.get('tipo', '').upper().split(',')
+            if tipo in DocumentoBusca.Tipo.values
+        ]
+        if tipos:
+            queryset = queryset.filter(tipo__in=tipos)
+
+        return motor.filtrar(queryset, self.request.query_params['q'])
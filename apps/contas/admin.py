@@ -2,11 +2,14 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
+from apps.core.admin import AutocompletarPrefixoMixin
+
+from .authentication import CAMPOS_REVOGAM_CLAIMS, revogar_claims
 from .models import Usuario
 
 
 @admin.register(Usuario)
-class UsuarioAdmin(BaseUserAdmin):
+class UsuarioAdmin(AutocompletarPrefixoMixin, BaseUserAdmin):
     """Admin customizado para Usuario."""
 
     # Campos exibidos na listagem
@@ -21,6 +24,7 @@ class UsuarioAdmin(BaseUserAdmin):
     ]
     list_filter = ['role', 'status', 'is_active', 'is_staff', 'created_at']
     search_fields = ['cpf', 'name', 'email']
+    campos_autocompletar = ['name', 'email', 'cpf']
     ordering = ['-created_at']
     date_hierarchy = 'created_at'
 
@@ -52,3 +56,9 @@ class UsuarioAdmin(BaseUserAdmin):
     def get_queryset(self, request):
         """Inclui usuários soft-deleted no admin."""
         return Usuario.objects.with_deleted()
+
+    def save_model(self, request, obj, form, change):
+        """Papel/status/ativação alterados: tokens antigos passam a ser checados no banco."""
+        super().save_model(request, obj, form, change)
+        if change and CAMPOS_REVOGAM_CLAIMS & set(form.changed_data):
+            revogar_claims(obj.pk)
@@ -0,0 +1,104 @@
+"""
+Autenticação JWT da API.
+
+Este módulo contém:
+- StatelessJWTAuthentication: monta o usuário a partir das claims do token
+- revogar_claims: marca um usuário cujas claims deixaram de valer
+- claims_revogadas: verifica se as claims de um usuário foram revogadas
+- CAMPOS_REVOGAM_CLAIMS: campos do usuário cuja alteração revoga as claims
+
+Os tokens já carregam `id`, `role` e `name` (ver TokenObtainSerializer e
+RegisterView). Em requisições de leitura o usuário é montado a partir dessas
+claims, sem consultar o banco. Quando um usuário é removido (soft delete) ou
+muda de papel ou nome, seu id é marcado no cache compartilhado pelo tempo de vida do
+access token; para ids marcados a autenticação volta a buscar o usuário no
+banco, onde a remoção/alteração já aparece.
+"""
+import time
+
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.core.cache import CacheNamespace
+
+from .models import Usuario
+
+cache = CacheNamespace('contas')
+
+CHAVE_REVOGADO = 'revogado:{}'
+
+# Campos levados nas claims (role, name) ou que desativam o usuário
+CAMPOS_REVOGAM_CLAIMS = frozenset({'role', 'name', 'status', 'is_active'})
+
+# Por quanto tempo cada worker reaproveita a consulta ao cache de revogação
+TTL_MEMO_REVOGACAO = 30
+
+# Limite de ids memorizados por worker (o memo é esvaziado ao atingi-lo)
+MAX_MEMO_REVOGACAO = 10_000
+
+# {usuario_id: (revogado, consultado_em)} - memo local do processo
+_memo_revogacao = {}
+
+
+def revogar_claims(usuario_id):
+    """
+    Marca as claims dos tokens do usuário como não confiáveis.
+
+    A marca dura o tempo de vida do access token: tokens emitidos antes dela
+    expiram junto, e os emitidos depois já trazem as claims atualizadas.
+    """
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    cache.set(CHAVE_REVOGADO.format(usuario_id), True, timeout=timeout)
+    _memo_revogacao[usuario_id] = (True, time.monotonic())
+
+
+def claims_revogadas(usuario_id):
+    """
+    Retorna True se as claims do usuário foram revogadas.
+
+    Consulta o cache compartilhado no máximo uma vez a cada
+    TTL_MEMO_REVOGACAO segundos por usuário em cada worker.
+    """
+    agora = time.monotonic()
+    memo = _memo_revogacao.get(usuario_id)
+    if memo is not None and agora - memo[1] < TTL_MEMO_REVOGACAO:
+        return memo[0]
+
+    if len(_memo_revogacao) >= MAX_MEMO_REVOGACAO:
+        _memo_revogacao.clear()
+    revogado = bool(cache.get(CHAVE_REVOGADO.format(usuario_id)))
+    _memo_revogacao[usuario_id] = (revogado, agora)
+    return revogado
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT sem consulta ao banco em requisições de leitura.
+
+    Em GET/HEAD/OPTIONS `request.user` é um Usuario não salvo com apenas
+    `id`, `role` e `name` preenchidos (vindos do token). Escritas, tokens
+    sem essas claims e usuários com claims revogadas usam a busca padrão
+    no banco do SimpleJWT.
+
+    Views que exibem outros dados do próprio usuário (ex.: MeView) devem
+    usar `JWTAuthentication`.
+    """
+
+    def authenticate(self, request):
+        self._leitura = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if not self._leitura:
+            return super().get_user(validated_token)
+
+        usuario_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        role = validated_token.get('role')
+        name = validated_token.get('name')
+        if usuario_id is None or role is None or name is None or claims_revogadas(usuario_id):
+            return super().get_user(validated_token)
+
+        usuario = Usuario(id=usuario_id, role=role, name=name)
+        usuario._state.adding = False
+        return usuario
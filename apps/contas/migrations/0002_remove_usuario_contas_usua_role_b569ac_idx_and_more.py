@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('contas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='usuario',
+            name='contas_usua_role_b569ac_idx',
+        ),
+        migrations.AlterField(
+            model_name='usuario',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='deletado em'),
+        ),
+        migrations.AddIndex(
+            model_name='usuario',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['role', 'status'], name='usuario_role_status_vivo_idx'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+"""
+Índices do autocompletar de usuários (consultados por apps/core/autocompletar.py).
+
+PostgreSQL: prefixo `(lower(coluna) COLLATE "C")` de nome, email e CPF + GIN
+`gin_trgm_ops` do nome (extensão pg_trgm).
+SQLite: prefixo `(coluna COLLATE NOCASE)` de nome, email e CPF.
+
+Todos parciais em `deleted_at IS NULL`. O SQL fica nesta migração (e não no
+código da aplicação) para que ela continue aplicando exatamente o mesmo esquema
+mesmo que o autocompletar mude depois.
+"""
+from django.db import migrations
+
+DDL_POSTGRESQL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS contas_usuario_name_prefixo_idx '
+    'ON contas_usuario ((lower(name) COLLATE "C")) WHERE deleted_at IS NULL',
+    'CREATE INDEX IF NOT EXISTS contas_usuario_email_prefixo_idx '
+    'ON contas_usuario ((lower(email) COLLATE "C")) WHERE deleted_at IS NULL',
+    'CREATE INDEX IF NOT EXISTS contas_usuario_cpf_prefixo_idx '
+    'ON contas_usuario ((lower(cpf) COLLATE "C")) WHERE deleted_at IS NULL',
+    'CREATE INDEX IF NOT EXISTS contas_usuario_name_trgm_idx '
+    'ON contas_usuario USING gin (name gin_trgm_ops) WHERE deleted_at IS NULL',
+]
+
+DDL_POSTGRESQL_REVERSO = [
+    'DROP INDEX IF EXISTS contas_usuario_name_prefixo_idx',
+    'DROP INDEX IF EXISTS contas_usuario_email_prefixo_idx',
+    'DROP INDEX IF EXISTS contas_usuario_cpf_prefixo_idx',
+    'DROP INDEX IF EXISTS contas_usuario_name_trgm_idx',
+]
+
+DDL_SQLITE = [
+    'CREATE INDEX IF NOT EXISTS contas_usuario_name_prefixo_idx '
+    'ON contas_usuario (name COLLATE NOCASE) WHERE deleted_at IS NULL',
+    'CREATE INDEX IF NOT EXISTS contas_usuario_email_prefixo_idx '
+    'ON contas_usuario (email COLLATE NOCASE) WHERE deleted_at IS NULL',
+    'CREATE INDEX IF NOT EXISTS contas_usuario_cpf_prefixo_idx '
+    'ON contas_usuario (cpf COLLATE NOCASE) WHERE deleted_at IS NULL',
+]
+
+DDL_SQLITE_REVERSO = [
+    'DROP INDEX IF EXISTS contas_usuario_name_prefixo_idx',
+    'DROP INDEX IF EXISTS contas_usuario_email_prefixo_idx',
+    'DROP INDEX IF EXISTS contas_usuario_cpf_prefixo_idx',
+]
+
+
+# Banco -> (criação, remoção); nos demais bancos não há índices de autocompletar
+DDL = {
+    'postgresql': (DDL_POSTGRESQL, DDL_POSTGRESQL_REVERSO),
+    'sqlite': (DDL_SQLITE, DDL_SQLITE_REVERSO),
+}
+
+
+def criar_indices(apps, schema_editor):
+    criacao, _ = DDL.get(schema_editor.connection.vendor, ([], []))
+    for comando in criacao:
+        schema_editor.execute(comando)
+
+
+def remover_indices(apps, schema_editor):
+    _, remocao = DDL.get(schema_editor.connection.vendor, ([], []))
+    for comando in remocao:
+        schema_editor.execute(comando)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contas', '0002_remove_usuario_contas_usua_role_b569ac_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indices, remover_indices),
+    ]
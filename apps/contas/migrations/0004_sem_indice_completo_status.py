@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contas', '0003_indices_autocompletar'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usuario',
+            name='role',
+            field=models.CharField(choices=[('ADMIN', 'Administrador'), ('ALUNO', 'Aluno'), ('MENTOR', 'Mentor'), ('INVESTIDOR', 'Investidor')], default='ALUNO', max_length=20, verbose_name='papel'),
+        ),
+    ]
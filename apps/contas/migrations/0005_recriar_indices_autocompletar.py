@@ -0,0 +1,35 @@
+"""
+Recria no SQLite os índices do autocompletar de usuários (ver 0003).
+
+No SQLite o AlterField de 0004 reconstrói a tabela e descarta os índices
+criados por SQL, que o Django não conhece. No PostgreSQL eles continuam lá e
+esta migração não faz nada.
+"""
+from django.db import migrations
+
+DDL_SQLITE = [
+    'CREATE INDEX IF NOT EXISTS contas_usuario_name_prefixo_idx '
+    'ON contas_usuario (name COLLATE NOCASE) WHERE deleted_at IS NULL',
+    'CREATE INDEX IF NOT EXISTS contas_usuario_email_prefixo_idx '
+    'ON contas_usuario (email COLLATE NOCASE) WHERE deleted_at IS NULL',
+    'CREATE INDEX IF NOT EXISTS contas_usuario_cpf_prefixo_idx '
+    'ON contas_usuario (cpf COLLATE NOCASE) WHERE deleted_at IS NULL',
+]
+
+
+def recriar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for comando in DDL_SQLITE:
+        schema_editor.execute(comando)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contas', '0004_sem_indice_completo_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(recriar_indices, migrations.RunPython.noop),
+    ]
@@ -12,6 +12,8 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
+from apps.core.models import NAO_DELETADOS, AuditavelMixin
+
 
 def validar_cpf(value):
     """
@@ -79,7 +81,7 @@ class UsuarioManager(UserManager):
         return self._create_user(cpf, email, password, **extra_fields)
 
 
-class Usuario(AbstractUser):
+class Usuario(AuditavelMixin, AbstractUser):
     """
     Modelo customizado de usuário para o sistema YpeTec.
 
@@ -130,7 +132,6 @@ class Usuario(AbstractUser):
         max_length=20,
         choices=Role.choices,
         default=Role.ALUNO,
-        db_index=True,
     )
     status = models.CharField(
         'status',
@@ -139,12 +140,11 @@ class Usuario(AbstractUser):
         default=Status.ATIVO,
     )
 
-    # Soft delete
+    # Soft delete (sem índice próprio: ver índices parciais em Meta)
     deleted_at = models.DateTimeField(
         'deletado em',
         null=True,
         blank=True,
-        db_index=True,
     )
 
     # Timestamps (sobrescreve AbstractUser para consistência)
@@ -168,7 +168,11 @@ class Usuario(AbstractUser):
         verbose_name_plural = 'usuários'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['role', 'status']),
+            models.Index(
+                fields=['role', 'status'],
+                condition=NAO_DELETADOS,
+                name='usuario_role_status_vivo_idx',
+            ),
             models.Index(fields=['email']),
         ]
 
@@ -177,13 +181,21 @@ class Usuario(AbstractUser):
 
     def delete(self, using=None, keep_parents=False):
         """Soft delete: marca deleted_at em vez de remover."""
+        from .authentication import revogar_claims
+
         self.deleted_at = timezone.now()
         self.status = self.Status.INATIVO
         self.save(update_fields=['deleted_at', 'status', 'updated_at'])
+        # Tokens já emitidos deixam de ser aceitos sem consulta ao banco
+        revogar_claims(self.pk)
 
     def hard_delete(self, using=None, keep_parents=False):
         """Delete real do banco de dados."""
+        from .authentication import revogar_claims
+
+        usuario_id = self.pk
         super().delete(using=using, keep_parents=keep_parents)
+        revogar_claims(usuario_id)
 
     def restore(self):
         """Restaura um usuário soft-deleted."""
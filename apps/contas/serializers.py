@@ -13,6 +13,7 @@ from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .authentication import CAMPOS_REVOGAM_CLAIMS, revogar_claims
 from .models import Usuario, validar_cpf
 
 
@@ -147,6 +148,11 @@ class UsuarioUpdateSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         """Atualiza usuário, tratando senha separadamente."""
         password = validated_data.pop('password', None)
+        claims_alteradas = any(
+            getattr(instance, campo) != valor
+            for campo, valor in validated_data.items()
+            if campo in CAMPOS_REVOGAM_CLAIMS
+        )
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
@@ -155,6 +161,10 @@ class UsuarioUpdateSerializer(serializers.ModelSerializer):
             instance.set_password(password)
 
         instance.save()
+
+        # Papel e nome vão nas claims do token: tokens antigos passam a ser checados no banco
+        if claims_alteradas:
+            revogar_claims(instance.pk)
         return instance
 
 
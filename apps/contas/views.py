@@ -5,19 +5,26 @@ Este módulo contém:
 - AuthViewSet: login, register, me, forgot, reset
 - UsuarioViewSet: CRUD de usuários (admin)
 """
+import re
 import secrets
 from datetime import timedelta
 
-from django.conf import settings
-from django.core.cache import cache
+from django.db.models import CharField, Value
+from django.db.models.functions import Concat
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.core.autocompletar import LIMITE_PADRAO, sugerir
+from apps.core.cache import CacheNamespace
+from apps.core.email import VALIDADE_RESET_MINUTOS, send_password_reset_email
+from apps.core.exportacao import TAMANHO_LOTE_BANCO, intervalo_datas, resposta_csv
+
 from .models import Usuario
 from .permissions import IsAdmin
 from .serializers import (
@@ -30,6 +37,9 @@ from .serializers import (
     UsuarioUpdateSerializer,
 )
 
+# Tokens de reset de senha ficam no cache compartilhado, visíveis a todos os hosts
+cache = CacheNamespace('contas', alias='compartilhado')
+
 
 class LoginView(APIView):
     """
@@ -79,8 +89,12 @@ class MeView(APIView):
     GET /api/auth/me
 
     Retorna dados do usuário autenticado.
+
+    Usa a autenticação JWT com busca no banco: a resposta inclui campos
+    (cpf, email, status) que não estão nas claims do token.
     """
 
+    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -112,17 +126,10 @@ class ForgotPasswordView(APIView):
 
             # Armazena token no cache (30 minutos)
             cache_key = f'password_reset_{token}'
-            cache.set(cache_key, user.id, timeout=30 * 60)
-
-            # TODO: Enviar email com link de reset
-            # O link deve ser: {APP_URL}/reset-password?token={token}
-            # Por enquanto, apenas log para debug
-            reset_url = f"{settings.APP_URL if hasattr(settings, 'APP_URL') else 'http://localhost:3000'}/reset-password?token={token}"
-            print(f"[DEBUG] Password reset URL for {email}: {reset_url}")
+            cache.set(cache_key, user.id, timeout=VALIDADE_RESET_MINUTOS * 60)
 
-            # Em produção, usar Resend ou outro serviço de email
-            # from apps.core.email import send_password_reset_email
-            # send_password_reset_email(user.email, user.name, reset_url)
+            # Envio pela fila de tarefas: a resposta não espera o servidor de email
+            send_password_reset_email(user, token)
 
         except Usuario.DoesNotExist:
             # Não revela se o email existe
@@ -187,10 +194,14 @@ class UsuarioViewSet(viewsets.ModelViewSet):
     PUT    /api/users/:id/      - Atualiza usuário
     DELETE /api/users/:id/      - Remove usuário (soft delete)
     GET    /api/users/report.csv - Exporta relatório CSV
+    GET    /api/users/autocomplete/?q= - Sugestões por nome, email ou CPF
+
+    Listagem paginada por cursor com ?page_size= ou ?cursor=.
     """
 
     queryset = Usuario.objects.all()
     permission_classes = [IsAuthenticated, IsAdmin]
+    cursor_ordering = ('-id',)
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -213,35 +224,78 @@ class UsuarioViewSet(viewsets.ModelViewSet):
         instance.delete()  # Usa soft delete do modelo
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        GET /api/users/autocomplete/?q=mar&limit=10&role=MENTOR
+
+        Sugestões `[{id, label}]` por prefixo: CPF (termo só com dígitos),
+        email (termo com @) ou nome e email. Ver core/autocompletar.py.
+        """
+        termo = request.query_params.get('q', '')
+        cpf = re.sub(r'[\s.-]', '', termo)
+        if cpf.isdigit():
+            termo, campos = cpf, ['cpf']
+        elif '@' in termo:
+            campos = ['email']
+        else:
+            campos = ['name', 'email']
+
+        sugestoes = sugerir(
+            self.get_queryset(),
+            termo,
+            campos,
+            rotulo=Concat('name', Value(' <'), 'email', Value('>'), output_field=CharField()),
+            limite=request.query_params.get('limit', LIMITE_PADRAO),
+            trigrama=['name'],
+            escopo=request.query_params.get('role', '').upper(),
+        )
+        return Response(sugestoes)
+
     @action(detail=False, methods=['get'], url_path='report.csv')
     def report_csv(self, request):
         """
         GET /api/users/report.csv
 
-        Exporta lista de usuários em CSV.
-        """
-        import csv
-        from django.http import HttpResponse
+        Exporta lista de usuários em CSV (streaming).
 
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="usuarios.csv"'
+        Query params:
+            role: ADMIN | ALUNO | MENTOR | INVESTIDOR
+            status: ATIVO | INATIVO
+            created_from, created_to: intervalo de cadastro (AAAA-MM-DD)
+        """
+        try:
+            desde, ate = intervalo_datas(
+                request.query_params.get('created_from'),
+                request.query_params.get('created_to'),
+            )
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        writer = csv.writer(response)
-        writer.writerow(['ID', 'Nome', 'CPF', 'Email', 'Role', 'Criado em'])
+        queryset = Usuario.objects.all()
 
         role = request.query_params.get('role')
-        queryset = Usuario.objects.all()
         if role:
             queryset = queryset.filter(role=role.upper())
-
-        for user in queryset.order_by('role', 'name'):
-            writer.writerow([
-                user.id,
-                user.name,
-                user.cpf,
-                user.email,
-                user.role,
-                user.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            ])
-
-        return response
+        status_filter = request.query_params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status=status_filter.upper())
+        if desde:
+            queryset = queryset.filter(created_at__gte=desde)
+        if ate:
+            queryset = queryset.filter(created_at__lt=ate)
+
+        linhas = (
+            (id_, name, cpf, email, role, created_at.strftime('%Y-%m-%d %H:%M:%S'))
+            for id_, name, cpf, email, role, created_at in queryset.order_by(
+                'role', 'name'
+            ).values_list(
+                'id', 'name', 'cpf', 'email', 'role', 'created_at'
+            ).iterator(chunk_size=TAMANHO_LOTE_BANCO)
+        )
+
+        return resposta_csv(
+            'usuarios.csv',
+            ['ID', 'Nome', 'CPF', 'Email', 'Role', 'Criado em'],
+            linhas,
+        )
@@ -1,12 +1,110 @@
 """Configuração do Django Admin para o app core."""
+from django.apps import apps
+from django.conf import settings
 from django.contrib import admin
 
-from .models import LogAuditoria
+from .autocompletar import filtrar_prefixo
+from .models import AuditavelMixin, LogAuditoria, LogAuditoriaArquivo
 
 
-@admin.register(LogAuditoria)
-class LogAuditoriaAdmin(admin.ModelAdmin):
-    """Admin para LogAuditoria."""
+class AutocompletarPrefixoMixin:
+    """
+    ModelAdmin cujo autocomplete (autocomplete_fields de outros admins) busca por prefixo.
+
+    A busca da listagem continua usando `search_fields`; o autocomplete usa
+    os índices de prefixo de `campos_autocompletar` (ver autocompletar.py)
+    e ignora registros soft-deleted.
+    """
+
+    campos_autocompletar = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        resolver = getattr(request, 'resolver_match', None)
+        if resolver and resolver.url_name == 'autocomplete' and self.campos_autocompletar:
+            queryset = queryset.filter(deleted_at__isnull=True)
+            if search_term.strip():
+                queryset = filtrar_prefixo(queryset, self.campos_autocompletar, search_term)
+            return queryset, False
+        return super().get_search_results(request, queryset, search_term)
+
+
+class PeriodoFilter(admin.SimpleListFilter):
+    """
+    Filtro por período, limitado aos logs recentes por padrão.
+
+    Sem seleção, mostra apenas os últimos AUDITORIA_DIAS_RECENTES dias: no
+    PostgreSQL a consulta lê só as partições desse período.
+    """
+
+    title = 'período'
+    parameter_name = 'periodo'
+    TODOS = 'todos'
+
+    def lookups(self, request, model_admin):
+        return [
+            ('7', 'Últimos 7 dias'),
+            ('30', 'Últimos 30 dias'),
+            (None, f'Últimos {settings.AUDITORIA_DIAS_RECENTES} dias'),
+            ('365', 'Último ano'),
+            (self.TODOS, 'Todo o histórico'),
+        ]
+
+    def choices(self, changelist):
+        for valor, titulo in self.lookup_choices:
+            yield {
+                'selected': self.value() == valor,
+                'query_string': changelist.get_query_string(
+                    {self.parameter_name: valor} if valor else {},
+                    [] if valor else [self.parameter_name],
+                ),
+                'display': titulo,
+            }
+
+    def queryset(self, request, queryset):
+        valor = self.value()
+        if valor == self.TODOS:
+            return queryset
+        if valor and valor.isdigit():
+            return queryset.recentes(int(valor))
+        return queryset.recentes()
+
+
+class AcaoFilter(admin.SimpleListFilter):
+    """Ações fixas (evita o SELECT DISTINCT na tabela inteira)."""
+
+    title = 'ação'
+    parameter_name = 'acao'
+
+    def lookups(self, request, model_admin):
+        return LogAuditoria.Acao.choices
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(acao=self.value())
+        return queryset
+
+
+class EntidadeFilter(admin.SimpleListFilter):
+    """Entidades auditadas (obtidas dos modelos, não da tabela)."""
+
+    title = 'entidade'
+    parameter_name = 'entidade'
+
+    def lookups(self, request, model_admin):
+        nomes = sorted(
+            modelo.__name__ for modelo in apps.get_models()
+            if issubclass(modelo, AuditavelMixin)
+        )
+        return [(nome, nome) for nome in nomes]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(entidade=self.value())
+        return queryset
+
+
+class RegistroAuditoriaAdmin(admin.ModelAdmin):
+    """Admin somente leitura dos logs, filtrado por período recente."""
 
     list_display = [
         'id',
@@ -16,7 +114,8 @@ class LogAuditoriaAdmin(admin.ModelAdmin):
         'entidade_id',
         'created_at',
     ]
-    list_filter = ['acao', 'entidade', 'created_at']
+    list_filter = [PeriodoFilter, AcaoFilter, EntidadeFilter]
+    list_select_related = ['usuario']
     search_fields = ['usuario__name', 'usuario__cpf', 'entidade']
     readonly_fields = [
         'usuario',
@@ -31,6 +130,8 @@ class LogAuditoriaAdmin(admin.ModelAdmin):
     ]
     date_hierarchy = 'created_at'
     ordering = ['-created_at']
+    # Evita o COUNT(*) sem filtros sobre todo o histórico
+    show_full_result_count = False
 
     def has_add_permission(self, request):
         """Logs são criados programaticamente, não pelo admin."""
@@ -43,3 +144,16 @@ class LogAuditoriaAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         """Logs não podem ser deletados pelo admin."""
         return False
+
+
+@admin.register(LogAuditoria)
+class LogAuditoriaAdmin(RegistroAuditoriaAdmin):
+    """Admin para LogAuditoria."""
+
+
+@admin.register(LogAuditoriaArquivo)
+class LogAuditoriaArquivoAdmin(RegistroAuditoriaAdmin):
+    """Admin para LogAuditoriaArquivo (logs antigos, bancos sem particionamento)."""
+
+    # Só contém logs antigos: o filtro de período recente não se aplica
+    list_filter = [AcaoFilter, EntidadeFilter]
@@ -0,0 +1,105 @@
+"""
+Controle de admissão para operações com picos de acesso.
+
+Este módulo contém:
+- Sobrecarga: erro 503 com Retry-After (tratado pelo exception handler do DRF)
+- vaga: ocupa uma das vagas de uma operação enquanto o bloco executa
+
+Cada operação (ex.: 'submissao') tem um número fixo de vagas, guardadas como
+chaves `<operação>:<n>` no cache compartilhado e ocupadas com `add` (só grava
+se a chave não existe). A requisição que não encontra vaga livre espera uma
+única vez ADMISSAO_ESPERA segundos e tenta de novo; sem vaga, é descartada com
+503 e Retry-After, sem chegar ao banco. Não há espera em laço: com workers
+síncronos, um worker esperando é um worker a menos atendendo, então a espera
+é curta e o descarte, rápido. Cada tentativa lê a versão do namespace uma vez
+e faz no máximo um `add` por vaga. Cada vaga expira em ADMISSAO_TTL segundos,
+então um worker encerrado no meio da operação não a prende para sempre.
+
+O padrão de vagas (settings) é WEB_CONCURRENCY - 1: mais vagas que workers
+síncronos nunca seriam ocupadas ao mesmo tempo.
+
+Com Redis o `add` é atômico e o limite vale exatamente para todos os workers;
+nos backends file/db ele é aproximado.
+
+Configurações (settings):
+    ADMISSAO_VAGAS: {operação: vagas}; 0 ou ausente desativa o controle
+    ADMISSAO_ESPERA: espera (segundos) antes da segunda e última tentativa
+    ADMISSAO_RETRY_AFTER: base do Retry-After (segundos; o valor varia até o dobro)
+    ADMISSAO_TTL: validade máxima de uma vaga (segundos)
+"""
+import random
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .cache import CacheNamespace
+
+cache = CacheNamespace('admissao')
+
+
+class Sobrecarga(APIException):
+    """Todas as vagas da operação ocupadas: responda 503 com Retry-After = `wait`."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Muitas requisições no momento. Tente novamente em instantes.'
+    default_code = 'sobrecarga'
+
+    def __init__(self, wait, detail=None):
+        super().__init__(detail)
+        self.wait = wait
+
+
+def _retry_after():
+    # Variação aleatória: os clientes descartados não voltam todos juntos
+    base = getattr(settings, 'ADMISSAO_RETRY_AFTER', 5)
+    return random.randint(base, base * 2)
+
+
+def _ocupar(operacao, vagas, token, ttl):
+    """Tenta ocupar uma vaga livre (em ordem aleatória); retorna a chave ou None."""
+    versao = cache.versao()
+    numeros = list(range(vagas))
+    random.shuffle(numeros)
+    for numero in numeros:
+        chave = cache.chave(f'{operacao}:{numero}', versao)
+        if cache.backend.add(chave, token, timeout=ttl):
+            return chave
+    return None
+
+
+@contextmanager
+def vaga(operacao):
+    """
+    Executa o bloco ocupando uma das vagas de `operacao`.
+
+    Uso:
+        with vaga('submissao'):
+            submeter(...)
+
+    Raises:
+        Sobrecarga: Nenhuma vaga livre, nem após ADMISSAO_ESPERA segundos
+    """
+    vagas = getattr(settings, 'ADMISSAO_VAGAS', {}).get(operacao)
+    if not vagas:
+        yield
+        return
+
+    token = uuid.uuid4().hex
+    ttl = getattr(settings, 'ADMISSAO_TTL', 30)
+    chave = _ocupar(operacao, vagas, token, ttl)
+    if chave is None:
+        time.sleep(getattr(settings, 'ADMISSAO_ESPERA', 0.5))
+        chave = _ocupar(operacao, vagas, token, ttl)
+        if chave is None:
+            raise Sobrecarga(_retry_after())
+
+    try:
+        yield
+    finally:
+        # Só libera se a vaga ainda é desta requisição (pode ter expirado pelo TTL)
+        if cache.backend.get(chave) == token:
+            cache.backend.delete(chave)
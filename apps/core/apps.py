@@ -8,3 +8,9 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
     verbose_name = 'Núcleo'
+
+    def ready(self):
+        """Conecta a auditoria automática aos modelos com AuditavelMixin."""
+        from . import signals
+
+        signals.conectar()
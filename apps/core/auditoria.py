@@ -0,0 +1,218 @@
+"""
+Gravação assíncrona e em lotes do log de auditoria.
+
+Este módulo contém:
+- EscritorAuditoria: fila limitada + thread que grava os logs com bulk_create
+- registrar: enfileira um log após o commit da transação atual
+- descarregar: grava imediatamente tudo o que estiver na fila
+
+O registro custa apenas colocar um dict na fila: a thread do escritor grava
+um lote quando acumula AUDITORIA_TAMANHO_LOTE entradas ou quando passam
+AUDITORIA_INTERVALO segundos desde a primeira entrada pendente. Com a fila
+cheia, quem registra grava um lote por conta própria (contrapressão), de
+modo que a memória do worker permanece limitada.
+
+`descarregar` (chamado também no encerramento do processo) pede à thread
+que grave o lote que está montando e espera a confirmação antes de esvaziar
+a fila: nada do que já saiu da fila se perde num restart do worker.
+
+Configurações (settings):
+    AUDITORIA_SINCRONA: grava no ato, sem fila (testes, scripts)
+    AUDITORIA_TAMANHO_LOTE: entradas por bulk_create
+    AUDITORIA_INTERVALO: espera máxima (segundos) de uma entrada na fila
+    AUDITORIA_CAPACIDADE: tamanho máximo da fila
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Espera máxima (segundos) pela thread ao descarregar
+ESPERA_DESCARGA = 10
+
+
+class EscritorAuditoria:
+    """
+    Escritor em lotes de LogAuditoria.
+
+    Uso:
+        escritor = EscritorAuditoria(tamanho_lote=200, intervalo=2.0, capacidade=10000)
+        escritor.enfileirar({'usuario_id': 1, 'acao': 'CRIAR', ...})
+    """
+
+    def __init__(self, tamanho_lote, intervalo, capacidade):
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.capacidade = capacidade
+        self._lock = threading.Lock()
+        self._pid = None
+        self._fila = None
+        self._thread = None
+
+    def _iniciar(self):
+        """Cria fila e thread no processo atual (inclusive após fork do gunicorn)."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._fila = queue.Queue(maxsize=self.capacidade)
+            self._thread = threading.Thread(
+                target=self._executar,
+                name='escritor-auditoria',
+                daemon=True,
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def enfileirar(self, entrada):
+        """
+        Coloca uma entrada (kwargs de LogAuditoria) na fila.
+
+        Se a fila estiver cheia, grava um lote no próprio chamador.
+        """
+        self._iniciar()
+        try:
+            self._fila.put_nowait(entrada)
+        except queue.Full:
+            self._gravar(self._retirar(self.tamanho_lote - 1) + [entrada])
+
+    def descarregar(self):
+        """Grava imediatamente todas as entradas pendentes, inclusive o lote da thread."""
+        if self._pid != os.getpid():
+            return
+        if self._thread.is_alive():
+            # O pedido entra na fila depois das entradas já registradas: quando a
+            # thread o atende, gravou tudo o que havia retirado antes dele
+            pedido = threading.Event()
+            try:
+                self._fila.put(pedido, timeout=ESPERA_DESCARGA)
+            except queue.Full:
+                pedido = None
+            if pedido is not None and not pedido.wait(ESPERA_DESCARGA):
+                logger.warning('Escritor de auditoria não confirmou a descarga.')
+        while True:
+            lote = self._retirar(self.tamanho_lote)
+            if not lote:
+                return
+            self._gravar(lote)
+
+    def _retirar(self, limite):
+        """Retira até `limite` entradas da fila sem esperar."""
+        lote = []
+        while len(lote) < limite:
+            try:
+                item = self._fila.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                # Pedido de descarga de outra chamada: quem retira já está gravando
+                item.set()
+            else:
+                lote.append(item)
+        return lote
+
+    def _acumular(self, fila):
+        """
+        Espera a primeira entrada e completa o lote até o prazo.
+
+        Returns:
+            tuple: (lote, pedido de descarga recebido ou None)
+        """
+        item = fila.get()
+        if isinstance(item, threading.Event):
+            return [], item
+        lote = [item]
+        prazo = time.monotonic() + self.intervalo
+        while len(lote) < self.tamanho_lote:
+            restante = prazo - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                item = fila.get(timeout=restante)
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                return lote, item
+            lote.append(item)
+        return lote, None
+
+    def _executar(self):
+        """Laço da thread: grava cada lote e confirma os pedidos de descarga."""
+        fila = self._fila
+        while True:
+            lote, pedido = self._acumular(fila)
+            if lote:
+                # Conexão própria da thread: descarta-a se expirou ou caiu (CONN_MAX_AGE).
+                # Só aqui: nos demais caminhos _gravar usa a conexão da requisição
+                close_old_connections()
+            self._gravar(lote)
+            if pedido is not None:
+                pedido.set()
+
+    def _gravar(self, lote):
+        """Grava o lote com um único bulk_create; falhas vão para o log."""
+        if not lote:
+            return
+        from .models import LogAuditoria
+
+        try:
+            LogAuditoria.objects.bulk_create(
+                [LogAuditoria(**entrada) for entrada in lote],
+                batch_size=self.tamanho_lote,
+            )
+        except Exception:
+            logger.exception('Falha ao gravar %d registros de auditoria.', len(lote))
+
+
+escritor = EscritorAuditoria(
+    tamanho_lote=getattr(settings, 'AUDITORIA_TAMANHO_LOTE', 200),
+    intervalo=getattr(settings, 'AUDITORIA_INTERVALO', 2.0),
+    capacidade=getattr(settings, 'AUDITORIA_CAPACIDADE', 10000),
+)
+
+# Grava o lote da thread e o que restar na fila quando o worker é encerrado
+atexit.register(escritor.descarregar)
+
+
+def registrar(usuario, acao, entidade, entidade_id, **kwargs):
+    """
+    Registra um log de auditoria sem gravar no banco durante a requisição.
+
+    A entrada só é enfileirada após o commit da transação atual (logs de
+    transações desfeitas são descartados). Com AUDITORIA_SINCRONA o log é
+    gravado no commit, sem passar pela fila.
+
+    Args:
+        usuario: Usuário que realizou a ação (ou None)
+        acao: Tipo de ação (usar LogAuditoria.Acao)
+        entidade: Nome da entidade (ex: 'Projeto', 'Usuario')
+        entidade_id: ID da entidade afetada
+        **kwargs: Campos opcionais (dados_anteriores, dados_novos, ip_address, user_agent)
+    """
+    entrada = {
+        'usuario_id': getattr(usuario, 'pk', usuario),
+        'acao': acao,
+        'entidade': entidade,
+        'entidade_id': entidade_id,
+        # Momento da ação, não o da gravação do lote
+        'created_at': timezone.now(),
+        **kwargs,
+    }
+    if getattr(settings, 'AUDITORIA_SINCRONA', False):
+        transaction.on_commit(lambda: escritor._gravar([entrada]))
+    else:
+        transaction.on_commit(lambda: escritor.enfileirar(entrada))
+
+
+def descarregar():
+    """Grava imediatamente os logs pendentes do processo atual."""
+    escritor.descarregar()
@@ -0,0 +1,154 @@
+"""
+Autocompletar por prefixo (e trigramas no PostgreSQL).
+
+Este módulo contém:
+- expressao_prefixo / filtrar_prefixo: filtro por prefixo que usa esses índices
+- sugerir: top-k sugestões `{id, label}` com cache curto por termo
+
+Índices (criados nas migrações contas/0003 e projetos/0005, parciais em
+`deleted_at IS NULL`, como os demais):
+    PostgreSQL: `(lower(coluna) COLLATE "C")` — LIKE 'abc%' e ORDER BY
+                percorrem o índice — e GIN `gin_trgm_ops` para trechos no
+                meio do texto (ILIKE '%abc%').
+    SQLite:     `(coluna COLLATE NOCASE)` — ativa a otimização de LIKE.
+
+O termo é comparado (como intervalo) com a mesma expressão do índice, de
+modo que uma sugestão lê apenas as primeiras entradas do índice que casam
+com o prefixo, independente do tamanho da tabela.
+"""
+import hashlib
+
+from django.db import connection
+from django.db.models import BooleanField, F, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Collate, Lower
+
+from .cache import CacheNamespace
+
+cache = CacheNamespace('autocompletar')
+
+LIMITE_PADRAO = 10
+LIMITE_MAXIMO = 20
+# Sugestões mudam pouco entre teclas; cache curto por termo
+TIMEOUT_SUGESTOES = 30
+# Termos menores que isto não usam o índice de trigramas (pg_trgm)
+MIN_TRIGRAMA = 3
+MAX_TERMO = 60
+
+
+def normalizar(termo):
+    """Termo sem espaços repetidos, em minúsculas, com no máximo MAX_TERMO caracteres."""
+    return ' '.join((termo or '').split()).lower()[:MAX_TERMO]
+
+
+def expressao_prefixo(campo):
+    """Expressão idêntica à dos índices de prefixo do banco em uso."""
+    if connection.vendor == 'postgresql':
+        return Collate(Lower(campo), 'C')
+    if connection.vendor == 'sqlite':
+        return Collate(F(campo), 'nocase')
+    return Lower(campo)
+
+
+def _condicao_prefixo(alias, termo):
+    """
+    `alias` começa com `termo`, como intervalo [termo, sucessor) sobre o índice.
+
+    As expressões de prefixo comparam por código (COLLATE "C" / NOCASE), então
+    o intervalo equivale ao prefixo e é resolvido pelo índice mesmo quando o
+    otimizador não transforma o LIKE (ex.: SQLite com termos numéricos, CPF).
+    """
+    if connection.vendor not in ('postgresql', 'sqlite'):
+        return Q(**{f'{alias}__startswith': termo})
+    sucessor = termo[:-1] + chr(ord(termo[-1]) + 1)
+    return Q(**{f'{alias}__gte': termo, f'{alias}__lt': sucessor})
+
+
+def filtrar_prefixo(queryset, campos, termo):
+    """
+    Registros em que algum dos `campos` começa com `termo` (sem diferenciar maiúsculas).
+
+    Usado pelo admin (autocomplete_fields), que pagina o resultado; cada
+    campo do OR usa o próprio índice.
+    """
+    termo = normalizar(termo)
+    filtro = Q()
+    for campo in campos:
+        alias = f'_prefixo_{campo}'
+        queryset = queryset.alias(**{alias: expressao_prefixo(campo)})
+        filtro |= _condicao_prefixo(alias, termo)
+    return queryset.filter(filtro)
+
+
+def _por_prefixo(queryset, campo, termo, rotulo, limite):
+    return list(
+        queryset.alias(_prefixo=expressao_prefixo(campo))
+        .filter(_condicao_prefixo('_prefixo', termo))
+        .order_by('_prefixo', 'pk')
+        .values_list('pk', rotulo)[:limite]
+    )
+
+
+def _por_trigrama(queryset, campo, termo, rotulo, limite):
+    coluna = f'{queryset.model._meta.db_table}.{queryset.model._meta.get_field(campo).column}'
+    padrao = '%' + termo.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    return list(
+        queryset.filter(RawSQL(f'{coluna} ILIKE %s', [padrao], output_field=BooleanField()))
+        .annotate(_similaridade=RawSQL(f'similarity({coluna}, %s)', [termo], output_field=FloatField()))
+        .order_by('-_similaridade', 'pk')
+        .values_list('pk', rotulo)[:limite]
+    )
+
+
+def sugerir(queryset, termo, prefixo, rotulo, limite=LIMITE_PADRAO, trigrama=(), escopo=''):
+    """
+    Até `limite` sugestões `{'id', 'label'}` para o termo digitado.
+
+    Primeiro os registros cujo campo começa com o termo (um SELECT por campo
+    de `prefixo`, na ordem dada); no PostgreSQL, se faltarem resultados, os
+    que contêm o termo nos campos de `trigrama`. Só `pk` e o rótulo são lidos
+    (values_list), e a resposta fica em cache por TIMEOUT_SUGESTOES segundos.
+
+    Args:
+        queryset: Registros elegíveis (já filtrados por permissão)
+        termo: Texto digitado
+        prefixo: Campos comparados por prefixo
+        rotulo: Campo ou expressão exibido como `label`
+        limite: Máximo de sugestões (aceita o texto do query param; até LIMITE_MAXIMO)
+        trigrama: Campos comparados por trecho (pg_trgm)
+        escopo: Diferencia o cache quando o queryset depende do usuário/filtros
+    """
+    termo = normalizar(termo)
+    try:
+        limite = max(1, min(int(limite), LIMITE_MAXIMO))
+    except (TypeError, ValueError):
+        limite = LIMITE_PADRAO
+    if not termo:
+        return []
+
+    chave = hashlib.md5(
+        f'{queryset.model._meta.label}|{escopo}|{",".join(prefixo)}|{limite}|{termo}'.encode()
+    ).hexdigest()
+    sugestoes = cache.get(chave)
+    if sugestoes is not None:
+        return sugestoes
+
+    encontrados = {}
+    for campo in prefixo:
+        faltam = limite - len(encontrados)
+        if faltam <= 0:
+            break
+        restantes = queryset.exclude(pk__in=list(encontrados)) if encontrados else queryset
+        encontrados.update(_por_prefixo(restantes, campo, termo, rotulo, faltam))
+
+    if connection.vendor == 'postgresql' and len(termo) >= MIN_TRIGRAMA:
+        for campo in trigrama:
+            faltam = limite - len(encontrados)
+            if faltam <= 0:
+                break
+            restantes = queryset.exclude(pk__in=list(encontrados)) if encontrados else queryset
+            encontrados.update(_por_trigrama(restantes, campo, termo, rotulo, faltam))
+
+    sugestoes = [{'id': pk, 'label': label} for pk, label in encontrados.items()]
+    cache.set(chave, sugestoes, timeout=TIMEOUT_SUGESTOES)
+    return sugestoes
@@ -0,0 +1,115 @@
+"""
+Cache com namespace por app.
+
+Este módulo contém:
+- CacheNamespace: acesso ao cache compartilhado com prefixo e versão por app
+
+Cada app usa seu próprio namespace (ex.: `CacheNamespace('editais')`). As
+chaves ficam no formato `<namespace>:v<versão>:<chave>`, e `invalidar()`
+incrementa a versão do namespace, descartando de uma vez todas as chaves
+dele em todos os workers, sem precisar enumerá-las.
+
+Se a chave de versão some (ex.: descartada pelo MAX_ENTRIES do backend file),
+ela é recriada com um valor novo (o instante atual em microssegundos), nunca
+com uma constante: recomeçar em 1 traria de volta entradas antigas gravadas
+sob a versão 1.
+
+A versão global das chaves (troca em deploy) é `CACHES['default']['VERSION']`.
+"""
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+
+class CacheNamespace:
+    """
+    Cache de um app, com versão própria.
+
+    Uso:
+        cache_editais = CacheNamespace('editais')
+        cache_editais.set('janela:abertos', editais, timeout=60)
+        cache_editais.get('janela:abertos')
+        cache_editais.invalidar()  # descarta todas as chaves do namespace
+    """
+
+    def __init__(self, nome, alias='default'):
+        self.nome = nome
+        self.alias = alias
+        self._chave_versao = f'{nome}:versao'
+
+    @property
+    def backend(self):
+        """Backend de cache configurado em CACHES[alias]."""
+        return caches[self.alias]
+
+    @staticmethod
+    def _versao_nova():
+        """Valor inicial de uma versão: distinto de qualquer versão já usada."""
+        return time.time_ns() // 1000
+
+    def versao(self):
+        """Versão atual do namespace (criada na primeira leitura ou após ser descartada)."""
+        versao = self.backend.get(self._chave_versao)
+        if versao is None:
+            nova = self._versao_nova()
+            self.backend.add(self._chave_versao, nova, timeout=None)
+            versao = self.backend.get(self._chave_versao, nova)
+        return versao
+
+    def invalidar(self):
+        """Incrementa a versão, invalidando todas as chaves do namespace."""
+        try:
+            return self.backend.incr(self._chave_versao)
+        except ValueError:
+            # Versão ainda não existia (ou foi descartada pelo backend)
+            nova = self._versao_nova()
+            self.backend.set(self._chave_versao, nova, timeout=None)
+            return nova
+
+    def chave(self, chave, versao=None):
+        """Monta a chave completa com namespace e versão."""
+        if versao is None:
+            versao = self.versao()
+        return f'{self.nome}:v{versao}:{chave}'
+
+    def get(self, chave, default=None):
+        return self.backend.get(self.chave(chave), default)
+
+    def get_many(self, chaves):
+        """Retorna {chave: valor} para as chaves presentes no cache."""
+        versao = self.versao()
+        completas = {self.chave(chave, versao): chave for chave in chaves}
+        encontrados = self.backend.get_many(list(completas))
+        return {completas[completa]: valor for completa, valor in encontrados.items()}
+
+    def set(self, chave, valor, timeout=DEFAULT_TIMEOUT):
+        self.backend.set(self.chave(chave), valor, timeout=timeout)
+
+    def add(self, chave, valor, timeout=DEFAULT_TIMEOUT):
+        return self.backend.add(self.chave(chave), valor, timeout=timeout)
+
+    def delete(self, chave):
+        return self.backend.delete(self.chave(chave))
+
+    def incr(self, chave, delta=1, timeout=DEFAULT_TIMEOUT):
+        """
+        Incrementa um contador e retorna o novo valor.
+
+        O contador nasce em 0 com expiração `timeout`. Alguns backends renovam
+        a expiração a cada incremento: para janelas de tempo, inclua a janela
+        na chave. Atômico no Redis; nos backends file/db o incremento é
+        leitura + escrita, então serve para limites aproximados.
+        """
+        completa = self.chave(chave)
+        self.backend.add(completa, 0, timeout=timeout)
+        try:
+            return self.backend.incr(completa, delta)
+        except ValueError:
+            # Expirou entre o add e o incr
+            self.backend.set(completa, delta, timeout=timeout)
+            return delta
+
+    def delete_many(self, chaves):
+        versao = self.versao()
+        self.backend.delete_many([self.chave(chave, versao) for chave in chaves])
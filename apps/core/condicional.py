@@ -0,0 +1,126 @@
+"""
+Requisições condicionais (ETag / Last-Modified) para endpoints de leitura.
+
+Este módulo contém:
+- RespostaCondicionalMixin: responde 304 quando os dados não mudaram
+
+O estado de uma listagem (ou de um objeto) é resumido por um agregado
+`Max(campo_modificacao)` + `Count` sobre o queryset filtrado, guardado no
+namespace de cache do app. A chave inclui a versão do namespace (incrementada
+pelos signals do modelo), então a verificação custa uma leitura de cache e,
+quando o estado expira, uma única consulta agregada - sem serializar nada.
+"""
+import hashlib
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, urlencode
+
+
+class RespostaCondicionalMixin:
+    """
+    Mixin para ViewSets com suporte a If-None-Match / If-Modified-Since.
+
+    Atributos:
+        cache_condicional: CacheNamespace do app (invalidado pelos signals)
+        campo_modificacao: Campo usado no Max() e no Last-Modified
+        acoes_condicionais: Ações com suporte a requisições condicionais
+
+    As ações `list` e `retrieve` padrão já são condicionais; ações
+    customizadas podem usar `responder_condicional(request, gerar, ...)`.
+    """
+
+    cache_condicional = None
+    campo_modificacao = 'updated_at'
+    acoes_condicionais = ('list', 'retrieve')
+
+    def list(self, request, *args, **kwargs):
+        return self.responder_condicional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.responder_condicional(request, super().retrieve, *args, **kwargs)
+
+    def timeout_estado(self):
+        """Tempo máximo (segundos) do estado em cache."""
+        return DEFAULT_TIMEOUT
+
+    def estado_extra(self):
+        """Valor adicional que compõe o ETag (ex.: fronteira de uma janela de tempo)."""
+        return ''
+
+    def _chave_estado(self, request):
+        """Chave do estado: ação, objeto, papel do usuário e query params."""
+        usuario = request.user
+        papel = usuario.role if usuario.is_authenticated else 'anonimo'
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        params = urlencode(sorted(request.query_params.lists()), doseq=True)
+        bruto = f'{self.action}|{self.kwargs.get(lookup, "")}|{papel}|{params}'
+        return 'condicional:' + hashlib.md5(bruto.encode(), usedforsecurity=False).hexdigest()
+
+    def estado_condicional(self, request):
+        """
+        Retorna o estado atual dos dados da requisição.
+
+        Returns:
+            dict: {'ultima': datetime|None, 'total': int, 'versao': int, 'extra': str}
+        """
+        chave = self._chave_estado(request)
+        estado = self.cache_condicional.get(chave)
+        if estado is not None:
+            return estado
+
+        versao = self.cache_condicional.versao()
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == 'retrieve':
+            lookup = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup]})
+        agregado = queryset.order_by().aggregate(
+            ultima=Max(self.campo_modificacao),
+            total=Count('pk'),
+        )
+        estado = {**agregado, 'versao': versao, 'extra': self.estado_extra()}
+        self.cache_condicional.set(chave, estado, timeout=self.timeout_estado())
+        return estado
+
+    def responder_condicional(self, request, gerar, *args, **kwargs):
+        """
+        Retorna 304 se o cliente já tem a versão atual; senão chama `gerar`.
+
+        Args:
+            request: Request do DRF
+            gerar: Função que produz a resposta completa
+        """
+        if request.method not in ('GET', 'HEAD') or self.action not in self.acoes_condicionais:
+            return gerar(request, *args, **kwargs)
+
+        estado = self.estado_condicional(request)
+        if self.action == 'retrieve' and not estado['total']:
+            # Objeto inexistente: deixa a view responder 404
+            return gerar(request, *args, **kwargs)
+
+        ultima = estado['ultima']
+        assinatura = '|'.join([
+            self._chave_estado(request),
+            str(estado['versao']),
+            ultima.isoformat() if ultima else '',
+            str(estado['total']),
+            str(estado['extra']),
+        ])
+        etag = '"%s"' % hashlib.md5(assinatura.encode(), usedforsecurity=False).hexdigest()
+        last_modified = int(ultima.timestamp()) if ultima else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = gerar(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # O conteúdo depende do papel do usuário autenticado
+        patch_vary_headers(response, ('Authorization',))
+        # Permite guardar a resposta, mas obriga a revalidar a cada uso
+        patch_cache_control(response, no_cache=True)
+        return response
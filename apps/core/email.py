@@ -0,0 +1,195 @@
+"""
+Envio de emails pela fila de tarefas.
+
+Este módulo contém:
+- enviar_email: enfileira um email a partir de um template (retorna na hora)
+- send_password_reset_email: email de redefinição de senha
+- enviar_agora: renderiza e envia (executado pelo worker, ver core/tarefas.py)
+- enviar_reset_agora: monta e envia o email de redefinição (executado pelo worker)
+
+Templates ficam em `templates/emails/<nome>/`: `assunto.txt`, `corpo.txt`
+e, opcionalmente, `corpo.html` (enviado como alternativa HTML).
+
+O worker (`processar_tarefas`) mantém uma conexão SMTP aberta e a reutiliza
+entre os emails de um lote e dos lotes seguintes, reabrindo-a após
+EMAIL_CONEXAO_OCIOSA segundos sem uso ou se o servidor a encerrar. Cada
+domínio de destino recebe no máximo EMAIL_LIMITE_POR_DOMINIO emails por
+minuto; o excedente é reagendado para a janela seguinte, sem contar como falha.
+
+O token de redefinição de senha não vai para a fila (os argumentos das
+tarefas ficam no banco e no admin): a tarefa recebe só o ID do usuário e uma
+referência aleatória a uma entrada do cache com o token, que expira junto
+com ele. O link é montado no worker; expirado o token, o email não é enviado.
+Essa entrada fica no cache `compartilhado` (db ou Redis, ver settings), pois o
+worker pode rodar em outro host, que não enxerga o cache em arquivo da API.
+
+Em desenvolvimento e testes o backend é o console/arquivo/memória
+(EMAIL_BACKEND), com o mesmo caminho pela fila.
+
+Configurações (settings):
+    EMAIL_BACKEND, EMAIL_HOST, EMAIL_PORT, ...: padrão do Django
+    EMAIL_LIMITE_POR_DOMINIO: emails por minuto para um mesmo domínio
+    EMAIL_CONEXAO_OCIOSA: segundos sem uso antes de reabrir a conexão
+"""
+import logging
+import secrets
+import smtplib
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template import TemplateDoesNotExist
+from django.template.loader import render_to_string
+
+from apps.tarefas.fila import Reagendar, enfileirar
+
+from .cache import CacheNamespace
+
+logger = logging.getLogger(__name__)
+
+cache = CacheNamespace('email')
+# Referências aos tokens de redefinição: lidas pelo worker, talvez em outro host
+cache_reset = CacheNamespace('email', alias='compartilhado')
+
+# Nome da tarefa registrada em core/tarefas.py
+TAREFA_ENVIO = 'core.enviar_email'
+
+# Nome da tarefa registrada em core/tarefas.py
+TAREFA_RESET_SENHA = 'core.enviar_reset_senha'
+
+# Janela (segundos) do limite por domínio
+JANELA_LIMITE = 60
+
+# Validade do token de redefinição de senha (minutos)
+VALIDADE_RESET_MINUTOS = 30
+
+
+def enviar_email(template, destinatario, contexto=None):
+    """
+    Enfileira um email; o envio acontece no worker, após o commit.
+
+    Args:
+        template: Pasta em templates/emails/ (ex.: 'reset_senha')
+        destinatario: Endereço de destino
+        contexto: Variáveis do template (serializáveis em JSON)
+    """
+    enfileirar(TAREFA_ENVIO, (template, destinatario, contexto or {}))
+
+
+def send_password_reset_email(usuario, token):
+    """
+    Enfileira o email com o link de redefinição de senha.
+
+    Args:
+        usuario: Destinatário
+        token: Token válido por VALIDADE_RESET_MINUTOS (fica só no cache)
+    """
+    referencia = secrets.token_hex(16)
+    cache_reset.set(f'reset:{referencia}', token, timeout=VALIDADE_RESET_MINUTOS * 60)
+    enfileirar(TAREFA_RESET_SENHA, (usuario.pk, referencia))
+
+
+def renderizar(template, contexto):
+    """
+    Renderiza assunto, texto e HTML (None se não houver) de um template de email.
+
+    Returns:
+        tuple: (assunto, texto, html)
+    """
+    contexto = {'app_url': settings.APP_URL, **contexto}
+    assunto = render_to_string(f'emails/{template}/assunto.txt', contexto)
+    texto = render_to_string(f'emails/{template}/corpo.txt', contexto)
+    try:
+        html = render_to_string(f'emails/{template}/corpo.html', contexto)
+    except TemplateDoesNotExist:
+        html = None
+    # Quebras de linha no assunto invalidam o cabeçalho
+    return ' '.join(assunto.split()), texto, html
+
+
+def _verificar_limite(destinatario):
+    """Reagenda o envio se o domínio de destino já atingiu o limite da janela atual."""
+    limite = getattr(settings, 'EMAIL_LIMITE_POR_DOMINIO', 30)
+    if not limite:
+        return
+    dominio = destinatario.rsplit('@', 1)[-1].lower()
+    janela = int(time.time() // JANELA_LIMITE)
+    enviados = cache.incr(f'dominio:{dominio}:{janela}', timeout=JANELA_LIMITE * 2)
+    if enviados > limite:
+        restante = JANELA_LIMITE - time.time() % JANELA_LIMITE
+        raise Reagendar(int(restante) + 1, f'Limite de envio para {dominio} atingido')
+
+
+class _ConexaoPersistente:
+    """Conexão do backend de email reaproveitada entre envios do mesmo processo."""
+
+    def __init__(self):
+        self._conexao = None
+        self._ultimo_uso = 0.0
+        self._lock = threading.Lock()
+
+    def _abrir(self):
+        self.fechar()
+        self._conexao = get_connection(fail_silently=False)
+        self._conexao.open()
+
+    def fechar(self):
+        if self._conexao is not None:
+            try:
+                self._conexao.close()
+            except Exception:
+                logger.debug('Falha ao fechar a conexão de email', exc_info=True)
+            self._conexao = None
+
+    def enviar(self, mensagem):
+        ociosa = getattr(settings, 'EMAIL_CONEXAO_OCIOSA', 60)
+        with self._lock:
+            if self._conexao is None or time.monotonic() - self._ultimo_uso > ociosa:
+                self._abrir()
+            try:
+                mensagem.connection = self._conexao
+                mensagem.send()
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                # Servidor encerrou a conexão ociosa: reabre e tenta uma vez
+                self._abrir()
+                mensagem.connection = self._conexao
+                mensagem.send()
+            self._ultimo_uso = time.monotonic()
+
+
+_conexao = _ConexaoPersistente()
+
+
+def enviar_agora(template, destinatario, contexto):
+    """Renderiza e envia um email pela conexão persistente do processo."""
+    _verificar_limite(destinatario)
+    assunto, texto, html = renderizar(template, contexto)
+    mensagem = EmailMultiAlternatives(assunto, texto, settings.DEFAULT_FROM_EMAIL, [destinatario])
+    if html:
+        mensagem.attach_alternative(html, 'text/html')
+    _conexao.enviar(mensagem)
+
+
+def enviar_reset_agora(usuario_id, referencia):
+    """Envia o link de redefinição se o token referenciado ainda é válido."""
+    chave = f'reset:{referencia}'
+    token = cache_reset.get(chave)
+    if token is None:
+        logger.warning(
+            'Token de redefinição expirado ou já enviado; email ao usuário %s descartado',
+            usuario_id,
+        )
+        return
+    # Import local: core não depende de contas no carregamento
+    from apps.contas.models import Usuario
+
+    usuario = Usuario.objects.filter(pk=usuario_id).only('email', 'name').first()
+    if usuario is None:
+        return
+    enviar_agora('reset_senha', usuario.email, {
+        'nome': usuario.name,
+        'reset_url': f'{settings.APP_URL}/reset-password?token={token}',
+        'validade_minutos': VALIDADE_RESET_MINUTOS,
+    })
+    cache_reset.delete(chave)
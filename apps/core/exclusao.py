@@ -0,0 +1,236 @@
+"""
+Soft delete, restauração e expurgo em lote.
+
+Este módulo contém:
+- excluir: soft delete de um QuerySet, propagado às relações em `soft_delete_cascade`
+- restaurar: desfaz a exclusão e restaura os filhos excluídos junto
+- expurgar: exclusão definitiva, em lotes, dos registros deletados há muito tempo
+- modelos_com_soft_delete: modelos com `deleted_at`, filhos antes dos pais
+- excluidos_logicamente / restaurados: signals enviados após cada UPDATE
+
+Cada tabela recebe um único UPDATE, filtrado por subquery (sem carregar
+instâncias nem disparar post_save). Todos os registros de uma cascata
+recebem o mesmo `deleted_at`: na restauração, um filho só volta se foi
+excluído no mesmo instante que o pai (filhos excluídos antes continuam
+excluídos).
+
+Como os UPDATEs não disparam signals de modelo, a auditoria (modelos com
+AuditavelMixin) é registrada aqui, e quem mantém caches deve ouvir
+`excluidos_logicamente` e `restaurados` (argumentos: sender=modelo, pks).
+"""
+from collections import Counter
+
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import CASCADE, Exists, OuterRef, ProtectedError, RestrictedError
+from django.dispatch import Signal
+from django.utils import timezone
+
+from . import auditoria
+from .middleware import contexto_auditoria
+from .models import AuditavelMixin, LogAuditoria
+
+# Registros removidos por transação no expurgo
+TAMANHO_LOTE_EXPURGO = 500
+
+excluidos_logicamente = Signal()
+restaurados = Signal()
+
+_json = DjangoJSONEncoder()
+
+
+def _filhos(modelo):
+    """Gera (modelo_filho, nome_da_fk) das relações em `soft_delete_cascade`."""
+    for nome in getattr(modelo, 'soft_delete_cascade', ()):
+        relacao = modelo._meta.get_field(nome)
+        yield relacao.related_model, relacao.field.name
+
+
+def _tem_soft_delete(modelo):
+    return any(campo.name == 'deleted_at' for campo in modelo._meta.concrete_fields)
+
+
+def _dependentes_com_soft_delete(modelo):
+    """Gera (modelo, nome_da_fk) das relações que o DELETE do Django removeria em cascata."""
+    for relacao in modelo._meta.related_objects:
+        if relacao.on_delete is CASCADE and _tem_soft_delete(relacao.related_model):
+            yield relacao.related_model, relacao.field.name
+
+
+def _com_dependentes_vivos(modelo, pks):
+    """pks de `pks` ainda referenciados por registros vivos (não excluídos)."""
+    vivos = set()
+    for dependente, fk in _dependentes_com_soft_delete(modelo):
+        vivos.update(
+            dependente._base_manager.filter(
+                **{f'{fk}__in': pks}, deleted_at__isnull=True
+            ).values_list(fk, flat=True)
+        )
+    return vivos
+
+
+def _campos_atualizados(modelo, deleted_at, agora):
+    campos = {'deleted_at': deleted_at}
+    if any(campo.name == 'updated_at' for campo in modelo._meta.concrete_fields):
+        campos['updated_at'] = agora
+    return campos
+
+
+def _auditar(modelo, acao, linhas, novo):
+    """Registra a ação para cada (pk, deleted_at anterior) de `linhas`."""
+    if not issubclass(modelo, AuditavelMixin):
+        return
+    usuario, ip, user_agent = contexto_auditoria()
+    novo = _json.default(novo) if novo else None
+    for pk, anterior in linhas:
+        auditoria.registrar(
+            usuario,
+            acao,
+            modelo.__name__,
+            pk,
+            dados_anteriores={'deleted_at': _json.default(anterior) if anterior else None},
+            dados_novos={'deleted_at': novo},
+            ip_address=ip,
+            user_agent=user_agent,
+        )
+
+
+def _excluir(alvos, agora, contagem):
+    modelo = alvos.model
+    linhas = list(alvos.values_list('pk', 'deleted_at'))
+    if not linhas:
+        return
+
+    # Filhos primeiro: a subquery sobre os pais ainda os encontra vivos
+    for filho, fk in _filhos(modelo):
+        _excluir(
+            filho._base_manager.filter(**{f'{fk}__in': alvos.values('pk')}, deleted_at__isnull=True),
+            agora,
+            contagem,
+        )
+
+    contagem[modelo._meta.label] += alvos.update(**_campos_atualizados(modelo, agora, agora))
+    _auditar(modelo, LogAuditoria.Acao.DELETAR, linhas, agora)
+    excluidos_logicamente.send(sender=modelo, pks=[pk for pk, _ in linhas])
+
+
+def _restaurar(alvos, agora, contagem):
+    modelo = alvos.model
+    linhas = list(alvos.values_list('pk', 'deleted_at'))
+    if not linhas:
+        return
+
+    for filho, fk in _filhos(modelo):
+        excluido_junto = alvos.filter(pk=OuterRef(fk), deleted_at=OuterRef('deleted_at'))
+        _restaurar(filho._base_manager.filter(Exists(excluido_junto)), agora, contagem)
+
+    contagem[modelo._meta.label] += alvos.update(**_campos_atualizados(modelo, None, agora))
+    _auditar(modelo, LogAuditoria.Acao.RESTAURAR, linhas, None)
+    restaurados.send(sender=modelo, pks=[pk for pk, _ in linhas])
+
+
+def _normalizar(queryset, **filtros):
+    """Reescreve o QuerySet (que pode ter anotações/ordenação) como `pk IN (subquery)`."""
+    return queryset.model._base_manager.using(queryset.db).filter(
+        pk__in=queryset.values('pk'),
+        **filtros,
+    )
+
+
+def excluir(queryset, agora=None):
+    """
+    Soft delete dos registros do QuerySet e, em cascata, dos seus filhos.
+
+    Args:
+        queryset: Registros a excluir (os já excluídos são ignorados)
+        agora: Instante gravado em `deleted_at` (padrão: timezone.now())
+
+    Returns:
+        tuple: (total, {label_do_modelo: quantidade}), como QuerySet.delete
+    """
+    agora = agora or timezone.now()
+    contagem = Counter()
+    with transaction.atomic(using=queryset.db):
+        _excluir(_normalizar(queryset, deleted_at__isnull=True), agora, contagem)
+    return sum(contagem.values()), dict(contagem)
+
+
+def restaurar(queryset):
+    """
+    Restaura os registros do QuerySet e os filhos excluídos na mesma operação.
+
+    Returns:
+        tuple: (total, {label_do_modelo: quantidade})
+    """
+    contagem = Counter()
+    with transaction.atomic(using=queryset.db):
+        _restaurar(_normalizar(queryset, deleted_at__isnull=False), timezone.now(), contagem)
+    return sum(contagem.values()), dict(contagem)
+
+
+def modelos_com_soft_delete():
+    """
+    Modelos com campo `deleted_at`, cada filho de `soft_delete_cascade` antes do pai.
+
+    É a ordem do expurgo: um pai só é removido depois dos filhos (que podem
+    protegê-lo com on_delete=PROTECT).
+    """
+    ordem = []
+
+    def visitar(modelo):
+        if modelo in ordem:
+            return
+        for filho, _fk in _filhos(modelo):
+            visitar(filho)
+        ordem.append(modelo)
+
+    for modelo in apps.get_models():
+        if _tem_soft_delete(modelo):
+            visitar(modelo)
+    return ordem
+
+
+def expurgar(modelo, antes_de, tamanho_lote=TAMANHO_LOTE_EXPURGO):
+    """
+    Remove definitivamente os registros com `deleted_at < antes_de`, em lotes.
+
+    Cada lote é uma transação curta (`DELETE ... WHERE id IN (...)`, com as
+    cascatas do Django), e a paginação por chave primária evita reler a
+    tabela do início. Um lote bloqueado por PROTECT/RESTRICT é refeito
+    linha a linha, e os registros ainda referenciados são mantidos. Também
+    são mantidos os que têm dependentes vivos em relações CASCADE (ex.: um
+    filho restaurado à parte): o DELETE os removeria sem exclusão lógica.
+
+    Returns:
+        tuple: (Counter {label_do_modelo: removidos}, list de pks mantidos)
+    """
+    pendentes = modelo._base_manager.filter(deleted_at__lt=antes_de).order_by('pk')
+    removidos = Counter()
+    mantidos = []
+    ultimo = None
+
+    while True:
+        lote = pendentes if ultimo is None else pendentes.filter(pk__gt=ultimo)
+        pks = list(lote.values_list('pk', flat=True)[:tamanho_lote])
+        if not pks:
+            return removidos, mantidos
+        ultimo = pks[-1]
+
+        vivos = _com_dependentes_vivos(modelo, pks)
+        if vivos:
+            mantidos.extend(pk for pk in pks if pk in vivos)
+            pks = [pk for pk in pks if pk not in vivos]
+            if not pks:
+                continue
+
+        try:
+            with transaction.atomic():
+                removidos.update(modelo._base_manager.filter(pk__in=pks).delete()[1])
+        except (ProtectedError, RestrictedError):
+            for pk in pks:
+                try:
+                    with transaction.atomic():
+                        removidos.update(modelo._base_manager.filter(pk=pk).delete()[1])
+                except (ProtectedError, RestrictedError):
+                    mantidos.append(pk)
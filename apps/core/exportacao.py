@@ -0,0 +1,93 @@
+"""
+Utilitários de exportação em streaming.
+
+Este módulo contém:
+- linhas_csv: gera o CSV em blocos a partir de um iterável de linhas
+- resposta_csv: StreamingHttpResponse para download de CSV
+- intervalo_datas: converte parâmetros de data (YYYY-MM-DD) em limites aware
+
+As exportações leem o banco com `.iterator(chunk_size=...)` e escrevem o CSV
+em blocos, de modo que a memória do worker não cresce com o número de linhas.
+"""
+import csv
+import io
+from datetime import datetime, time, timedelta
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+# Linhas acumuladas antes de enviar um bloco ao cliente
+LINHAS_POR_BLOCO = 500
+
+# Tamanho do lote lido do cursor do banco a cada ida ao servidor
+TAMANHO_LOTE_BANCO = 2000
+
+
+def linhas_csv(cabecalho, linhas, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Gera o conteúdo CSV em blocos de texto.
+
+    Args:
+        cabecalho: Lista com os nomes das colunas
+        linhas: Iterável de sequências (ex.: queryset.values_list().iterator())
+        linhas_por_bloco: Quantidade de linhas por bloco enviado
+
+    Yields:
+        str: Trecho do CSV com até `linhas_por_bloco` linhas
+    """
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(cabecalho)
+
+    pendentes = 1
+    for linha in linhas:
+        escritor.writerow(linha)
+        pendentes += 1
+        if pendentes >= linhas_por_bloco:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pendentes = 0
+
+    if pendentes:
+        yield buffer.getvalue()
+
+
+def resposta_csv(nome_arquivo, cabecalho, linhas):
+    """Retorna um StreamingHttpResponse com o CSV gerado sob demanda."""
+    response = StreamingHttpResponse(
+        linhas_csv(cabecalho, linhas),
+        content_type='text/csv',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{nome_arquivo}"'
+    return response
+
+
+def intervalo_datas(inicio, fim):
+    """
+    Converte datas ISO (YYYY-MM-DD) em limites datetime aware.
+
+    Args:
+        inicio: Data inicial inclusiva (str ou None)
+        fim: Data final inclusiva (str ou None)
+
+    Returns:
+        tuple: (desde, ate) onde `ate` é exclusivo (dia seguinte a `fim`);
+        cada item pode ser None se o parâmetro não foi informado.
+
+    Raises:
+        ValueError: Se alguma data for inválida.
+    """
+    limites = []
+    for valor, deslocamento in ((inicio, 0), (fim, 1)):
+        if not valor:
+            limites.append(None)
+            continue
+        data = parse_date(valor)
+        if data is None:
+            raise ValueError(f'Data inválida: "{valor}". Use o formato AAAA-MM-DD.')
+        limites.append(timezone.make_aware(
+            datetime.combine(data + timedelta(days=deslocamento), time.min)
+        ))
+    return tuple(limites)
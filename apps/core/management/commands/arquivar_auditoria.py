@@ -0,0 +1,53 @@
+"""
+Comando: aplica a retenção do log de auditoria.
+
+Exporta para arquivos JSONL comprimidos (um por mês, em
+AUDITORIA_DIR_ARQUIVO) e remove do banco os logs mais antigos que
+AUDITORIA_RETENCAO_DIAS.
+
+Uso:
+    python manage.py arquivar_auditoria
+    python manage.py arquivar_auditoria --dias 365 --diretorio /backups/auditoria
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.core import particionamento
+
+
+class Command(BaseCommand):
+    help = 'Exporta logs de auditoria antigos para JSONL comprimido e os remove do banco.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias',
+            type=int,
+            default=None,
+            help='Idade mínima (dias) dos logs removidos (padrão: AUDITORIA_RETENCAO_DIAS).',
+        )
+        parser.add_argument(
+            '--diretorio',
+            default=None,
+            help='Diretório dos arquivos (padrão: AUDITORIA_DIR_ARQUIVO).',
+        )
+
+    def handle(self, *args, **options):
+        dias = options['dias']
+        if dias is None:
+            dias = settings.AUDITORIA_RETENCAO_DIAS
+        if dias < settings.AUDITORIA_DIAS_RECENTES:
+            raise CommandError(
+                f'--dias deve ser no mínimo AUDITORIA_DIAS_RECENTES ({settings.AUDITORIA_DIAS_RECENTES}).'
+            )
+
+        resultado = particionamento.aplicar_retencao(
+            timezone.now() - timedelta(days=dias),
+            options['diretorio'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{resultado["exportados"]} logs exportados e removidos; '
+            f'partições removidas: {len(resultado["particoes_removidas"])}.'
+        ))
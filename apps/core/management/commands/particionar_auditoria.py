@@ -0,0 +1,65 @@
+"""
+Comando: particiona (PostgreSQL) ou arquiva (demais bancos) o log de auditoria.
+
+Uso:
+    python manage.py particionar_auditoria                  # cria partições futuras
+    python manage.py particionar_auditoria --converter      # converte a tabela (uma vez)
+    python manage.py particionar_auditoria --meses-a-frente 6
+
+Sem particionamento (SQLite), move para LogAuditoriaArquivo os logs mais
+antigos que AUDITORIA_DIAS_RECENTES (ou --dias).
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.core import particionamento
+
+
+class Command(BaseCommand):
+    help = 'Mantém as partições mensais do log de auditoria (ou o arquivo, sem PostgreSQL).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--converter',
+            action='store_true',
+            help='Converte core_logauditoria em tabela particionada (PostgreSQL, uma vez).',
+        )
+        parser.add_argument(
+            '--meses-a-frente',
+            type=int,
+            default=3,
+            help='Meses futuros com partição garantida (padrão: 3).',
+        )
+        parser.add_argument(
+            '--dias',
+            type=int,
+            default=None,
+            help='Sem particionamento: idade mínima (dias) para mover ao arquivo.',
+        )
+
+    def handle(self, *args, **options):
+        if not particionamento.suporta_particionamento():
+            dias = options['dias']
+            if dias is None:
+                dias = settings.AUDITORIA_DIAS_RECENTES
+            movidos = particionamento.mover_para_arquivo(timezone.now() - timedelta(days=dias))
+            self.stdout.write(self.style.SUCCESS(
+                f'Banco sem particionamento: {movidos} logs com mais de {dias} dias '
+                'movidos para LogAuditoriaArquivo.'
+            ))
+            return
+
+        if not particionamento.particionada():
+            if not options['converter']:
+                raise CommandError(
+                    'core_logauditoria ainda não é particionada. '
+                    'Execute com --converter (em janela de manutenção).'
+                )
+            particionamento.converter_em_particionada(options['meses_a_frente'])
+            self.stdout.write(self.style.SUCCESS('Tabela convertida em particionada por mês.'))
+
+        nomes = particionamento.criar_particoes(options['meses_a_frente'])
+        self.stdout.write(self.style.SUCCESS(f'Partições garantidas: {", ".join(nomes)}'))
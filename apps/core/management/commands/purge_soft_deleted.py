@@ -0,0 +1,67 @@
+"""
+Comando: remove definitivamente os registros soft-deleted antigos.
+
+Percorre os modelos com `deleted_at` (filhos antes dos pais) e apaga, em
+lotes curtos, os registros excluídos há mais de EXCLUSAO_RETENCAO_DIAS.
+Registros ainda referenciados (por PROTECT, ou por registros vivos numa
+relação CASCADE) são mantidos e listados.
+
+Uso:
+    python manage.py purge_soft_deleted
+    python manage.py purge_soft_deleted --dias 365 --lote 200
+    python manage.py purge_soft_deleted --dry-run
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.core import exclusao
+
+
+class Command(BaseCommand):
+    help = 'Remove definitivamente, em lotes, os registros soft-deleted além da retenção.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias',
+            type=int,
+            default=None,
+            help='Idade mínima (dias) da exclusão (padrão: EXCLUSAO_RETENCAO_DIAS).',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=exclusao.TAMANHO_LOTE_EXPURGO,
+            help=f'Registros por transação (padrão: {exclusao.TAMANHO_LOTE_EXPURGO}).',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Apenas conta os registros que seriam removidos.',
+        )
+
+    def handle(self, *args, **options):
+        dias = options['dias'] if options['dias'] is not None else settings.EXCLUSAO_RETENCAO_DIAS
+        if dias < 0 or options['lote'] < 1:
+            raise CommandError('--dias deve ser >= 0 e --lote >= 1.')
+        antes_de = timezone.now() - timedelta(days=dias)
+
+        for modelo in exclusao.modelos_com_soft_delete():
+            label = modelo._meta.label
+            if options['dry_run']:
+                total = modelo._base_manager.filter(deleted_at__lt=antes_de).count()
+                self.stdout.write(f'{label}: {total} registros seriam removidos')
+                continue
+
+            removidos, mantidos = exclusao.expurgar(modelo, antes_de, options['lote'])
+            detalhes = ', '.join(f'{nome}: {n}' for nome, n in sorted(removidos.items()) if n)
+            self.stdout.write(f'{label}: {removidos[label]} removidos' + (f' ({detalhes})' if detalhes else ''))
+            if mantidos:
+                self.stdout.write(self.style.WARNING(
+                    f'{label}: {len(mantidos)} mantidos por ainda serem referenciados '
+                    f'(ids: {", ".join(map(str, mantidos[:20]))}{"..." if len(mantidos) > 20 else ""})'
+                ))
+
+        self.stdout.write(self.style.SUCCESS('Expurgo concluído.'))
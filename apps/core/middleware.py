@@ -0,0 +1,70 @@
+"""
+Middlewares do app core.
+
+Este módulo contém:
+- AuditoriaMiddleware: disponibiliza a requisição atual para a auditoria
+- contexto_auditoria: usuário, IP e user agent da requisição atual
+"""
+import ipaddress
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_requisicao_atual = ContextVar('requisicao_atual', default=None)
+
+
+class AuditoriaMiddleware:
+    """
+    Guarda a requisição em um ContextVar durante o processamento.
+
+    Nada é lido da requisição aqui: usuário, IP e user agent só são obtidos
+    (em `contexto_auditoria`) quando algum modelo auditado é salvo.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _requisicao_atual.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _requisicao_atual.reset(token)
+
+
+def _ip(request):
+    """
+    IP do cliente conforme AUDITORIA_CABECALHO_IP (None se inválido).
+
+    Em X-Forwarded-For cada proxy acrescenta à direita o endereço de quem o
+    chamou, e as entradas à esquerda vêm do próprio cliente (podem ser
+    forjadas). Por isso o IP é o AUDITORIA_PROXIES_CONFIAVEIS-ésimo a partir
+    da direita: o anotado pelo proxy confiável mais externo.
+    """
+    cabecalho = getattr(settings, 'AUDITORIA_CABECALHO_IP', 'REMOTE_ADDR')
+    valor = request.META.get(cabecalho) or request.META.get('REMOTE_ADDR') or ''
+    enderecos = [endereco.strip() for endereco in valor.split(',')]
+    saltos = max(1, getattr(settings, 'AUDITORIA_PROXIES_CONFIAVEIS', 1))
+    valor = enderecos[max(0, len(enderecos) - saltos)]
+    try:
+        return str(ipaddress.ip_address(valor))
+    except ValueError:
+        return None
+
+
+def contexto_auditoria():
+    """
+    Retorna (usuario, ip, user_agent) da requisição atual.
+
+    Fora de uma requisição (comandos, shell) retorna (None, None, '').
+    O usuário é o autenticado pela sessão ou pelo JWT do DRF (que também
+    atribui `request.user` na requisição do Django).
+    """
+    request = _requisicao_atual.get()
+    if request is None:
+        return None, None, ''
+
+    usuario = getattr(request, 'user', None)
+    if usuario is not None and not usuario.is_authenticated:
+        usuario = None
+    return usuario, _ip(request), request.META.get('HTTP_USER_AGENT', '')
@@ -0,0 +1,183 @@
+"""
+Entrega dos arquivos enviados pelos usuários (MEDIA_ROOT).
+
+Este módulo contém:
+- servir_midia: view de `/uploads/<caminho>` com ETag, Range e cache longo
+- nome_imutavel: indica se o nome do arquivo deriva do seu conteúdo
+
+Substitui `django.views.static.serve`, que lê o arquivo pelo Python a cada
+requisição. Aqui o arquivo segue por `FileResponse`: com o `wsgi.file_wrapper`
+do gunicorn o corpo é enviado com `os.sendfile` (sem cópia para o processo),
+inclusive os trechos pedidos por `Range`. Com um proxy na frente, o modo
+MIDIA_SENDFILE delega o envio a ele (`X-Accel-Redirect` no nginx,
+`X-Sendfile` no Apache/lighttpd) e o worker só monta os cabeçalhos.
+
+O ETag (forte) vem do `stat` do arquivo. Nomes que derivam do conteúdo
+(hash: core/storage.py, publicacoes/derivados.py) nunca mudam de conteúdo e recebem
+`Cache-Control: immutable` de um ano; os demais, MIDIA_MAX_AGE segundos.
+
+Configurações (settings):
+    MIDIA_SENDFILE: '' (envia pelo worker), 'x-accel' ou 'x-sendfile'
+    MIDIA_X_ACCEL_PREFIXO: location `internal` do nginx que aponta para MEDIA_ROOT
+    MIDIA_MAX_AGE: max-age (segundos) dos arquivos de nome não imutável
+"""
+import mimetypes
+import re
+import stat
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+# Um ano: arquivos de nome imutável nunca mudam de conteúdo
+MAX_AGE_IMUTAVEL = 365 * 24 * 60 * 60
+
+# `<hash hex>-<variante>.<ext>` ou `<hash hex>.<ext>` (20 a 64 dígitos)
+PADRAO_IMUTAVEL = re.compile(r'(?:^|/)[0-9a-f]{20,64}(?:-[\w]+)?\.\w+$')
+
+# bytes=inicio-fim | bytes=inicio- | bytes=-sufixo (um único intervalo)
+PADRAO_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def nome_imutavel(caminho):
+    """True se o nome do arquivo deriva do seu conteúdo (hash)."""
+    return bool(PADRAO_IMUTAVEL.search(caminho))
+
+
+class _Trecho:
+    """
+    Arquivo limitado a `tamanho` bytes a partir da posição atual.
+
+    Expõe `fileno()`: o gunicorn envia com `os.sendfile` a partir do offset
+    do descritor e até o Content-Length, e o `read()` limitado cobre os
+    servidores sem sendfile (runserver, testes).
+    """
+
+    def __init__(self, arquivo, inicio, tamanho):
+        self._arquivo = arquivo
+        self._restante = tamanho
+        arquivo.seek(inicio)
+
+    def read(self, n=-1):
+        if self._restante <= 0:
+            return b''
+        n = self._restante if n is None or n < 0 else min(n, self._restante)
+        dados = self._arquivo.read(n)
+        self._restante -= len(dados)
+        return dados
+
+    def fileno(self):
+        return self._arquivo.fileno()
+
+    def close(self):
+        self._arquivo.close()
+
+
+def _intervalo(request, tamanho, etag, modificado):
+    """
+    Intervalo (inicio, fim) pedido em `Range`, None para o arquivo inteiro.
+
+    Vários intervalos e `If-Range` desatualizado resultam no arquivo inteiro,
+    como permite a RFC 9110. Levanta ValueError se o intervalo não é satisfazível.
+    """
+    cabecalho = request.META.get('HTTP_RANGE', '')
+    correspondencia = PADRAO_RANGE.match(cabecalho.replace(' ', ''))
+    if not correspondencia:
+        return None
+
+    condicao = request.META.get('HTTP_IF_RANGE')
+    if condicao:
+        data = parse_http_date_safe(condicao)
+        if data is None and parse_etags(condicao) != [etag]:
+            return None
+        if data is not None and data != int(modificado):
+            return None
+
+    inicio, fim = correspondencia.groups()
+    if not inicio and not fim:
+        return None
+    if not inicio:
+        sufixo = int(fim)
+        # Arquivo vazio não tem nenhum byte a servir (RFC 9110, 14.1.2)
+        if not sufixo or not tamanho:
+            raise ValueError
+        return max(tamanho - sufixo, 0), tamanho - 1
+    inicio = int(inicio)
+    fim = min(int(fim), tamanho - 1) if fim else tamanho - 1
+    if inicio >= tamanho or fim < inicio:
+        raise ValueError
+    return inicio, fim
+
+
+@require_safe
+def servir_midia(request, caminho):
+    """
+    GET/HEAD /uploads/<caminho>
+
+    Responde 304 a If-None-Match/If-Modified-Since, 206 a `Range` (um
+    intervalo) e 416 a intervalos fora do arquivo.
+    """
+    try:
+        completo = Path(safe_join(settings.MEDIA_ROOT, caminho))
+        info = completo.stat()
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404('Arquivo não encontrado.')
+    if not stat.S_ISREG(info.st_mode):
+        raise Http404('Arquivo não encontrado.')
+
+    etag = f'"{info.st_mtime_ns:x}-{info.st_size:x}"'
+    modificado = info.st_mtime
+    resposta = get_conditional_response(request, etag=etag, last_modified=int(modificado))
+    if resposta is not None:
+        return _cabecalhos(resposta, caminho, etag, modificado)
+
+    tipo, codificacao = mimetypes.guess_type(completo.name)
+    # Arquivos comprimidos (.gz etc.) seguem como estão, sem Content-Encoding
+    tipo = 'application/octet-stream' if codificacao or not tipo else tipo
+    modo = getattr(settings, 'MIDIA_SENDFILE', '')
+
+    if modo == 'x-accel':
+        resposta = HttpResponse(content_type=tipo)
+        prefixo = getattr(settings, 'MIDIA_X_ACCEL_PREFIXO', '/uploads-internos/').rstrip('/')
+        resposta['X-Accel-Redirect'] = f'{prefixo}/{quote(caminho)}'
+    elif modo == 'x-sendfile':
+        resposta = HttpResponse(content_type=tipo)
+        resposta['X-Sendfile'] = str(completo)
+    else:
+        try:
+            intervalo = _intervalo(request, info.st_size, etag, modificado)
+        except ValueError:
+            resposta = HttpResponse(status=416)
+            resposta['Content-Range'] = f'bytes */{info.st_size}'
+            return _cabecalhos(resposta, caminho, etag, modificado)
+
+        inicio, fim = intervalo or (0, info.st_size - 1)
+        tamanho = max(fim - inicio + 1, 0)
+        if request.method == 'HEAD':
+            resposta = HttpResponse(content_type=tipo)
+        else:
+            resposta = FileResponse(_Trecho(completo.open('rb'), inicio, tamanho), content_type=tipo)
+        resposta['Content-Length'] = tamanho
+        if intervalo:
+            resposta.status_code = 206
+            resposta['Content-Range'] = f'bytes {inicio}-{fim}/{info.st_size}'
+
+    return _cabecalhos(resposta, caminho, etag, modificado)
+
+
+def _cabecalhos(resposta, caminho, etag, modificado):
+    """ETag, Last-Modified, Accept-Ranges e Cache-Control comuns a todas as respostas."""
+    resposta['ETag'] = etag
+    resposta['Last-Modified'] = http_date(modificado)
+    resposta['Accept-Ranges'] = 'bytes'
+    if nome_imutavel(caminho):
+        patch_cache_control(resposta, public=True, max_age=MAX_AGE_IMUTAVEL, immutable=True)
+    else:
+        patch_cache_control(resposta, public=True, max_age=getattr(settings, 'MIDIA_MAX_AGE', 3600))
+    return resposta
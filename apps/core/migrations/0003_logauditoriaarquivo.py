@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:48
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_logauditoria_created_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogAuditoriaArquivo',
+            fields=[
+                ('acao', models.CharField(db_index=True, max_length=80, verbose_name='ação')),
+                ('entidade', models.CharField(db_index=True, max_length=80, verbose_name='entidade')),
+                ('entidade_id', models.BigIntegerField(verbose_name='ID da entidade')),
+                ('dados_anteriores', models.JSONField(blank=True, null=True, verbose_name='dados anteriores')),
+                ('dados_novos', models.JSONField(blank=True, null=True, verbose_name='dados novos')),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True, verbose_name='endereço IP')),
+                ('user_agent', models.TextField(blank=True, default='', verbose_name='user agent')),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='criado em')),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('usuario', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='usuário')),
+            ],
+            options={
+                'verbose_name': 'log de auditoria arquivado',
+                'verbose_name_plural': 'logs de auditoria arquivados',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['entidade', 'entidade_id'], name='core_logaud_entidad_e21e97_idx')],
+            },
+        ),
+    ]
@@ -2,21 +2,47 @@
 Modelos base e utilitários do sistema YpeTec.
 
 Este módulo contém:
+- NAO_DELETADOS: condição dos índices parciais de registros não deletados
+- AuditavelMixin: marca modelos auditados automaticamente (ver signals.py)
+- SoftDeleteModel: modelo abstrato com soft delete em cascata (ver exclusao.py)
 - BaseModel: modelo abstrato com soft delete e timestamps
 - SoftDeleteManager: manager para filtrar registros deletados
-- LogAuditoria: modelo para auditoria de ações
+- LogAuditoria: modelo para auditoria de ações (gravação em lote: auditoria.py)
+- LogAuditoriaArquivo: logs antigos fora da tabela principal (bancos sem particionamento)
 """
+from datetime import timedelta
+
 from django.conf import settings
 from django.db import models
+from django.db.models import DEFERRED
 from django.utils import timezone
 
 
+# Condição dos índices parciais dos modelos com soft delete: os managers
+# padrão sempre filtram `deleted_at IS NULL`, então os índices mais usados
+# cobrem apenas os registros vivos (ver test_runner.py, --index-report)
+NAO_DELETADOS = models.Q(deleted_at__isnull=True)
+
+
 class SoftDeleteQuerySet(models.QuerySet):
     """QuerySet customizado para soft delete."""
 
     def delete(self):
-        """Soft delete em batch."""
-        return self.update(deleted_at=timezone.now())
+        """
+        Soft delete em lote, propagado às relações em `soft_delete_cascade`.
+
+        Returns:
+            tuple: (total, {label_do_modelo: quantidade}), como QuerySet.delete
+        """
+        from .exclusao import excluir
+
+        return excluir(self)
+
+    def restore(self):
+        """Restaura em lote os registros e os filhos excluídos junto com eles."""
+        from .exclusao import restaurar
+
+        return restaurar(self)
 
     def hard_delete(self):
         """Delete real em batch."""
@@ -32,80 +58,124 @@ class SoftDeleteQuerySet(models.QuerySet):
 
 
 class SoftDeleteManager(models.Manager):
-    """Manager que filtra registros soft-deleted por padrão."""
+    """
+    Manager que filtra registros soft-deleted por padrão.
+
+    Modelos com QuerySet próprio (subclasse de SoftDeleteQuerySet) devem usar
+    `SoftDeleteManager.from_queryset(MeuQuerySet)()`.
+    """
+
+    _queryset_class = SoftDeleteQuerySet
 
     def get_queryset(self):
         """Retorna apenas registros não deletados."""
-        return SoftDeleteQuerySet(self.model, using=self._db).alive()
+        return self._queryset_class(self.model, using=self._db).alive()
 
     def with_deleted(self):
         """Retorna todos os registros, incluindo deletados."""
-        return SoftDeleteQuerySet(self.model, using=self._db)
+        return self._queryset_class(self.model, using=self._db)
 
     def only_deleted(self):
         """Retorna apenas registros deletados."""
-        return SoftDeleteQuerySet(self.model, using=self._db).dead()
+        return self._queryset_class(self.model, using=self._db).dead()
 
 
 class AllObjectsManager(models.Manager):
     """Manager que retorna todos os registros, incluindo deletados."""
 
+    _queryset_class = SoftDeleteQuerySet
+
     def get_queryset(self):
-        return SoftDeleteQuerySet(self.model, using=self._db)
+        return self._queryset_class(self.model, using=self._db)
 
 
-class BaseModel(models.Model):
+class AuditavelMixin:
     """
-    Modelo base abstrato com soft delete e timestamps.
+    Mixin para modelos com auditoria automática de alterações.
 
-    Todos os modelos principais do sistema devem herdar desta classe.
+    Guarda os valores lidos do banco em `from_db` (sem SELECT extra), e os
+    signals do app core (ver signals.py) gravam em LogAuditoria apenas os
+    campos alterados a cada save.
+
+    Atributos:
+        campos_nao_auditados: Campos ignorados no diff
+        campos_mascarados: Campos registrados apenas como alterados ('***')
+    """
+
+    campos_nao_auditados = ('updated_at', 'last_login')
+    campos_mascarados = ('password',)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._valores_auditoria = {
+            nome: valor
+            for nome, valor in zip(field_names, values)
+            if valor is not DEFERRED
+        }
+        return instance
+
+
+class SoftDeleteModel(models.Model):
+    """
+    Modelo abstrato com soft delete.
+
+    `delete()` e `restore()` (da instância ou do QuerySet) usam o motor em
+    lote de exclusao.py: um UPDATE por tabela, propagado às relações
+    reversas listadas em `soft_delete_cascade`.
 
     Atributos:
-        created_at: Data/hora de criação (auto)
-        updated_at: Data/hora da última atualização (auto)
         deleted_at: Data/hora do soft delete (null = não deletado)
+        soft_delete_cascade: Nomes das relações reversas excluídas junto
+            (ex.: ('membros', 'submissoes')); os filhos devem ter soft delete
 
     Managers:
         objects: Retorna apenas registros não deletados (padrão)
         all_objects: Retorna todos os registros, incluindo deletados
     """
 
-    created_at = models.DateTimeField(
-        'criado em',
-        auto_now_add=True,
-        db_index=True,
-    )
-    updated_at = models.DateTimeField(
-        'atualizado em',
-        auto_now=True,
-    )
+    # Sem índice próprio: os índices dos modelos são parciais em `deleted_at IS NULL`
     deleted_at = models.DateTimeField(
         'deletado em',
         null=True,
         blank=True,
-        db_index=True,
     )
 
+    soft_delete_cascade = ()
+
     objects = SoftDeleteManager()
     all_objects = AllObjectsManager()
 
     class Meta:
         abstract = True
-        ordering = ['-created_at']
 
     def delete(self, using=None, keep_parents=False):
-        """Soft delete: marca deleted_at em vez de remover."""
-        self.deleted_at = timezone.now()
-        self.save(update_fields=['deleted_at', 'updated_at'])
+        """Soft delete em cascata: marca deleted_at em vez de remover."""
+        from .exclusao import excluir
+
+        agora = timezone.now()
+        excluir(type(self)._base_manager.using(using).filter(pk=self.pk), agora=agora)
+        self._marcar_exclusao(agora)
 
     def hard_delete(self, using=None, keep_parents=False):
         """Delete real do banco de dados."""
         super().delete(using=using, keep_parents=keep_parents)
 
     def restore(self):
-        """Restaura um registro soft-deleted."""
-        self.deleted_at = None
-        self.save(update_fields=['deleted_at', 'updated_at'])
+        """Restaura o registro e os filhos excluídos junto com ele."""
+        from .exclusao import restaurar
+
+        restaurar(type(self)._base_manager.filter(pk=self.pk))
+        self._marcar_exclusao(None)
+
+    def _marcar_exclusao(self, instante):
+        """Reflete na instância (e na base do diff de auditoria) o UPDATE feito em lote."""
+        self.deleted_at = instante
+        if hasattr(self, 'updated_at'):
+            self.updated_at = timezone.now() if instante is None else instante
+        valores = getattr(self, '_valores_auditoria', None)
+        if valores is not None and 'deleted_at' in valores:
+            valores['deleted_at'] = instante
 
     @property
     def is_deleted(self):
@@ -113,33 +183,57 @@ class BaseModel(models.Model):
         return self.deleted_at is not None
 
 
-class LogAuditoria(models.Model):
+class BaseModel(AuditavelMixin, SoftDeleteModel):
     """
-    Log de auditoria para rastrear ações no sistema.
+    Modelo base abstrato com soft delete e timestamps.
 
-    Registra quem fez o quê, quando e em qual entidade.
-    """
+    Todos os modelos principais do sistema devem herdar desta classe.
 
-    class Acao(models.TextChoices):
-        """Tipos de ação para auditoria."""
-        CRIAR = 'CRIAR', 'Criar'
-        ATUALIZAR = 'ATUALIZAR', 'Atualizar'
-        DELETAR = 'DELETAR', 'Deletar'
-        RESTAURAR = 'RESTAURAR', 'Restaurar'
-        LOGIN = 'LOGIN', 'Login'
-        LOGOUT = 'LOGOUT', 'Logout'
-        AVALIAR = 'AVALIAR', 'Avaliar'
-        SUBMETER = 'SUBMETER', 'Submeter'
-        PUBLICAR = 'PUBLICAR', 'Publicar'
+    Atributos:
+        created_at: Data/hora de criação (auto)
+        updated_at: Data/hora da última atualização (auto)
+        deleted_at: Data/hora do soft delete (null = não deletado)
 
-    usuario = models.ForeignKey(
-        settings.AUTH_USER_MODEL,
-        on_delete=models.SET_NULL,
-        null=True,
-        blank=True,
-        related_name='logs_auditoria',
-        verbose_name='usuário',
+    Managers:
+        objects: Retorna apenas registros não deletados (padrão)
+        all_objects: Retorna todos os registros, incluindo deletados
+    """
+
+    created_at = models.DateTimeField(
+        'criado em',
+        auto_now_add=True,
+        db_index=True,
+    )
+    updated_at = models.DateTimeField(
+        'atualizado em',
+        auto_now=True,
     )
+
+    class Meta:
+        abstract = True
+        ordering = ['-created_at']
+
+
+class RegistroAuditoriaQuerySet(models.QuerySet):
+    """QuerySet dos logs de auditoria."""
+
+    def recentes(self, dias=None):
+        """
+        Logs dos últimos `dias` (padrão: AUDITORIA_DIAS_RECENTES).
+
+        O filtro por `created_at` permite ao PostgreSQL ler apenas as
+        partições mensais do período (ver particionamento.py).
+        """
+        if dias is None:
+            dias = settings.AUDITORIA_DIAS_RECENTES
+        return self.filter(created_at__gte=timezone.now() - timedelta(days=dias))
+
+
+class RegistroAuditoriaBase(models.Model):
+    """
+    Campos comuns do log de auditoria e do seu arquivo (LogAuditoriaArquivo).
+    """
+
     acao = models.CharField(
         'ação',
         max_length=80,
@@ -173,12 +267,48 @@ class LogAuditoria(models.Model):
         blank=True,
         default='',
     )
+    # default (e não auto_now_add): logs gravados em lote guardam o momento da ação
     created_at = models.DateTimeField(
         'criado em',
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         db_index=True,
     )
 
+    objects = RegistroAuditoriaQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+
+class LogAuditoria(RegistroAuditoriaBase):
+    """
+    Log de auditoria para rastrear ações no sistema.
+
+    Registra quem fez o quê, quando e em qual entidade.
+    """
+
+    class Acao(models.TextChoices):
+        """Tipos de ação para auditoria."""
+        CRIAR = 'CRIAR', 'Criar'
+        ATUALIZAR = 'ATUALIZAR', 'Atualizar'
+        DELETAR = 'DELETAR', 'Deletar'
+        RESTAURAR = 'RESTAURAR', 'Restaurar'
+        LOGIN = 'LOGIN', 'Login'
+        LOGOUT = 'LOGOUT', 'Logout'
+        AVALIAR = 'AVALIAR', 'Avaliar'
+        SUBMETER = 'SUBMETER', 'Submeter'
+        PUBLICAR = 'PUBLICAR', 'Publicar'
+
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='logs_auditoria',
+        verbose_name='usuário',
+    )
+
     class Meta:
         verbose_name = 'log de auditoria'
         verbose_name_plural = 'logs de auditoria'
@@ -214,3 +344,52 @@ class LogAuditoria(models.Model):
             entidade_id=entidade_id,
             **kwargs
         )
+
+    @classmethod
+    def enfileirar(cls, usuario, acao, entidade, entidade_id, **kwargs):
+        """
+        Registra um log de forma assíncrona, gravado em lote após o commit.
+
+        Mesmos argumentos de `registrar`; ver apps/core/auditoria.py.
+        """
+        from .auditoria import registrar
+
+        registrar(usuario, acao, entidade, entidade_id, **kwargs)
+
+
+class LogAuditoriaArquivo(RegistroAuditoriaBase):
+    """
+    Logs de auditoria antigos, movidos para fora da tabela principal.
+
+    Usado em bancos sem particionamento (SQLite): o comando
+    `particionar_auditoria` move para cá os logs mais antigos que
+    AUDITORIA_DIAS_RECENTES, mantendo LogAuditoria pequena. Os registros
+    preservam o id original. No PostgreSQL a tabela principal é
+    particionada por mês e esta tabela fica vazia.
+    """
+
+    id = models.BigIntegerField(
+        'ID',
+        primary_key=True,
+    )
+    # Sem constraint: o arquivo não deve bloquear nem ser alterado por exclusões de usuários
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='usuário',
+    )
+
+    class Meta:
+        verbose_name = 'log de auditoria arquivado'
+        verbose_name_plural = 'logs de auditoria arquivados'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['entidade', 'entidade_id']),
+        ]
+
+    def __str__(self):
+        return f'#{self.id} - {self.acao} {self.entidade}#{self.entidade_id}'
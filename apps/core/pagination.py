@@ -0,0 +1,57 @@
+"""
+Paginação da API REST.
+
+Este módulo contém:
+- CursorOpcionalPagination: paginação por cursor (keyset) ativada sob demanda
+
+Sem parâmetros de paginação na URL as listagens continuam retornando
+arrays simples, formato esperado pelo frontend Node.js legado.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class CursorOpcionalPagination(CursorPagination):
+    """
+    Paginação por cursor ativada quando a requisição envia `cursor` ou `page_size`.
+
+    Ao contrário da paginação por OFFSET, cada página é obtida com um filtro
+    `WHERE campo < posição` sobre a coluna ordenada, então páginas profundas
+    custam o mesmo que a primeira (desde que a coluna seja indexada).
+
+    A ordenação vem do atributo `cursor_ordering` da view, que deve começar
+    por uma coluna indexada. O cursor do DRF guarda apenas o valor do
+    primeiro campo: os seguintes (ex.: `-id`) só tornam a ordem estável e
+    não fazem parte da posição. Linhas com o mesmo valor do primeiro campo
+    na fronteira da página são puladas por OFFSET dentro desse valor; em
+    ordenações como `('-submetido_em', '-id')`, muitos registros com o mesmo
+    instante tornam essas páginas mais caras (e o cursor fica instável se
+    um deles for inserido ou removido entre as páginas). Só `('-id',)` é um
+    keyset puro.
+
+    Exemplo:
+        GET /api/submissions/?page_size=50
+        GET /api/submissions/?cursor=cD0yMDI2LTAx...
+    """
+
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-created_at', '-id')
+
+    def paginacao_solicitada(self, request):
+        """Retorna True se o cliente pediu paginação explicitamente."""
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Pagina apenas quando solicitado; caso contrário retorna None (array simples)."""
+        if not self.paginacao_solicitada(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        """Usa `cursor_ordering` da view, se definido."""
+        ordering = getattr(view, 'cursor_ordering', None)
+        if ordering:
+            return (ordering,) if isinstance(ordering, str) else tuple(ordering)
+        return super().get_ordering(request, queryset, view)
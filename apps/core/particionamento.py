@@ -0,0 +1,303 @@
+"""
+Particionamento, arquivamento e retenção do log de auditoria.
+
+Este módulo contém:
+- suporta_particionamento / particionada: detecção do suporte no banco
+- converter_em_particionada: transforma core_logauditoria em tabela particionada
+- criar_particoes: garante as partições mensais até alguns meses à frente
+- mover_para_arquivo: fallback sem particionamento (move logs antigos para LogAuditoriaArquivo)
+- aplicar_retencao: exporta logs antigos para JSONL comprimido e os remove do banco
+
+No PostgreSQL, `core_logauditoria` é particionada por mês em `created_at`
+(`core_logauditoria_pAAAA_MM` + uma partição padrão). Inserções vão só para a
+partição do mês corrente, consultas filtradas por data (ex.: admin) leem só as
+partições do período, e a retenção descarta meses inteiros com DROP TABLE.
+
+Nos demais bancos (SQLite em desenvolvimento), os logs mais antigos que
+AUDITORIA_DIAS_RECENTES são movidos para LogAuditoriaArquivo, mantendo a
+tabela principal pequena.
+"""
+import gzip
+import os
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .exportacao import TAMANHO_LOTE_BANCO
+from .models import LogAuditoria, LogAuditoriaArquivo
+
+TABELA = LogAuditoria._meta.db_table
+TABELA_LEGADA = f'{TABELA}_legado'
+PARTICAO_PADRAO = f'{TABELA}_padrao'
+PREFIXO_PARTICAO = f'{TABELA}_p'
+
+# Registros movidos/removidos por transação
+TAMANHO_LOTE_MOVER = 5000
+
+
+def suporta_particionamento():
+    """True se o banco padrão suporta particionamento declarativo (PostgreSQL)."""
+    return connection.vendor == 'postgresql'
+
+
+def particionada():
+    """True se core_logauditoria já é uma tabela particionada."""
+    if not suporta_particionamento():
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table p '
+            'JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s',
+            [TABELA],
+        )
+        return cursor.fetchone() is not None
+
+
+def inicio_do_mes(instante):
+    """Primeiro instante (UTC) do mês de `instante`."""
+    instante = instante.astimezone(dt_timezone.utc)
+    return datetime(instante.year, instante.month, 1, tzinfo=dt_timezone.utc)
+
+
+def mes_seguinte(inicio):
+    """Primeiro instante do mês seguinte a `inicio` (início de mês)."""
+    if inicio.month == 12:
+        return inicio.replace(year=inicio.year + 1, month=1)
+    return inicio.replace(month=inicio.month + 1)
+
+
+def nome_particao(inicio):
+    return f'{PREFIXO_PARTICAO}{inicio:%Y_%m}'
+
+
+def particoes_existentes():
+    """Retorna {inicio_do_mes: nome} das partições mensais existentes."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i '
+            'JOIN pg_class c ON c.oid = i.inhrelid '
+            'JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = %s',
+            [TABELA],
+        )
+        nomes = [linha[0] for linha in cursor.fetchall()]
+
+    particoes = {}
+    for nome in nomes:
+        if not nome.startswith(PREFIXO_PARTICAO):
+            continue
+        ano, mes = nome[len(PREFIXO_PARTICAO):].split('_')
+        particoes[datetime(int(ano), int(mes), 1, tzinfo=dt_timezone.utc)] = nome
+    return particoes
+
+
+def _criar_particao(cursor, inicio):
+    nome = nome_particao(inicio)
+    # DDL não aceita parâmetros: os limites são datas geradas aqui, não entrada externa
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS {connection.ops.quote_name(nome)} '
+        f'PARTITION OF {connection.ops.quote_name(TABELA)} '
+        f"FOR VALUES FROM ('{inicio.isoformat()}') TO ('{mes_seguinte(inicio).isoformat()}')"
+    )
+    return nome
+
+
+def criar_particoes(meses_a_frente=3, desde=None):
+    """
+    Cria as partições mensais de `desde` (padrão: mês atual) até `meses_a_frente`.
+
+    Deve rodar periodicamente (ex.: diariamente junto do deploy/cron) para que
+    as inserções nunca caiam na partição padrão.
+
+    Returns:
+        list: Nomes das partições criadas ou já existentes no intervalo
+    """
+    inicio = inicio_do_mes(desde or timezone.now())
+    fim = inicio_do_mes(timezone.now())
+    for _ in range(meses_a_frente):
+        fim = mes_seguinte(fim)
+
+    nomes = []
+    with connection.cursor() as cursor:
+        while inicio <= fim:
+            nomes.append(_criar_particao(cursor, inicio))
+            inicio = mes_seguinte(inicio)
+    return nomes
+
+
+@transaction.atomic
+def converter_em_particionada(meses_a_frente=3):
+    """
+    Converte core_logauditoria em tabela particionada por mês (PostgreSQL).
+
+    A tabela atual é renomeada, uma tabela particionada com as mesmas colunas
+    é criada (chave primária passa a ser `(id, created_at)`, exigência do
+    PostgreSQL), os dados são copiados e os índices recriados com os nomes
+    originais. Roda em uma única transação: bloqueia inserções durante a
+    cópia, então deve ser executada em janela de manutenção.
+    """
+    quote = connection.ops.quote_name
+    tabela, legada = quote(TABELA), quote(TABELA_LEGADA)
+    usuario_fk = LogAuditoria._meta.get_field('usuario')
+    tabela_usuario = quote(usuario_fk.related_model._meta.db_table)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {tabela} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(
+            'SELECT indexname, indexdef FROM pg_indexes '
+            "WHERE tablename = %s AND indexname NOT LIKE '%%_pkey'",
+            [TABELA],
+        )
+        indices = cursor.fetchall()
+        cursor.execute(f'SELECT MIN(created_at), MAX(id) FROM {tabela}')
+        mais_antigo, ultimo_id = cursor.fetchone()
+
+        cursor.execute(f'ALTER TABLE {tabela} RENAME TO {legada}')
+        cursor.execute(
+            f'CREATE TABLE {tabela} (LIKE {legada} INCLUDING DEFAULTS INCLUDING IDENTITY) '
+            'PARTITION BY RANGE (created_at)'
+        )
+        cursor.execute(f'ALTER TABLE {tabela} ADD PRIMARY KEY (id, created_at)')
+        cursor.execute(
+            f'ALTER TABLE {tabela} ADD CONSTRAINT {quote(TABELA + "_usuario_id_fk")} '
+            f'FOREIGN KEY (usuario_id) REFERENCES {tabela_usuario} (id) '
+            'DEFERRABLE INITIALLY DEFERRED'
+        )
+
+        # Sequência do id: identidade nova (continua do maior id) ou serial legado
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABELA])
+        sequencia = cursor.fetchone()[0]
+        if sequencia:
+            cursor.execute(
+                'SELECT setval(%s::regclass, %s, %s)',
+                [sequencia, ultimo_id or 1, ultimo_id is not None],
+            )
+        else:
+            cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABELA_LEGADA])
+            sequencia_legada = cursor.fetchone()[0]
+            if sequencia_legada:
+                cursor.execute(f'ALTER SEQUENCE {sequencia_legada} OWNED BY {tabela}.id')
+
+        cursor.execute(f'CREATE TABLE {quote(PARTICAO_PADRAO)} PARTITION OF {tabela} DEFAULT')
+
+    criar_particoes(meses_a_frente, desde=mais_antigo)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'INSERT INTO {tabela} SELECT * FROM {legada}')
+        cursor.execute(f'DROP TABLE {legada}')
+        # As definições foram lidas antes da renomeação (apontam para o nome
+        # original); índices no pai valem para todas as partições
+        for _nome, definicao in indices:
+            cursor.execute(definicao)
+
+
+def mover_para_arquivo(antes_de):
+    """
+    Move logs com created_at < `antes_de` para LogAuditoriaArquivo, em lotes.
+
+    Fallback para bancos sem particionamento.
+
+    Returns:
+        int: Quantidade de logs movidos
+    """
+    campos = [campo.attname for campo in LogAuditoria._meta.concrete_fields]
+    movidos = 0
+    while True:
+        with transaction.atomic():
+            lote = list(
+                LogAuditoria.objects.filter(created_at__lt=antes_de)
+                .order_by('id')
+                .values(*campos)[:TAMANHO_LOTE_MOVER]
+            )
+            if not lote:
+                return movidos
+            LogAuditoriaArquivo.objects.bulk_create(
+                [LogAuditoriaArquivo(**linha) for linha in lote],
+                ignore_conflicts=True,
+            )
+            LogAuditoria.objects.filter(id__in=[linha['id'] for linha in lote]).delete()
+        movidos += len(lote)
+
+
+def caminho_arquivo(diretorio, inicio):
+    """Arquivo JSONL comprimido do mês de `inicio`."""
+    return os.path.join(diretorio, f'logauditoria-{inicio:%Y-%m}.jsonl.gz')
+
+
+def exportar_jsonl(queryset, diretorio):
+    """
+    Acrescenta os logs do queryset aos arquivos mensais (um JSON por linha).
+
+    Os arquivos são abertos em modo de acréscimo: cada execução adiciona um
+    membro gzip, e o conjunto continua legível com `zcat`/`gzip.open`.
+
+    Returns:
+        int: Quantidade de logs exportados
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    campos = [campo.attname for campo in queryset.model._meta.concrete_fields]
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+    arquivos = {}
+    exportados = 0
+    try:
+        for linha in queryset.order_by('id').values(*campos).iterator(chunk_size=TAMANHO_LOTE_BANCO):
+            inicio = inicio_do_mes(linha['created_at'])
+            if inicio not in arquivos:
+                arquivos[inicio] = gzip.open(caminho_arquivo(diretorio, inicio), 'at', encoding='utf-8')
+            arquivos[inicio].write(encoder.encode(linha) + '\n')
+            exportados += 1
+    finally:
+        for arquivo in arquivos.values():
+            arquivo.close()
+    return exportados
+
+
+def _excluir_em_lotes(queryset):
+    excluidos = 0
+    while True:
+        ids = list(queryset.order_by('id').values_list('id', flat=True)[:TAMANHO_LOTE_MOVER])
+        if not ids:
+            return excluidos
+        excluidos += queryset.model.objects.filter(id__in=ids).delete()[0]
+
+
+def aplicar_retencao(antes_de, diretorio=None):
+    """
+    Exporta para JSONL comprimido e remove do banco os logs anteriores a `antes_de`.
+
+    No PostgreSQL particionado, meses inteiros anteriores ao corte são
+    exportados e descartados com DROP TABLE da partição; logs do mês do corte
+    (e da partição padrão) são tratados linha a linha. Nos demais bancos, os
+    logs de LogAuditoria e LogAuditoriaArquivo são exportados e excluídos
+    em lotes.
+
+    Returns:
+        dict: {'exportados': int, 'particoes_removidas': list}
+    """
+    diretorio = diretorio or settings.AUDITORIA_DIR_ARQUIVO
+    exportados = 0
+    removidas = []
+
+    if particionada():
+        quote = connection.ops.quote_name
+        for inicio, nome in sorted(particoes_existentes().items()):
+            if mes_seguinte(inicio) > antes_de:
+                continue
+            exportados += exportar_jsonl(
+                LogAuditoria.objects.filter(created_at__gte=inicio, created_at__lt=mes_seguinte(inicio)),
+                diretorio,
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE {quote(nome)}')
+            removidas.append(nome)
+
+    for modelo in (LogAuditoria, LogAuditoriaArquivo):
+        antigos = modelo.objects.filter(created_at__lt=antes_de)
+        exportados += exportar_jsonl(antigos, diretorio)
+        _excluir_em_lotes(antigos)
+
+    return {'exportados': exportados, 'particoes_removidas': removidas}
@@ -0,0 +1,138 @@
+"""
+Signals do app core.
+
+Auditoria automática dos modelos com AuditavelMixin: cada save grava em
+LogAuditoria (via escritor em lotes, ver auditoria.py) apenas os campos
+alterados, comparando com os valores carregados em `from_db`.
+
+Operações em lote (`QuerySet.update`, `QuerySet.delete`) não disparam
+signals e não são auditadas por aqui.
+"""
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.fields.files import FieldFile
+from django.db.models.signals import post_delete, post_save
+
+from . import auditoria
+from .middleware import contexto_auditoria
+from .models import AuditavelMixin, LogAuditoria
+
+_json = DjangoJSONEncoder()
+
+MASCARA = '***'
+
+
+def _valor_json(valor):
+    """Converte o valor de um campo para algo serializável em JSONField."""
+    if valor is None or isinstance(valor, (str, int, float, bool)):
+        return valor
+    if isinstance(valor, FieldFile):
+        return valor.name or None
+    if isinstance(valor, (list, dict)):
+        return valor
+    return _json.default(valor)
+
+
+def _campos_auditados(modelo):
+    """Mapa {attname: campo} dos campos concretos auditados do modelo."""
+    ignorados = set(modelo.campos_nao_auditados)
+    return {
+        campo.attname: campo
+        for campo in modelo._meta.concrete_fields
+        if campo.name not in ignorados and campo.attname not in ignorados
+    }
+
+
+def _valores_atuais(instance, attnames):
+    return {attname: _valor_json(getattr(instance, attname)) for attname in attnames}
+
+
+def _mascarar(modelo, dados):
+    for campo in modelo.campos_mascarados:
+        if campo in dados:
+            dados[campo] = MASCARA
+    return dados
+
+
+def _registrar(sender, instance, acao, anteriores, novos):
+    usuario, ip, user_agent = contexto_auditoria()
+    auditoria.registrar(
+        usuario,
+        acao,
+        sender.__name__,
+        instance.pk,
+        dados_anteriores=_mascarar(sender, anteriores) if anteriores else None,
+        dados_novos=_mascarar(sender, novos) if novos else None,
+        ip_address=ip,
+        user_agent=user_agent,
+    )
+
+
+def auditar_salvamento(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Registra CRIAR, ATUALIZAR, DELETAR (soft delete) ou RESTAURAR."""
+    if raw:
+        return
+
+    campos = _campos_auditados(sender)
+    if created:
+        novos = _valores_atuais(instance, campos)
+        instance._valores_auditoria = dict(novos)
+        _registrar(sender, instance, LogAuditoria.Acao.CRIAR, None, novos)
+        return
+
+    originais = getattr(instance, '_valores_auditoria', None)
+    if originais is None:
+        # Instância não veio do banco: sem base para o diff
+        return
+
+    attnames = [attname for attname in campos if attname in originais]
+    if update_fields is not None:
+        # update_fields aceita nomes ou attnames (ex.: 'projeto' ou 'projeto_id')
+        attnames = [
+            attname for attname in attnames
+            if attname in update_fields or campos[attname].name in update_fields
+        ]
+
+    anteriores, novos = {}, {}
+    for attname in attnames:
+        antigo = _valor_json(originais[attname])
+        novo = _valor_json(getattr(instance, attname))
+        if antigo != novo:
+            anteriores[attname] = antigo
+            novos[attname] = novo
+            originais[attname] = novo
+    if not novos:
+        return
+
+    acao = LogAuditoria.Acao.ATUALIZAR
+    if 'deleted_at' in novos:
+        acao = LogAuditoria.Acao.DELETAR if novos['deleted_at'] else LogAuditoria.Acao.RESTAURAR
+    _registrar(sender, instance, acao, anteriores, novos)
+
+
+def auditar_exclusao(sender, instance, **kwargs):
+    """Registra a exclusão definitiva (hard delete)."""
+    campos = _campos_auditados(sender)
+    valores = getattr(instance, '_valores_auditoria', None) or _valores_atuais(instance, campos)
+    anteriores = {
+        attname: _valor_json(valor)
+        for attname, valor in valores.items()
+        if attname in campos
+    }
+    _registrar(sender, instance, LogAuditoria.Acao.DELETAR, anteriores, None)
+
+
+def conectar():
+    """Conecta os signals de auditoria a todos os modelos com AuditavelMixin."""
+    for modelo in apps.get_models():
+        if issubclass(modelo, AuditavelMixin):
+            post_save.connect(
+                auditar_salvamento,
+                sender=modelo,
+                dispatch_uid=f'auditoria_save_{modelo._meta.label}',
+            )
+            post_delete.connect(
+                auditar_exclusao,
+                sender=modelo,
+                dispatch_uid=f'auditoria_delete_{modelo._meta.label}',
+            )
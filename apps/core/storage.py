@@ -0,0 +1,75 @@
+"""
+Armazenamento de uploads endereçado pelo conteúdo.
+
+Este módulo contém:
+- ConteudoEnderecadoStorage: FileSystemStorage que nomeia cada arquivo pelo sha256
+- nome_enderecado: indica se um nome já segue o formato do storage
+
+O nome gravado é `<pasta de upload_to>/<h[0:2]>/<h[2:4]>/<sha256>.<ext>`:
+- arquivos idênticos são gravados uma vez só (o segundo upload reaproveita o nome);
+- cada diretório recebe no máximo 256 subdiretórios, independente do volume;
+- o conteúdo de um nome nunca muda, então a URL pode ser guardada para sempre
+  por navegadores e CDN (ver core/midia.py, `Cache-Control: immutable`).
+
+Como um mesmo arquivo pode ser referenciado por vários registros, o storage
+nunca é limpo automaticamente ao trocar um logo.
+"""
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+# Bytes lidos por vez ao calcular o hash
+TAMANHO_BLOCO = 64 * 1024
+
+PADRAO_ENDERECADO = re.compile(r'(?:^|/)[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(?:\.\w+)?$')
+
+
+def nome_enderecado(nome):
+    """True se `nome` já está no formato `<pasta>/ab/cd/<sha256>.<ext>`."""
+    return bool(PADRAO_ENDERECADO.search(nome or ''))
+
+
+def _hash_conteudo(conteudo):
+    digest = hashlib.sha256()
+    if hasattr(conteudo, 'seek'):
+        conteudo.seek(0)
+    for bloco in conteudo.chunks(TAMANHO_BLOCO):
+        digest.update(bloco if isinstance(bloco, bytes) else bloco.encode())
+    if hasattr(conteudo, 'seek'):
+        conteudo.seek(0)
+    return digest.hexdigest()
+
+
+class ConteudoEnderecadoStorage(FileSystemStorage):
+    """
+    FileSystemStorage com nomes derivados do sha256 do conteúdo.
+
+    O nome pedido só contribui com a pasta (`upload_to`) e a extensão.
+    """
+
+    def nome_para(self, nome, digest):
+        """Nome final de um arquivo `nome` cujo conteúdo tem hash `digest`."""
+        pasta = posixpath.dirname(nome.replace('\\', '/'))
+        extensao = os.path.splitext(nome)[1].lower()
+        return posixpath.join(pasta, digest[:2], digest[2:4], digest + extensao)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        destino = self.nome_para(name, _hash_conteudo(content))
+        if self.exists(destino):
+            # Mesmo conteúdo já gravado: reaproveita
+            return destino
+
+        salvo = super().save(destino, content, max_length=max_length)
+        if salvo != destino:
+            # Outro processo gravou o mesmo conteúdo entre exists() e a gravação
+            self.delete(salvo)
+        return destino
@@ -0,0 +1,24 @@
+"""
+Tarefas em segundo plano do app core (ver apps/tarefas/fila.py).
+
+Este módulo contém:
+- enviar_email: renderiza e envia um email (enfileirado por core/email.py)
+- enviar_reset_senha: envia o link de redefinição de senha (idem)
+"""
+from apps.tarefas.fila import tarefa
+from apps.tarefas.models import Tarefa
+
+from . import email
+
+
+@tarefa(nome=email.TAREFA_ENVIO, prioridade=Tarefa.Prioridade.ALTA, max_tentativas=8)
+def enviar_email(template, destinatario, contexto):
+    """Envia um email; falhas do servidor são repetidas com espera exponencial."""
+    email.enviar_agora(template, destinatario, contexto)
+
+
+# Poucas tentativas: com a espera exponencial, todas cabem na validade do token
+@tarefa(nome=email.TAREFA_RESET_SENHA, prioridade=Tarefa.Prioridade.ALTA, max_tentativas=4)
+def enviar_reset_senha(usuario_id, referencia):
+    """Envia o link de redefinição; token expirado descarta o envio."""
+    email.enviar_reset_agora(usuario_id, referencia)
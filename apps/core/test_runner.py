@@ -0,0 +1,184 @@
+"""
+Test runner do projeto.
+
+Este módulo contém:
+- RelatorioIndicesRunner: DiscoverRunner com cache em memória e a opção --index-report
+
+Os testes usam sempre o cache `locmem` (CACHES_TESTE), nunca o backend de
+CACHE_BACKEND: com o backend file (padrão), versões de namespace, tokens
+revogados, vagas de admissão e listas de editais ficariam no `.cache/` do
+projeto, passando de uma execução da suíte para outra e para o runserver.
+
+Com `python manage.py test --index-report`, as consultas executadas pelos
+testes sobre tabelas com índices parciais (`deleted_at IS NULL`, ver
+NAO_DELETADOS em models.py) são registradas e, ao final da suíte, passam por
+EXPLAIN. O relatório mostra quantas consultas usam cada índice parcial e
+lista as que leem a tabela inteira (candidatas a um novo índice).
+
+Não usar com --parallel: as consultas são coletadas no processo principal.
+"""
+import re
+from collections import Counter
+from contextlib import ExitStack
+
+from django.apps import apps
+from django.db import connections, transaction
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+# Consultas distintas guardadas para o EXPLAIN (por banco)
+MAX_CONSULTAS = 2000
+
+# Cache dos testes: memória do processo, vazio a cada execução
+CACHES_TESTE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ypetec-testes',
+        'KEY_PREFIX': 'ypetec',
+    },
+    'compartilhado': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ypetec-testes-compartilhado',
+        'KEY_PREFIX': 'ypetec',
+    },
+}
+
+
+def indices_parciais():
+    """Retorna {nome_do_indice: tabela} dos índices com condição."""
+    return {
+        indice.name: modelo._meta.db_table
+        for modelo in apps.get_models()
+        for indice in modelo._meta.indexes
+        if indice.condition is not None
+    }
+
+
+class ColetorConsultas:
+    """execute_wrapper que guarda os SELECTs distintos sobre as tabelas monitoradas."""
+
+    def __init__(self, alias, tabelas):
+        self.alias = alias
+        self.tabelas = tabelas
+        self.padrao = re.compile(
+            r'\bFROM\s+"(%s)"' % '|'.join(re.escape(tabela) for tabela in tabelas)
+        )
+        self.consultas = {}
+        self.execucoes = Counter()
+        self.pausado = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if not self.pausado and not many and sql.lstrip().upper().startswith('SELECT'):
+            if self.padrao.search(sql):
+                self.execucoes[sql] += 1
+                if sql not in self.consultas and len(self.consultas) < MAX_CONSULTAS:
+                    self.consultas[sql] = params
+        return execute(sql, params, many, context)
+
+    def _plano(self, cursor, vendor, sql, params):
+        if vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return '\n'.join(str(linha[-1]) for linha in cursor.fetchall())
+        cursor.execute('EXPLAIN ' + sql, params)
+        return '\n'.join(str(linha[0]) for linha in cursor.fetchall())
+
+    def analisar(self, nomes_indices):
+        """
+        Executa EXPLAIN em cada consulta coletada.
+
+        Returns:
+            tuple: (Counter {índice: execuções}, list [(execuções, sql)] sem índice)
+        """
+        conexao = connections[self.alias]
+        vendor = conexao.vendor
+        usos = Counter()
+        sem_indice = []
+
+        self.pausado = True
+        try:
+            with transaction.atomic(using=self.alias), conexao.cursor() as cursor:
+                if vendor == 'postgresql':
+                    # Tabelas de teste quase vazias: sem isto o planner prefere Seq Scan
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+                for sql, params in self.consultas.items():
+                    try:
+                        plano = self._plano(cursor, vendor, sql, params)
+                    except Exception:
+                        continue
+                    usados = [nome for nome in nomes_indices if nome in plano]
+                    for nome in usados:
+                        usos[nome] += self.execucoes[sql]
+                    if not usados and self._varredura_completa(plano, vendor):
+                        sem_indice.append((self.execucoes[sql], sql))
+        finally:
+            self.pausado = False
+        return usos, sem_indice
+
+    def _varredura_completa(self, plano, vendor):
+        for tabela in self.tabelas:
+            # SQLite: SCAN percorre todas as linhas, mesmo "USING INDEX" (índice só para ordenar);
+            # a busca por índice aparece como SEARCH
+            if vendor == 'sqlite' and re.search(rf'\bSCAN {re.escape(tabela)}\b', plano):
+                return True
+            if vendor != 'sqlite' and f'Seq Scan on {tabela}' in plano:
+                return True
+        return False
+
+
+class RelatorioIndicesRunner(DiscoverRunner):
+    """DiscoverRunner com cache em memória e relatório opcional dos índices parciais."""
+
+    def __init__(self, index_report=False, **kwargs):
+        super().__init__(**kwargs)
+        self.index_report = index_report
+        self._cache_teste = override_settings(CACHES=CACHES_TESTE)
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._cache_teste.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._cache_teste.disable()
+        super().teardown_test_environment(**kwargs)
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--index-report',
+            action='store_true',
+            help='Relata quais consultas usam ou não os índices parciais (deleted_at IS NULL).',
+        )
+
+    def run_suite(self, suite, **kwargs):
+        if not self.index_report:
+            return super().run_suite(suite, **kwargs)
+
+        indices = indices_parciais()
+        tabelas = sorted(set(indices.values()))
+        coletores = [ColetorConsultas(alias, tabelas) for alias in connections]
+        with ExitStack() as pilha:
+            for coletor in coletores:
+                pilha.enter_context(connections[coletor.alias].execute_wrapper(coletor))
+            resultado = super().run_suite(suite, **kwargs)
+
+        for coletor in coletores:
+            if coletor.consultas:
+                self._imprimir(coletor, indices)
+        return resultado
+
+    def _imprimir(self, coletor, indices):
+        usos, sem_indice = coletor.analisar(list(indices))
+        linhas = [
+            f'Relatório de índices parciais (banco "{coletor.alias}")',
+            f'{len(coletor.consultas)} consultas distintas sobre: {", ".join(coletor.tabelas)}',
+            '',
+        ]
+        linhas += [f'  {usos[nome]:6d}  {nome} ({tabela})' for nome, tabela in sorted(indices.items())]
+        if sem_indice:
+            linhas += ['', 'Consultas com leitura completa da tabela:']
+            linhas += [
+                f'  {execucoes:6d}x  {sql[:300]}'
+                for execucoes, sql in sorted(sem_indice, reverse=True)
+            ]
+        self.log('\n'.join(linhas))
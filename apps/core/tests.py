@@ -0,0 +1,110 @@
+"""
+Testes do app core.
+"""
+from django.core import mail
+from django.core.cache import caches
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.contas.models import Usuario
+from apps.editais.models import Edital
+from apps.projetos.models import Projeto
+from apps.tarefas import fila
+
+from . import email
+
+from .test_runner import ColetorConsultas, indices_parciais
+
+
+class RelatorioIndicesTest(TestCase):
+    """Coleta e análise de consultas do relatório --index-report."""
+
+    def setUp(self):
+        self.indices = indices_parciais()
+        self.coletor = ColetorConsultas(connection.alias, sorted(set(self.indices.values())))
+        self.aluno = Usuario.objects.create_user(
+            cpf='00000000001', email='aluno@ypetec.test', password='x', name='Aluno',
+        )
+
+    def _coletar(self, consulta):
+        with connection.execute_wrapper(self.coletor):
+            list(consulta)
+        return self.coletor.analisar(list(self.indices))
+
+    def test_indices_parciais_dos_modelos(self):
+        self.assertEqual(self.indices['projeto_resp_status_vivo_idx'], 'projetos_projeto')
+        self.assertEqual(self.indices['usuario_role_status_vivo_idx'], 'contas_usuario')
+
+    def test_indices_do_autocompletar_existem(self):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            self.skipTest('Sem índices de autocompletar neste banco.')
+        esperados = {
+            'contas_usuario': {
+                'contas_usuario_name_prefixo_idx',
+                'contas_usuario_email_prefixo_idx',
+                'contas_usuario_cpf_prefixo_idx',
+            },
+            'projetos_projeto': {'projetos_projeto_titulo_prefixo_idx'},
+        }
+        with connection.cursor() as cursor:
+            for tabela, nomes in esperados.items():
+                existentes = connection.introspection.get_constraints(cursor, tabela)
+                self.assertLessEqual(nomes, set(existentes), tabela)
+
+    def test_consulta_de_registros_vivos_usa_indice_parcial(self):
+        consulta = Projeto.objects.filter(responsavel=self.aluno, status=Projeto.Status.SUBMETIDO)
+        usos, sem_indice = self._coletar(consulta)
+        self.assertEqual(usos['projeto_resp_status_vivo_idx'], 1)
+        self.assertEqual(sem_indice, [])
+
+    def test_filtro_por_status_do_edital_usa_indice_parcial(self):
+        usos, sem_indice = self._coletar(Edital.objects.filter(status=Edital.Status.PUBLICADO))
+        self.assertEqual(usos['edital_status_inicio_vivo_idx'], 1)
+        self.assertEqual(sem_indice, [])
+
+    def test_consulta_sem_filtro_indexado_e_relatada(self):
+        usos, sem_indice = self._coletar(Projeto.objects.filter(resumo='r'))
+        self.assertFalse(usos)
+        self.assertEqual(len(sem_indice), 1)
+        self.assertIn('projetos_projeto', sem_indice[0][1])
+
+
+class CacheTestesTest(SimpleTestCase):
+    """O runner troca o cache configurado por um cache em memória."""
+
+    def test_cache_em_memoria(self):
+        self.assertEqual(type(caches['default']).__name__, 'LocMemCache')
+
+
+@override_settings(TAREFAS_SINCRONAS=False, AUDITORIA_SINCRONA=True)
+class EmailResetSenhaTest(TestCase):
+    """O worker lê a referência ao token no cache compartilhado, não no da API."""
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(
+            cpf='00000000001', email='aluno@ypetec.test', password='x', name='Aluno',
+        )
+
+    def _executar_fila(self):
+        for tarefa in fila.reservar('teste:1', 10):
+            fila.executar(tarefa)
+
+    def test_worker_envia_link_com_o_token(self):
+        email.send_password_reset_email(self.usuario, 'token-secreto')
+        # Outro host não enxerga o cache local da API
+        caches['default'].clear()
+
+        self._executar_fila()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['aluno@ypetec.test'])
+        self.assertIn('token=token-secreto', mail.outbox[0].body)
+
+    def test_token_expirado_descarta_com_aviso(self):
+        email.send_password_reset_email(self.usuario, 'token-secreto')
+        caches['compartilhado'].clear()
+
+        with self.assertLogs('apps.core.email', 'WARNING'):
+            self._executar_fila()
+
+        self.assertEqual(mail.outbox, [])
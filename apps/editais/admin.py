@@ -22,7 +22,7 @@ class EditalAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at', 'deleted_at']
     date_hierarchy = 'inicio'
     ordering = ['-inicio']
-    raw_id_fields = ['criado_por']
+    autocomplete_fields = ['criado_por']
 
     fieldsets = (
         (None, {'fields': ('titulo', 'descricao')}),
@@ -8,3 +8,7 @@ class EditaisConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.editais'
     verbose_name = 'Editais'
+
+    def ready(self):
+        """Registra os signals do app."""
+        from . import signals  # noqa: F401
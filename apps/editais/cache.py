@@ -0,0 +1,205 @@
+"""
+Cache das listas de editais por janela de tempo.
+
+As listas de editais abertos, futuros e encerrados só mudam quando um edital
+é salvo/removido ou quando o relógio cruza o `inicio` ou o `fim` de algum
+edital. Cada entrada expira exatamente na próxima dessas fronteiras e é
+invalidada pelos signals de Edital (ver signals.py), que incrementam a
+versão do namespace `editais` no cache compartilhado.
+
+Para as submissões, cada processo mantém em memória as janelas (título,
+início e fim) dos editais publicados ainda não encerrados e os IDs de todos
+os editais. A cópia é recarregada quando a versão do namespace muda (signals
+de Edital, em qualquer worker que enxergue o mesmo cache) ou após
+JANELAS_IDADE_MAXIMA segundos; entre recargas, verificar se um edital está
+aberto custa uma leitura de cache e nenhuma consulta ao banco, mesmo no pico
+de submissões antes do `fim`. Quem encontra o edital ausente ou fechado pede
+uma recarga (`recarregar=True`) antes de recusar: uma recusa nunca vem de
+uma cópia com mais de JANELAS_RECARGA_MINIMA segundos.
+"""
+import math
+import threading
+import time
+from collections import namedtuple
+
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from apps.core.cache import CacheNamespace
+
+from .models import Edital
+
+cache = CacheNamespace('editais')
+
+# Janelas disponíveis (nomes dos classmethods de Edital)
+JANELAS = ('abertos', 'futuros', 'encerrados')
+
+# Janela correspondente a cada valor de ?status= da API
+JANELA_POR_STATUS = {
+    'open': 'abertos',
+    'upcoming': 'futuros',
+    'closed': 'encerrados',
+}
+
+CHAVE = 'janela:{}'
+
+# Sentinela para distinguir "sem fronteira futura" (None) de "fora do cache"
+SEM_FRONTEIRA = object()
+
+# Idade máxima (segundos) da cópia em memória das janelas de submissão
+JANELAS_IDADE_MAXIMA = 60
+
+# Idade mínima (segundos) para uma recarga pedida: várias requisições que
+# encontram o mesmo edital fechado não recarregam a cópia uma a uma
+JANELAS_RECARGA_MINIMA = 1
+
+
+class JanelaSubmissao(namedtuple('JanelaSubmissao', ['titulo', 'inicio', 'fim'])):
+    """Período de submissão de um edital publicado."""
+
+    __slots__ = ()
+
+    def aberta(self, agora=None):
+        """Mesma regra de Edital.esta_aberto (o status já é PUBLICADO)."""
+        agora = agora or timezone.now()
+        return self.inicio <= agora <= self.fim
+
+
+# Cópia das janelas neste processo: {'versao', 'carregada_em', 'janelas', 'existentes'}
+_janelas = {'versao': None, 'carregada_em': 0.0, 'janelas': {}, 'existentes': frozenset()}
+_lock_janelas = threading.Lock()
+
+
+def proxima_fronteira(agora=None):
+    """
+    Retorna o próximo instante em que alguma janela muda de conteúdo.
+
+    É o menor entre os `inicio` ainda no futuro e os `fim` ainda não
+    ultrapassados. Retorna None se nenhum edital tiver fronteira futura.
+    """
+    agora = agora or timezone.now()
+    fronteiras = Edital.objects.aggregate(
+        proximo_inicio=Min('inicio', filter=Q(inicio__gt=agora)),
+        proximo_fim=Min('fim', filter=Q(fim__gte=agora)),
+    )
+    candidatos = [valor for valor in fronteiras.values() if valor is not None]
+    return min(candidatos) if candidatos else None
+
+
+def segundos_ate(instante, agora=None):
+    """Timeout de cache (em segundos) até `instante`; None = sem expiração."""
+    if instante is None:
+        return None
+    agora = agora or timezone.now()
+    # Arredonda para cima: a entrada só pode expirar depois da fronteira
+    return max(1, math.ceil((instante - agora).total_seconds()))
+
+
+def fronteira_em_cache(agora=None):
+    """
+    Próxima fronteira, com o instante guardado no cache.
+
+    Só consulta o banco quando a fronteira em cache expira (ou o namespace
+    é invalidado). Retorna None se não houver fronteira futura.
+    """
+    agora = agora or timezone.now()
+    # Versão lida antes do banco (ver editais_da_janela)
+    chave = cache.chave('fronteira', cache.versao())
+    fronteira = cache.backend.get(chave, SEM_FRONTEIRA)
+    if fronteira is SEM_FRONTEIRA or (fronteira is not None and fronteira < agora):
+        fronteira = proxima_fronteira(agora)
+        cache.backend.set(chave, fronteira, timeout=segundos_ate(fronteira, agora))
+    return fronteira
+
+
+def segundos_ate_proxima_fronteira():
+    """
+    Segundos até a próxima fronteira (None = sem expiração).
+
+    Usado como timeout de caches derivados das janelas (ex.: fragmentos da
+    home, estado de requisições condicionais).
+    """
+    agora = timezone.now()
+    return segundos_ate(fronteira_em_cache(agora), agora)
+
+
+def editais_da_janela(janela):
+    """
+    Retorna a lista de editais da janela, servida do cache quando possível.
+
+    Args:
+        janela: 'abertos', 'futuros' ou 'encerrados'
+
+    Returns:
+        list[Edital]: Editais na ordenação padrão do modelo
+    """
+    if janela not in JANELAS:
+        raise ValueError(f'Janela inválida: {janela}')
+
+    # A versão é lida uma vez, antes do banco: se um edital mudar durante a
+    # consulta, a lista fica sob a versão anterior, já invalidada, e nunca
+    # sob a nova (onde, sem fronteira futura, ficaria para sempre)
+    chave = cache.chave(CHAVE.format(janela), cache.versao())
+    editais = cache.backend.get(chave)
+    if editais is None:
+        agora = timezone.now()
+        timeout = segundos_ate(proxima_fronteira(agora), agora)
+        editais = list(getattr(Edital, janela)())
+        cache.backend.set(chave, editais, timeout=timeout)
+    return editais
+
+
+def _carregar_janelas(versao):
+    janelas = {
+        pk: JanelaSubmissao(titulo, inicio, fim)
+        for pk, titulo, inicio, fim in Edital.objects.filter(
+            status=Edital.Status.PUBLICADO,
+            fim__gte=timezone.now(),
+        ).values_list('pk', 'titulo', 'inicio', 'fim')
+    }
+    existentes = frozenset(Edital.objects.values_list('pk', flat=True))
+    _janelas.update(
+        versao=versao,
+        carregada_em=time.monotonic(),
+        janelas=janelas,
+        existentes=existentes,
+    )
+
+
+def janela_submissao(edital_id, recarregar=False):
+    """
+    Janela de submissão do edital, da cópia em memória do processo.
+
+    Args:
+        edital_id: ID do edital
+        recarregar: Relê as janelas do banco (se a cópia tem mais de
+            JANELAS_RECARGA_MINIMA segundos), ex.: edital ausente ou fechado na cópia
+
+    Returns:
+        JanelaSubmissao, ou None se o edital não existe, não está publicado ou
+        já estava encerrado na última recarga
+    """
+    versao = cache.versao()
+    with _lock_janelas:
+        idade = time.monotonic() - _janelas['carregada_em']
+        expirada = idade > (JANELAS_RECARGA_MINIMA if recarregar else JANELAS_IDADE_MAXIMA)
+        if _janelas['versao'] != versao or expirada:
+            _carregar_janelas(versao)
+        return _janelas['janelas'].get(edital_id)
+
+
+def edital_existente(edital_id):
+    """
+    True se o edital existia (publicado ou não) na última recarga da cópia.
+
+    Chamada logo após `janela_submissao(..., recarregar=True)`, para
+    distinguir um edital fechado de um inexistente sem consultar o banco.
+    """
+    with _lock_janelas:
+        return edital_id in _janelas['existentes']
+
+
+def invalidar():
+    """Invalida todo o namespace de editais (em todos os workers)."""
+    cache.invalidar()
+    _janelas['versao'] = None
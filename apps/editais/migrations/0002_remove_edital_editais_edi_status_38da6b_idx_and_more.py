@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('editais', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='edital',
+            name='editais_edi_status_38da6b_idx',
+        ),
+        migrations.AlterField(
+            model_name='edital',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='deletado em'),
+        ),
+        migrations.AddIndex(
+            model_name='edital',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['status', 'inicio'], name='edital_status_inicio_vivo_idx'),
+        ),
+    ]
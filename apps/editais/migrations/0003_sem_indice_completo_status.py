@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('editais', '0002_remove_edital_editais_edi_status_38da6b_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='edital',
+            name='status',
+            field=models.CharField(choices=[('RASCUNHO', 'Rascunho'), ('PUBLICADO', 'Publicado'), ('ENCERRADO', 'Encerrado')], default='RASCUNHO', max_length=20, verbose_name='status'),
+        ),
+    ]
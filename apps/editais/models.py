@@ -8,7 +8,7 @@ from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
-from apps.core.models import BaseModel
+from apps.core.models import NAO_DELETADOS, BaseModel
 
 
 class Edital(BaseModel):
@@ -44,7 +44,6 @@ class Edital(BaseModel):
         max_length=20,
         choices=Status.choices,
         default=Status.RASCUNHO,
-        db_index=True,
     )
     criado_por = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -57,8 +56,13 @@ class Edital(BaseModel):
         verbose_name = 'edital'
         verbose_name_plural = 'editais'
         ordering = ['-inicio']
+        # Filtros por status usam o índice parcial abaixo (status é a primeira coluna)
         indexes = [
-            models.Index(fields=['status', 'inicio']),
+            models.Index(
+                fields=['status', 'inicio'],
+                condition=NAO_DELETADOS,
+                name='edital_status_inicio_vivo_idx',
+            ),
             models.Index(fields=['criado_por']),
         ]
 
@@ -0,0 +1,26 @@
+"""
+Signals do app editais.
+
+Invalida o cache de janelas de editais sempre que um edital muda
+(inclusive por soft delete/restauração em lote, ver core/exclusao.py).
+
+A invalidação acontece após o commit: antes dele, outro worker poderia
+recarregar os dados antigos e guardá-los já sob a versão nova.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.exclusao import excluidos_logicamente, restaurados
+
+from . import cache
+from .models import Edital
+
+
+@receiver(post_save, sender=Edital)
+@receiver(post_delete, sender=Edital)
+@receiver(excluidos_logicamente, sender=Edital)
+@receiver(restaurados, sender=Edital)
+def invalidar_cache_editais(sender, **kwargs):
+    """Edital criado, alterado ou removido: descarta as janelas em cache (após o commit)."""
+    transaction.on_commit(cache.invalidar)
@@ -3,14 +3,23 @@ Views para editais.
 """
 from rest_framework import viewsets
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
 
 from apps.contas.permissions import IsAdmin
+from apps.core.condicional import RespostaCondicionalMixin
 
+from .cache import (
+    JANELA_POR_STATUS,
+    cache,
+    editais_da_janela,
+    fronteira_em_cache,
+    segundos_ate_proxima_fronteira,
+)
 from .models import Edital
 from .serializers import EditalCreateSerializer, EditalListSerializer, EditalSerializer
 
 
-class EditalViewSet(viewsets.ModelViewSet):
+class EditalViewSet(RespostaCondicionalMixin, viewsets.ModelViewSet):
     """
     ViewSet para editais.
 
@@ -22,20 +31,42 @@ class EditalViewSet(viewsets.ModelViewSet):
 
     Query params:
         status: open | upcoming | closed | all (default: open)
+        page_size, cursor: paginação por cursor (opcional)
+
+    As listagens open/upcoming/closed sem paginação são servidas do cache
+    de janelas (ver cache.py). Listagem e detalhe respondem 304 com
+    If-None-Match / If-Modified-Since (ver core/condicional.py).
     """
 
+    cursor_ordering = ('-inicio', '-id')
+    cache_condicional = cache
+
     def get_queryset(self):
         """Filtra editais por status."""
-        status_filter = self.request.query_params.get('status', 'open')
-
-        if status_filter == 'open':
-            return Edital.abertos()
-        elif status_filter == 'upcoming':
-            return Edital.futuros()
-        elif status_filter == 'closed':
-            return Edital.encerrados()
-        else:  # all
-            return Edital.objects.all()
+        janela = JANELA_POR_STATUS.get(self.request.query_params.get('status', 'open'))
+        if janela:
+            return getattr(Edital, janela)()
+        return Edital.objects.all()
+
+    def list(self, request, *args, **kwargs):
+        """Lista editais, usando o cache de janelas quando não há paginação."""
+        janela = JANELA_POR_STATUS.get(request.query_params.get('status', 'open'))
+        if janela and not self.paginator.paginacao_solicitada(request):
+            return self.responder_condicional(request, self._listar_janela, janela)
+        return super().list(request, *args, **kwargs)
+
+    def _listar_janela(self, request, janela):
+        serializer = self.get_serializer(editais_da_janela(janela), many=True)
+        return Response(serializer.data)
+
+    def timeout_estado(self):
+        """O estado expira junto com a janela (próximo início/fim de edital)."""
+        return segundos_ate_proxima_fronteira()
+
+    def estado_extra(self):
+        """A fronteira entra no ETag: cruzá-la muda o conteúdo das janelas."""
+        fronteira = fronteira_em_cache()
+        return fronteira.isoformat() if fronteira else ''
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -2,38 +2,59 @@
 Views da página inicial (Home).
 """
 from django.shortcuts import render
-from django.utils import timezone
 
+from apps.editais.cache import cache as cache_editais
+from apps.editais.cache import editais_da_janela, segundos_ate_proxima_fronteira
 from apps.editais.models import Edital
+from apps.publicacoes.cache import cache as cache_publicacoes
 from apps.publicacoes.models import Publicacao
 
+# Tempo máximo de um fragmento de publicações (além da invalidação pelos signals)
+TIMEOUT_FRAGMENTO_PUBLICACOES = 10 * 60
+
 
 def index(request):
-    """Página inicial com editais abertos e projetos aprovados."""
-    hoje = timezone.now()
-
-    # Editais abertos (dentro do período)
-    editais_abertos = Edital.objects.filter(
-        status=Edital.Status.PUBLICADO,
-        inicio__lte=hoje,
-        fim__gte=hoje
-    ).order_by('fim')[:6]
-
-    # Editais futuros
-    editais_futuros = Edital.objects.filter(
-        status=Edital.Status.PUBLICADO,
-        inicio__gt=hoje
-    ).order_by('inicio')[:3]
-
-    # Publicações ativas (projetos aprovados)
-    publicacoes = Publicacao.objects.filter(
-        ativo=True
-    ).select_related('projeto').order_by('-destaque', '-publicado_em')[:6]
+    """
+    Página inicial com editais abertos e projetos aprovados.
+
+    As seções de editais e de publicações são fragmentos em cache
+    (`{% cache %}` em home/index.html), com chave incluindo a versão do
+    namespace correspondente, incrementada pelos signals de Edital e
+    Publicacao. Os dados são passados como callables: o template só os
+    chama (e consulta o cache/banco) quando o fragmento não está em cache.
+    """
+
+    def editais_abertos():
+        # Editais abertos (dentro do período)
+        return sorted(
+            editais_da_janela('abertos'),
+            key=lambda edital: edital.fim,
+        )[:6]
+
+    def editais_futuros():
+        # Editais futuros
+        return sorted(
+            (
+                edital for edital in editais_da_janela('futuros')
+                if edital.status == Edital.Status.PUBLICADO
+            ),
+            key=lambda edital: edital.inicio,
+        )[:3]
+
+    def publicacoes():
+        # Publicações ativas (projetos aprovados)
+        return list(Publicacao.objects.filter(
+            ativo=True
+        ).select_related('projeto').order_by('-destaque', '-publicado_em')[:6])
 
     context = {
         'editais_abertos': editais_abertos,
         'editais_futuros': editais_futuros,
         'publicacoes': publicacoes,
+        'versao_editais': cache_editais.versao(),
+        'timeout_editais': segundos_ate_proxima_fronteira(),
+        'versao_publicacoes': cache_publicacoes.versao(),
+        'timeout_publicacoes': TIMEOUT_FRAGMENTO_PUBLICACOES,
     }
 
     return render(request, 'home/index.html', context)
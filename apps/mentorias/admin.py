@@ -26,7 +26,7 @@ class SolicitacaoMentoriaAdmin(admin.ModelAdmin):
     ]
     readonly_fields = ['created_at', 'updated_at']
     date_hierarchy = 'created_at'
-    raw_id_fields = ['projeto', 'solicitante', 'mentor']
+    autocomplete_fields = ['projeto', 'solicitante', 'mentor']
 
     fieldsets = (
         (None, {'fields': ('projeto', 'solicitante')}),
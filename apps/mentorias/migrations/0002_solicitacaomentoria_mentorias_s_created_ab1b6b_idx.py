@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mentorias', '0001_initial'),
+        ('projetos', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='solicitacaomentoria',
+            index=models.Index(fields=['created_at', 'id'], name='mentorias_s_created_ab1b6b_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mentorias', '0002_solicitacaomentoria_mentorias_s_created_ab1b6b_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solicitacaomentoria',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='deletado em'),
+        ),
+    ]
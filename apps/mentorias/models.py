@@ -7,8 +7,10 @@ Este módulo contém:
 from django.conf import settings
 from django.db import models
 
+from apps.core.models import AuditavelMixin, SoftDeleteModel
 
-class SolicitacaoMentoria(models.Model):
+
+class SolicitacaoMentoria(AuditavelMixin, SoftDeleteModel):
     """
     Solicitação de mentoria para um projeto.
 
@@ -75,6 +77,7 @@ class SolicitacaoMentoria(models.Model):
             models.Index(fields=['solicitante']),
             models.Index(fields=['status']),
             models.Index(fields=['mentor']),
+            models.Index(fields=['created_at', 'id']),
         ]
 
     def __str__(self):
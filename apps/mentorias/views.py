@@ -24,10 +24,13 @@ class SolicitacaoMentoriaViewSet(viewsets.ModelViewSet):
     GET   /api/mentorship-requests/mine       - Minhas solicitações (aluno)
     GET   /api/mentorship-requests/           - Lista todas (admin)
     PATCH /api/mentorship-requests/:id/status - Atualiza status (admin)
+
+    Listagem paginada por cursor com ?page_size= ou ?cursor=.
     """
 
     serializer_class = SolicitacaoMentoriaSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         user = self.request.user
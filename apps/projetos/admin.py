@@ -1,6 +1,8 @@
 """Configuração do Django Admin para o app projetos."""
 from django.contrib import admin
 
+from apps.core.admin import AutocompletarPrefixoMixin
+
 from .models import MembroEquipe, Projeto, RelatorioProgresso, Submissao
 
 
@@ -21,7 +23,7 @@ class SubmissaoInline(admin.TabularInline):
 
 
 @admin.register(Projeto)
-class ProjetoAdmin(admin.ModelAdmin):
+class ProjetoAdmin(AutocompletarPrefixoMixin, admin.ModelAdmin):
     """Admin para Projeto."""
 
     list_display = [
@@ -34,10 +36,11 @@ class ProjetoAdmin(admin.ModelAdmin):
     ]
     list_filter = ['status', 'area', 'created_at']
     search_fields = ['titulo', 'resumo', 'responsavel__name']
+    campos_autocompletar = ['titulo']
     readonly_fields = ['created_at', 'updated_at', 'deleted_at']
     date_hierarchy = 'created_at'
     ordering = ['-created_at']
-    raw_id_fields = ['responsavel']
+    autocomplete_fields = ['responsavel']
     inlines = [MembroEquipeInline, SubmissaoInline]
 
     fieldsets = (
@@ -61,7 +64,7 @@ class MembroEquipeAdmin(admin.ModelAdmin):
     list_display = ['id', 'nome', 'email', 'funcao', 'projeto', 'created_at']
     list_filter = ['created_at']
     search_fields = ['nome', 'email', 'projeto__titulo']
-    raw_id_fields = ['projeto']
+    autocomplete_fields = ['projeto']
 
 
 @admin.register(Submissao)
@@ -79,7 +82,8 @@ class SubmissaoAdmin(admin.ModelAdmin):
     search_fields = ['projeto__titulo', 'edital__titulo']
     readonly_fields = ['submetido_em']
     date_hierarchy = 'submetido_em'
-    raw_id_fields = ['projeto', 'edital']
+    autocomplete_fields = ['projeto']
+    raw_id_fields = ['edital']
 
 
 @admin.register(RelatorioProgresso)
@@ -91,4 +95,4 @@ class RelatorioProgressoAdmin(admin.ModelAdmin):
     search_fields = ['projeto__titulo', 'conteudo']
     readonly_fields = ['created_at']
     date_hierarchy = 'created_at'
-    raw_id_fields = ['projeto', 'autor']
+    autocomplete_fields = ['projeto', 'autor']
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('editais', '0001_initial'),
+        ('projetos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='submissao',
+            index=models.Index(fields=['submetido_em', 'id'], name='projetos_su_submeti_33cf49_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projetos', '0002_submissao_projetos_su_submeti_33cf49_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='projeto',
+            name='projetos_pr_respons_a9638b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='projeto',
+            name='projetos_pr_status_7fdf3f_idx',
+        ),
+        migrations.AlterField(
+            model_name='projeto',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='deletado em'),
+        ),
+        migrations.AddIndex(
+            model_name='projeto',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['responsavel', 'status'], name='projeto_resp_status_vivo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projeto',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['status'], name='projeto_status_vivo_idx'),
+        ),
+    ]
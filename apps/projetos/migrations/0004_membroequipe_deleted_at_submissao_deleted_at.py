@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projetos', '0003_remove_projeto_projetos_pr_respons_a9638b_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='membroequipe',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='deletado em'),
+        ),
+        migrations.AddField(
+            model_name='submissao',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='deletado em'),
+        ),
+    ]
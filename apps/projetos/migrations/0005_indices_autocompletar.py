@@ -0,0 +1,64 @@
+"""
+Índices do autocompletar de projetos (consultados por apps/core/autocompletar.py).
+
+PostgreSQL: prefixo `(lower(titulo) COLLATE "C")` + GIN `gin_trgm_ops` do
+título (extensão pg_trgm).
+SQLite: prefixo `(titulo COLLATE NOCASE)`.
+
+Todos parciais em `deleted_at IS NULL`. O SQL fica nesta migração (e não no
+código da aplicação) para que ela continue aplicando exatamente o mesmo esquema
+mesmo que o autocompletar mude depois.
+"""
+from django.db import migrations
+
+DDL_POSTGRESQL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS projetos_projeto_titulo_prefixo_idx '
+    'ON projetos_projeto ((lower(titulo) COLLATE "C")) WHERE deleted_at IS NULL',
+    'CREATE INDEX IF NOT EXISTS projetos_projeto_titulo_trgm_idx '
+    'ON projetos_projeto USING gin (titulo gin_trgm_ops) WHERE deleted_at IS NULL',
+]
+
+DDL_POSTGRESQL_REVERSO = [
+    'DROP INDEX IF EXISTS projetos_projeto_titulo_prefixo_idx',
+    'DROP INDEX IF EXISTS projetos_projeto_titulo_trgm_idx',
+]
+
+DDL_SQLITE = [
+    'CREATE INDEX IF NOT EXISTS projetos_projeto_titulo_prefixo_idx '
+    'ON projetos_projeto (titulo COLLATE NOCASE) WHERE deleted_at IS NULL',
+]
+
+DDL_SQLITE_REVERSO = [
+    'DROP INDEX IF EXISTS projetos_projeto_titulo_prefixo_idx',
+]
+
+
+# Banco -> (criação, remoção); nos demais bancos não há índices de autocompletar
+DDL = {
+    'postgresql': (DDL_POSTGRESQL, DDL_POSTGRESQL_REVERSO),
+    'sqlite': (DDL_SQLITE, DDL_SQLITE_REVERSO),
+}
+
+
+def criar_indices(apps, schema_editor):
+    criacao, _ = DDL.get(schema_editor.connection.vendor, ([], []))
+    for comando in criacao:
+        schema_editor.execute(comando)
+
+
+def remover_indices(apps, schema_editor):
+    _, remocao = DDL.get(schema_editor.connection.vendor, ([], []))
+    for comando in remocao:
+        schema_editor.execute(comando)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projetos', '0004_membroequipe_deleted_at_submissao_deleted_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indices, remover_indices),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projetos', '0005_indices_autocompletar'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='projeto',
+            name='status',
+            field=models.CharField(choices=[('PRE_SUBMISSAO', 'Pré-submissão'), ('SUBMETIDO', 'Submetido'), ('APROVADO', 'Aprovado'), ('REPROVADO', 'Reprovado'), ('AJUSTES', 'Ajustes'), ('INCUBADO', 'Incubado'), ('INATIVO', 'Inativo'), ('DESLIGADO', 'Desligado')], default='PRE_SUBMISSAO', max_length=20, verbose_name='status'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('editais', '0002_remove_edital_editais_edi_status_38da6b_idx_and_more'),
+        ('projetos', '0006_sem_indice_completo_status'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='submissao',
+            name='unique_projeto_edital',
+        ),
+        migrations.AddConstraint(
+            model_name='submissao',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('projeto', 'edital'), name='unique_projeto_edital'),
+        ),
+    ]
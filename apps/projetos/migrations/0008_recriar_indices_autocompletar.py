@@ -0,0 +1,31 @@
+"""
+Recria no SQLite o índice do autocompletar de projetos (ver 0005).
+
+No SQLite o AlterField de 0006 reconstrói a tabela e descarta os índices
+criados por SQL, que o Django não conhece. No PostgreSQL eles continuam lá e
+esta migração não faz nada.
+"""
+from django.db import migrations
+
+DDL_SQLITE = [
+    'CREATE INDEX IF NOT EXISTS projetos_projeto_titulo_prefixo_idx '
+    'ON projetos_projeto (titulo COLLATE NOCASE) WHERE deleted_at IS NULL',
+]
+
+
+def recriar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for comando in DDL_SQLITE:
+        schema_editor.execute(comando)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projetos', '0007_submissao_unica_viva'),
+    ]
+
+    operations = [
+        migrations.RunPython(recriar_indices, migrations.RunPython.noop),
+    ]
@@ -9,8 +9,51 @@ Este módulo contém:
 """
 from django.conf import settings
 from django.db import models
+from django.db.models import OuterRef, Subquery
 
-from apps.core.models import BaseModel
+from apps.core.models import (
+    NAO_DELETADOS,
+    AllObjectsManager,
+    AuditavelMixin,
+    BaseModel,
+    SoftDeleteManager,
+    SoftDeleteModel,
+    SoftDeleteQuerySet,
+)
+
+
+class ProjetoQuerySet(SoftDeleteQuerySet):
+    """QuerySet de projetos com anotações da última submissão/avaliação."""
+
+    def com_ultima_submissao(self):
+        """
+        Anota cada projeto com dados da última submissão e da última avaliação.
+
+        Usa subqueries correlacionadas, de modo que a listagem inteira é
+        resolvida em uma única query, independente do número de projetos
+        ou de submissões.
+
+        Anotações:
+            ultima_submissao_id: ID da submissão mais recente (ou None)
+            ultima_submissao_status: status dessa submissão
+            ultimo_edital_titulo: título do edital dessa submissão
+            ultima_avaliacao_resultado: resultado da avaliação mais recente dela
+        """
+        from apps.avaliacoes.models import Avaliacao
+
+        ultima_submissao = Submissao.objects.filter(
+            projeto=OuterRef('pk')
+        ).order_by('-submetido_em', '-id')
+        ultima_avaliacao = Avaliacao.objects.filter(
+            submissao=OuterRef('ultima_submissao_id')
+        ).order_by('-avaliado_em', '-id')
+
+        return self.annotate(
+            ultima_submissao_id=Subquery(ultima_submissao.values('id')[:1]),
+            ultima_submissao_status=Subquery(ultima_submissao.values('status')[:1]),
+            ultimo_edital_titulo=Subquery(ultima_submissao.values('edital__titulo')[:1]),
+            ultima_avaliacao_resultado=Subquery(ultima_avaliacao.values('resultado')[:1]),
+        )
 
 
 class Projeto(BaseModel):
@@ -18,7 +61,8 @@ class Projeto(BaseModel):
     Projeto criado por um aluno.
 
     Representa uma ideia/startup que pode ser submetida
-    a editais para avaliação e incubação.
+    a editais para avaliação e incubação. O soft delete do projeto
+    se propaga a membros, submissões e solicitações de mentoria.
     """
 
     class Status(models.TextChoices):
@@ -54,16 +98,27 @@ class Projeto(BaseModel):
         max_length=20,
         choices=Status.choices,
         default=Status.PRE_SUBMISSAO,
-        db_index=True,
     )
 
+    soft_delete_cascade = ('membros', 'submissoes', 'solicitacoes_mentoria', 'publicacao')
+
+    objects = SoftDeleteManager.from_queryset(ProjetoQuerySet)()
+
     class Meta:
         verbose_name = 'projeto'
         verbose_name_plural = 'projetos'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['responsavel', 'status']),
-            models.Index(fields=['status']),
+            models.Index(
+                fields=['responsavel', 'status'],
+                condition=NAO_DELETADOS,
+                name='projeto_resp_status_vivo_idx',
+            ),
+            models.Index(
+                fields=['status'],
+                condition=NAO_DELETADOS,
+                name='projeto_status_vivo_idx',
+            ),
         ]
 
     def __str__(self):
@@ -83,7 +138,7 @@ class Projeto(BaseModel):
         ]
 
 
-class MembroEquipe(models.Model):
+class MembroEquipe(SoftDeleteModel):
     """
     Membro da equipe de um projeto.
 
@@ -127,7 +182,32 @@ class MembroEquipe(models.Model):
         return f'{self.nome} - {self.funcao}'
 
 
-class Submissao(models.Model):
+class SubmissaoQuerySet(SoftDeleteQuerySet):
+    """QuerySet de submissões com anotações da última avaliação."""
+
+    def com_ultima_avaliacao(self):
+        """
+        Anota cada submissão com os dados da avaliação mais recente.
+
+        Anotações:
+            ultima_avaliacao_resultado: resultado da avaliação (ou None)
+            ultima_avaliacao_comentarios: comentários do avaliador
+            ultima_avaliacao_em: data/hora da avaliação
+        """
+        from apps.avaliacoes.models import Avaliacao
+
+        ultima_avaliacao = Avaliacao.objects.filter(
+            submissao=OuterRef('pk')
+        ).order_by('-avaliado_em', '-id')
+
+        return self.annotate(
+            ultima_avaliacao_resultado=Subquery(ultima_avaliacao.values('resultado')[:1]),
+            ultima_avaliacao_comentarios=Subquery(ultima_avaliacao.values('comentarios')[:1]),
+            ultima_avaliacao_em=Subquery(ultima_avaliacao.values('avaliado_em')[:1]),
+        )
+
+
+class Submissao(AuditavelMixin, SoftDeleteModel):
     """
     Submissão de um projeto a um edital.
 
@@ -167,14 +247,19 @@ class Submissao(models.Model):
         auto_now_add=True,
     )
 
+    objects = SoftDeleteManager.from_queryset(SubmissaoQuerySet)()
+    all_objects = AllObjectsManager.from_queryset(SubmissaoQuerySet)()
+
     class Meta:
         verbose_name = 'submissão'
         verbose_name_plural = 'submissões'
         ordering = ['-submetido_em']
         # Evitar submissão duplicada do mesmo projeto ao mesmo edital
+        # (submissões excluídas logicamente não impedem uma nova)
         constraints = [
             models.UniqueConstraint(
                 fields=['projeto', 'edital'],
+                condition=NAO_DELETADOS,
                 name='unique_projeto_edital',
             )
         ]
@@ -182,6 +267,7 @@ class Submissao(models.Model):
             models.Index(fields=['projeto', 'edital']),
             models.Index(fields=['status']),
             models.Index(fields=['edital', 'status']),
+            models.Index(fields=['submetido_em', 'id']),
         ]
 
     def __str__(self):
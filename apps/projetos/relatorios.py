@@ -0,0 +1,231 @@
+"""
+Relatório de projetos (admin).
+
+Este módulo contém:
+- Coluna: definição de uma coluna do relatório e do que ela exige do banco
+- RelatorioProjetos: projeção de colunas, preparo do queryset e geração das linhas
+- filtrar_projetos: filtros do relatório aplicados no SQL
+
+Cada coluna declara os campos, joins e prefetches de que precisa; o queryset
+é montado apenas com o necessário para as colunas pedidas em `fields=`.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Exists, OuterRef, Prefetch
+from rest_framework import serializers
+
+from apps.core.exportacao import TAMANHO_LOTE_BANCO, intervalo_datas
+
+from .models import MembroEquipe, Submissao
+
+_formatar_data = serializers.DateTimeField().to_representation
+
+
+def _data(valor):
+    """Formata datas como na API (ISO no fuso local)."""
+    return _formatar_data(valor) if valor else None
+
+
+def _membros(projeto):
+    return [
+        {
+            'id': membro.id,
+            'nome': membro.nome,
+            'email': membro.email,
+            'funcao': membro.funcao,
+            'created_at': _data(membro.created_at),
+        }
+        for membro in projeto.membros.all()
+    ]
+
+
+def _membros_csv(projeto):
+    return '; '.join(f'{membro.nome} ({membro.funcao})' for membro in projeto.membros.all())
+
+
+class Coluna:
+    """
+    Coluna do relatório de projetos.
+
+    Atributos:
+        valor: Função que extrai o valor da coluna de um Projeto
+        campos: Campos carregados com `.only()`
+        select_related: Relações carregadas por JOIN
+        prefetch: Prefetches necessários
+        anotacoes: Se exige `Projeto.objects.com_ultima_submissao()`
+        valor_csv: Extração alternativa para CSV (padrão: `valor`)
+    """
+
+    def __init__(self, valor, campos=(), select_related=(), prefetch=(),
+                 anotacoes=False, valor_csv=None):
+        self.valor = valor
+        self.campos = campos
+        self.select_related = select_related
+        self.prefetch = prefetch
+        self.anotacoes = anotacoes
+        self.valor_csv = valor_csv or valor
+
+
+COLUNAS = {
+    'id': Coluna(lambda p: p.id, campos=('id',)),
+    'titulo': Coluna(lambda p: p.titulo, campos=('titulo',)),
+    'resumo': Coluna(lambda p: p.resumo, campos=('resumo',)),
+    'area': Coluna(lambda p: p.area, campos=('area',)),
+    'status': Coluna(lambda p: p.status, campos=('status',)),
+    'responsavel': Coluna(lambda p: p.responsavel_id, campos=('responsavel_id',)),
+    'responsavel_nome': Coluna(
+        lambda p: p.responsavel.name,
+        campos=('responsavel__name',),
+        select_related=('responsavel',),
+    ),
+    'membros': Coluna(
+        _membros,
+        prefetch=(Prefetch('membros', queryset=MembroEquipe.objects.order_by('nome')),),
+        valor_csv=_membros_csv,
+    ),
+    'created_at': Coluna(lambda p: _data(p.created_at), campos=('created_at',)),
+    'updated_at': Coluna(lambda p: _data(p.updated_at), campos=('updated_at',)),
+    'edital_titulo': Coluna(lambda p: p.ultimo_edital_titulo, anotacoes=True),
+    'submissao_status': Coluna(lambda p: p.ultima_submissao_status, anotacoes=True),
+    'avaliacao_resultado': Coluna(lambda p: p.ultima_avaliacao_resultado, anotacoes=True),
+}
+
+# Mesmas colunas do ProjetoSerializer (formato histórico do relatório)
+COLUNAS_PADRAO = [
+    'id',
+    'titulo',
+    'resumo',
+    'area',
+    'status',
+    'responsavel',
+    'responsavel_nome',
+    'membros',
+    'created_at',
+    'updated_at',
+]
+
+
+class RelatorioProjetos:
+    """
+    Relatório de projetos com projeção de colunas.
+
+    Uso:
+        relatorio = RelatorioProjetos('id,titulo,membros')
+        queryset = relatorio.preparar(Projeto.objects.all())
+        for linha in relatorio.linhas(queryset):
+            ...
+    """
+
+    def __init__(self, campos=None):
+        """
+        Args:
+            campos: Colunas separadas por vírgula (str) ou lista; None usa o padrão
+
+        Raises:
+            ValueError: Se alguma coluna não existir.
+        """
+        if isinstance(campos, str):
+            campos = [campo.strip() for campo in campos.split(',') if campo.strip()]
+        self.campos = list(campos or COLUNAS_PADRAO)
+
+        invalidos = [campo for campo in self.campos if campo not in COLUNAS]
+        if invalidos:
+            raise ValueError(
+                f'Campos inválidos: {", ".join(invalidos)}. '
+                f'Use: {", ".join(COLUNAS)}'
+            )
+        self.colunas = [COLUNAS[campo] for campo in self.campos]
+
+    def preparar(self, queryset):
+        """Aplica only/select_related/prefetch/anotações exigidos pelas colunas."""
+        campos = {'id'}
+        select_related = set()
+        prefetch = []
+        anotacoes = False
+
+        for coluna in self.colunas:
+            campos.update(coluna.campos)
+            select_related.update(coluna.select_related)
+            prefetch.extend(coluna.prefetch)
+            anotacoes = anotacoes or coluna.anotacoes
+
+        # FK usada no JOIN precisa estar entre os campos carregados
+        campos.update(f'{relacao}_id' for relacao in select_related)
+
+        queryset = queryset.only(*campos)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        if anotacoes:
+            queryset = queryset.com_ultima_submissao()
+        return queryset
+
+    def iterar(self, queryset):
+        """Itera o queryset em lotes (prefetch feito por lote)."""
+        return queryset.iterator(chunk_size=TAMANHO_LOTE_BANCO)
+
+    def linha(self, projeto):
+        """Retorna um dict {campo: valor} para o projeto."""
+        return {
+            campo: coluna.valor(projeto)
+            for campo, coluna in zip(self.campos, self.colunas)
+        }
+
+    def linhas(self, projetos):
+        """Gera dicts para cada projeto do iterável."""
+        for projeto in projetos:
+            yield self.linha(projeto)
+
+    def linhas_csv(self, queryset):
+        """Gera listas de valores para CSV, lendo o banco em lotes."""
+        for projeto in self.iterar(queryset):
+            yield [coluna.valor_csv(projeto) for coluna in self.colunas]
+
+    def linhas_ndjson(self, queryset):
+        """Gera o relatório em NDJSON (um objeto JSON por linha), em lotes."""
+        bloco = []
+        for linha in self.linhas(self.iterar(queryset)):
+            bloco.append(json.dumps(linha, cls=DjangoJSONEncoder, ensure_ascii=False))
+            if len(bloco) >= 500:
+                yield '\n'.join(bloco) + '\n'
+                bloco = []
+        if bloco:
+            yield '\n'.join(bloco) + '\n'
+
+
+def filtrar_projetos(queryset, params):
+    """
+    Aplica os filtros do relatório no SQL.
+
+    Args:
+        queryset: QuerySet de Projeto
+        params: Query params (status, area, edital, created_from, created_to)
+
+    Raises:
+        ValueError: Se algum parâmetro for inválido.
+    """
+    status = params.get('status')
+    if status:
+        queryset = queryset.filter(status__in=[s.strip().upper() for s in status.split(',')])
+
+    area = params.get('area')
+    if area:
+        queryset = queryset.filter(area__iexact=area)
+
+    edital = params.get('edital')
+    if edital:
+        if not edital.isdigit():
+            raise ValueError('Parâmetro "edital" deve ser um ID numérico.')
+        queryset = queryset.filter(Exists(
+            Submissao.objects.filter(projeto=OuterRef('pk'), edital_id=int(edital))
+        ))
+
+    desde, ate = intervalo_datas(params.get('created_from'), params.get('created_to'))
+    if desde:
+        queryset = queryset.filter(created_at__gte=desde)
+    if ate:
+        queryset = queryset.filter(created_at__lt=ate)
+
+    return queryset
@@ -3,9 +3,8 @@ Serializers para projetos, equipe e submissões.
 """
 from rest_framework import serializers
 
-from apps.editais.models import Edital
-
 from .models import MembroEquipe, Projeto, RelatorioProgresso, Submissao
+from .submissoes import SubmissaoRecusada, submeter
 
 
 class MembroEquipeSerializer(serializers.ModelSerializer):
@@ -75,13 +74,22 @@ class ProjetoCreateSerializer(serializers.ModelSerializer):
 
 
 class ProjetoListSerializer(serializers.ModelSerializer):
-    """Serializer para listagem de projetos do aluno."""
+    """
+    Serializer para listagem de projetos do aluno.
+
+    Espera um queryset anotado com `Projeto.objects.com_ultima_submissao()`;
+    os campos da última submissão/avaliação são lidos das anotações, sem
+    queries adicionais por projeto.
+    """
 
     # Campos calculados da última submissão/avaliação
     call_title = serializers.SerializerMethodField()
     status_label = serializers.SerializerMethodField()
-    submission_id = serializers.SerializerMethodField()
-    evaluation_status = serializers.SerializerMethodField()
+    submission_id = serializers.IntegerField(source='ultima_submissao_id', read_only=True)
+    evaluation_status = serializers.CharField(
+        source='ultima_avaliacao_resultado',
+        read_only=True,
+    )
 
     class Meta:
         model = Projeto
@@ -98,25 +106,10 @@ class ProjetoListSerializer(serializers.ModelSerializer):
 
     def get_call_title(self, obj):
         """Retorna título do último edital submetido."""
-        ultima_submissao = obj.submissoes.order_by('-submetido_em').first()
-        if ultima_submissao:
-            return ultima_submissao.edital.titulo
+        if obj.ultima_submissao_id:
+            return obj.ultimo_edital_titulo
         return '—'
 
-    def get_submission_id(self, obj):
-        """Retorna ID da última submissão."""
-        ultima_submissao = obj.submissoes.order_by('-submetido_em').first()
-        return ultima_submissao.id if ultima_submissao else None
-
-    def get_evaluation_status(self, obj):
-        """Retorna status da última avaliação."""
-        ultima_submissao = obj.submissoes.order_by('-submetido_em').first()
-        if ultima_submissao:
-            ultima_avaliacao = ultima_submissao.avaliacoes.order_by('-avaliado_em').first()
-            if ultima_avaliacao:
-                return ultima_avaliacao.resultado
-        return None
-
     def get_status_label(self, obj):
         """Retorna label amigável do status."""
         # Status do projeto prevalece
@@ -126,17 +119,15 @@ class ProjetoListSerializer(serializers.ModelSerializer):
             return 'Desligado'
 
         # Verifica última submissão
-        ultima_submissao = obj.submissoes.order_by('-submetido_em').first()
-        if ultima_submissao:
+        if obj.ultima_submissao_id:
             # Verifica última avaliação
-            ultima_avaliacao = ultima_submissao.avaliacoes.order_by('-avaliado_em').first()
-            if ultima_avaliacao:
-                if ultima_avaliacao.resultado == 'APROVADO':
-                    return 'Aprovado'
-                if ultima_avaliacao.resultado == 'REPROVADO':
-                    return 'Reprovado'
-                if ultima_avaliacao.resultado == 'NECESSITA_AJUSTES':
-                    return 'Necessita ajustes'
+            resultado = obj.ultima_avaliacao_resultado
+            if resultado == 'APROVADO':
+                return 'Aprovado'
+            if resultado == 'REPROVADO':
+                return 'Reprovado'
+            if resultado == 'NECESSITA_AJUSTES':
+                return 'Necessita ajustes'
 
             # Status da submissão
             status_map = {
@@ -146,7 +137,8 @@ class ProjetoListSerializer(serializers.ModelSerializer):
                 'REPROVADA': 'Reprovada',
                 'ENVIADA': 'Enviada',
             }
-            return status_map.get(ultima_submissao.status, ultima_submissao.status)
+            status = obj.ultima_submissao_status
+            return status_map.get(status, status)
 
         # Status do projeto
         status_map = {
@@ -159,7 +151,13 @@ class ProjetoListSerializer(serializers.ModelSerializer):
 
 
 class SubmissaoSerializer(serializers.ModelSerializer):
-    """Serializer para submissões."""
+    """
+    Serializer para submissões.
+
+    Os campos da última avaliação vêm das anotações de
+    `Submissao.objects.com_ultima_avaliacao()`. Para instâncias avulsas
+    (ex.: recém-criadas) a avaliação é buscada diretamente.
+    """
 
     projeto_titulo = serializers.CharField(source='projeto.titulo', read_only=True)
     projeto_resumo = serializers.CharField(source='projeto.resumo', read_only=True)
@@ -189,80 +187,51 @@ class SubmissaoSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'status', 'submetido_em']
 
-    def get_evaluation_status(self, obj):
+    def _ultima_avaliacao(self, obj):
+        """Retorna (resultado, comentarios, avaliado_em) da última avaliação."""
+        if hasattr(obj, 'ultima_avaliacao_resultado'):
+            return (
+                obj.ultima_avaliacao_resultado,
+                obj.ultima_avaliacao_comentarios,
+                obj.ultima_avaliacao_em,
+            )
         ultima = obj.avaliacoes.order_by('-avaliado_em').first()
-        return ultima.resultado if ultima else None
+        if ultima:
+            return ultima.resultado, ultima.comentarios, ultima.avaliado_em
+        return None, None, None
+
+    def get_evaluation_status(self, obj):
+        return self._ultima_avaliacao(obj)[0]
 
     def get_evaluation_comments(self, obj):
-        ultima = obj.avaliacoes.order_by('-avaliado_em').first()
-        return ultima.comentarios if ultima else None
+        return self._ultima_avaliacao(obj)[1]
 
     def get_evaluation_date(self, obj):
-        ultima = obj.avaliacoes.order_by('-avaliado_em').first()
-        return ultima.avaliado_em if ultima else None
+        return self._ultima_avaliacao(obj)[2]
 
 
 class SubmissaoCreateSerializer(serializers.Serializer):
-    """Serializer para criar submissão."""
+    """
+    Serializer para criar submissão.
+
+    As regras (responsável, status do projeto, edital aberto, duplicidade) são
+    verificadas pelo próprio UPDATE/INSERT em `submissoes.submeter`; os erros
+    voltam no campo correspondente, como nas validações de campo.
+    """
 
     project_id = serializers.IntegerField()
     call_id = serializers.IntegerField()
 
-    def validate_project_id(self, value):
-        """Valida que o projeto existe e pertence ao usuário."""
-        user = self.context['request'].user
-        try:
-            projeto = Projeto.objects.get(id=value)
-        except Projeto.DoesNotExist:
-            raise serializers.ValidationError('Projeto não encontrado.')
-
-        # BUG FIX: Verifica ownership (faltava no Node.js)
-        if projeto.responsavel != user:
-            raise serializers.ValidationError('Você não é responsável por este projeto.')
-
-        if not projeto.pode_submeter:
-            raise serializers.ValidationError(
-                f'Projeto com status "{projeto.status}" não pode ser submetido.'
-            )
-
-        return value
-
-    def validate_call_id(self, value):
-        """Valida que o edital existe e está aberto."""
-        try:
-            edital = Edital.objects.get(id=value)
-        except Edital.DoesNotExist:
-            raise serializers.ValidationError('Edital não encontrado.')
-
-        if not edital.esta_aberto:
-            raise serializers.ValidationError('Este edital não está aberto para submissões.')
-
-        return value
-
-    def validate(self, attrs):
-        """Valida que não há submissão duplicada."""
-        if Submissao.objects.filter(
-            projeto_id=attrs['project_id'],
-            edital_id=attrs['call_id']
-        ).exists():
-            raise serializers.ValidationError({
-                'detail': 'Este projeto já foi submetido a este edital.'
-            })
-        return attrs
-
     def create(self, validated_data):
         """Cria a submissão."""
-        submissao = Submissao.objects.create(
-            projeto_id=validated_data['project_id'],
-            edital_id=validated_data['call_id'],
-        )
-
-        # Atualiza status do projeto
-        projeto = submissao.projeto
-        projeto.status = Projeto.Status.SUBMETIDO
-        projeto.save(update_fields=['status', 'updated_at'])
-
-        return submissao
+        try:
+            return submeter(
+                self.context['request'].user,
+                validated_data['project_id'],
+                validated_data['call_id'],
+            )
+        except SubmissaoRecusada as recusa:
+            raise serializers.ValidationError({recusa.campo: [recusa.mensagem]})
 
 
 class RelatorioProgressoSerializer(serializers.ModelSerializer):
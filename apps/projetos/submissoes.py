@@ -0,0 +1,240 @@
+"""
+Submissão de projetos a editais.
+
+Este módulo contém:
+- SubmissaoRecusada: motivo (código e mensagem) de uma submissão não realizada
+- submeter: submete o projeto ao edital (usado pela API e pelas views de template)
+
+A submissão é feita em uma transação com duas instruções, sem leituras prévias:
+
+1. UPDATE condicional do projeto para SUBMETIDO, filtrado por responsável,
+   status que permite submissão e edital aberto (subquery EXISTS). O UPDATE
+   bloqueia a linha do projeto: submissões simultâneas do mesmo projeto são
+   serializadas e a segunda não encontra mais o status permitido.
+2. INSERT da submissão com `ON CONFLICT DO NOTHING RETURNING id`: uma
+   submissão anterior ao mesmo edital (unique_projeto_edital) não gera erro
+   de integridade, apenas nenhuma linha, e a transação é desfeita.
+
+Antes da transação, a janela do edital é conferida na cópia em memória
+(`editais.cache.janela_submissao`). Um edital ausente ou fechado na cópia
+provoca uma recarga dela (no máximo uma por JANELAS_RECARGA_MINIMA segundos
+em cada processo); se a cópia recarregada confirma, a submissão é recusada
+('edital_inexistente' ou 'edital_fechado') sem transação nem consulta
+própria. É o caso comum no pico: envios logo após o `fim`. Um edital aberto
+na cópia segue para o UPDATE, cujo EXISTS continua sendo a garantia no banco
+(cópia desatualizada, ex.: edital encerrado em um host que não compartilha o
+cache), no mesmo comando e sem ida extra.
+
+Quando o UPDATE é recusado, o motivo é apurado com consultas de leitura, na
+mesma ordem da cópia: edital, projeto, duplicidade. Se nenhuma delas explica
+a recusa (ex.: o edital abriu entre o UPDATE e a apuração), o motivo é
+'indeterminado'.
+
+Como o UPDATE e o INSERT não disparam signals, a auditoria (CRIAR e SUBMETER
+da submissão, ATUALIZAR do status do projeto) é registrada aqui.
+"""
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Exists
+from django.utils import timezone
+
+from apps.core import auditoria
+from apps.core.middleware import contexto_auditoria
+from apps.core.models import LogAuditoria
+from apps.editais.cache import edital_existente, janela_submissao
+from apps.editais.models import Edital
+
+from .models import Projeto, Submissao
+
+# Status do projeto que permitem submissão (ver Projeto.pode_submeter)
+STATUS_SUBMETIVEIS = [Projeto.Status.PRE_SUBMISSAO, Projeto.Status.AJUSTES]
+
+_json = DjangoJSONEncoder()
+
+
+class SubmissaoRecusada(Exception):
+    """
+    Submissão não realizada.
+
+    Atributos:
+        codigo: Motivo (ver CAMPOS)
+        mensagem: Texto para o usuário
+        campo: Dado de entrada relacionado (nome do campo na API)
+    """
+
+    # Código do motivo -> campo da API
+    CAMPOS = {
+        'projeto_inexistente': 'project_id',
+        'nao_responsavel': 'project_id',
+        'status_projeto': 'project_id',
+        'edital_inexistente': 'call_id',
+        'edital_fechado': 'call_id',
+        'duplicada': 'detail',
+        'indeterminado': 'detail',
+    }
+
+    def __init__(self, codigo, mensagem):
+        super().__init__(mensagem)
+        self.codigo = codigo
+        self.mensagem = mensagem
+        self.campo = self.CAMPOS[codigo]
+
+
+def _edital_aberto(edital_id, agora):
+    return Edital.objects.filter(
+        pk=edital_id,
+        status=Edital.Status.PUBLICADO,
+        inicio__lte=agora,
+        fim__gte=agora,
+    )
+
+
+def _inserir(submissao):
+    """
+    Grava a submissão; retorna False se já existe uma para o mesmo projeto e edital.
+
+    PostgreSQL e SQLite usam `INSERT ... ON CONFLICT DO NOTHING RETURNING`;
+    nos demais bancos o conflito é detectado pelo IntegrityError.
+    """
+    if connection.vendor not in ('postgresql', 'sqlite'):
+        try:
+            with transaction.atomic():
+                submissao.save(force_insert=True)
+        except IntegrityError:
+            return False
+        return True
+
+    meta = Submissao._meta
+    campos = [campo for campo in meta.local_concrete_fields if campo is not meta.pk]
+    valores = [
+        campo.get_db_prep_save(campo.pre_save(submissao, True), connection) for campo in campos
+    ]
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({}) ON CONFLICT DO NOTHING RETURNING {}'.format(
+        quote(meta.db_table),
+        ', '.join(quote(campo.column) for campo in campos),
+        ', '.join(['%s'] * len(campos)),
+        quote(meta.pk.column),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, valores)
+        linha = cursor.fetchone()
+    if linha is None:
+        return False
+    submissao.pk = linha[0]
+    submissao._state.adding = False
+    submissao._state.db = connection.alias
+    return True
+
+
+def _recusa_edital(existe):
+    if not existe:
+        return SubmissaoRecusada('edital_inexistente', 'Edital não encontrado.')
+    return SubmissaoRecusada('edital_fechado', 'Este edital não está aberto para submissões.')
+
+
+def _motivo(usuario, projeto_id, edital_id):
+    """Apura por que a submissão foi recusada (edital, projeto, duplicidade)."""
+    edital = Edital.objects.filter(pk=edital_id).only('status', 'inicio', 'fim').first()
+    if edital is None or not edital.esta_aberto:
+        return _recusa_edital(edital is not None)
+
+    projeto = Projeto.objects.filter(pk=projeto_id).only('responsavel_id', 'status').first()
+    if projeto is None:
+        return SubmissaoRecusada('projeto_inexistente', 'Projeto não encontrado.')
+    if projeto.responsavel_id != usuario.pk:
+        return SubmissaoRecusada('nao_responsavel', 'Você não é responsável por este projeto.')
+    if not projeto.pode_submeter:
+        return SubmissaoRecusada(
+            'status_projeto',
+            f'Projeto com status "{projeto.status}" não pode ser submetido.',
+        )
+
+    if Submissao.objects.filter(projeto_id=projeto_id, edital_id=edital_id).exists():
+        return SubmissaoRecusada('duplicada', 'Este projeto já foi submetido a este edital.')
+
+    return SubmissaoRecusada(
+        'indeterminado',
+        'Não foi possível concluir a submissão. Tente novamente.',
+    )
+
+
+def _auditar(usuario, submissao):
+    _, ip, user_agent = contexto_auditoria()
+    extras = {'ip_address': ip, 'user_agent': user_agent}
+    auditoria.registrar(
+        usuario,
+        LogAuditoria.Acao.CRIAR,
+        'Submissao',
+        submissao.pk,
+        dados_novos={
+            'projeto_id': submissao.projeto_id,
+            'edital_id': submissao.edital_id,
+            'status': submissao.status,
+            'submetido_em': _json.default(submissao.submetido_em),
+            'deleted_at': None,
+        },
+        **extras,
+    )
+    auditoria.registrar(
+        usuario,
+        LogAuditoria.Acao.ATUALIZAR,
+        'Projeto',
+        submissao.projeto_id,
+        dados_novos={'status': Projeto.Status.SUBMETIDO},
+        **extras,
+    )
+    auditoria.registrar(
+        usuario,
+        LogAuditoria.Acao.SUBMETER,
+        'Submissao',
+        submissao.pk,
+        dados_novos={'projeto': submissao.projeto_id, 'edital': submissao.edital_id},
+        **extras,
+    )
+
+
+def submeter(usuario, projeto_id, edital_id):
+    """
+    Submete o projeto do usuário a um edital aberto.
+
+    Args:
+        usuario: Responsável pelo projeto
+        projeto_id: ID do projeto (status PRE_SUBMISSAO ou AJUSTES)
+        edital_id: ID do edital (publicado e dentro do prazo)
+
+    Returns:
+        Submissao: Submissão criada (status ENVIADA)
+
+    Raises:
+        SubmissaoRecusada: Projeto/edital inexistente ou inválido, ou submissão duplicada
+    """
+    agora = timezone.now()
+    janela = janela_submissao(edital_id)
+    if janela is None or not janela.aberta(agora):
+        # Só recusa depois de confirmar na cópia recarregada
+        janela = janela_submissao(edital_id, recarregar=True)
+        if janela is None or not janela.aberta(agora):
+            raise _recusa_edital(janela is not None or edital_existente(edital_id))
+
+    submissao = Submissao(projeto_id=projeto_id, edital_id=edital_id, submetido_em=agora)
+
+    with transaction.atomic():
+        atualizados = Projeto.objects.filter(
+            Exists(_edital_aberto(edital_id, agora)),
+            pk=projeto_id,
+            responsavel_id=usuario.pk,
+            status__in=STATUS_SUBMETIVEIS,
+        ).update(status=Projeto.Status.SUBMETIDO, updated_at=agora)
+
+        if atualizados and not _inserir(submissao):
+            # Submissão duplicada: desfaz a mudança de status do projeto
+            transaction.set_rollback(True)
+            atualizados = 0
+
+        if atualizados:
+            _auditar(usuario, submissao)
+
+    if not atualizados:
+        raise _motivo(usuario, projeto_id, edital_id)
+    return submissao
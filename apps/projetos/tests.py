@@ -0,0 +1,217 @@
+"""
+Testes do app projetos.
+"""
+from datetime import timedelta
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.avaliacoes.models import Avaliacao
+from apps.contas.models import Usuario
+from apps.core.models import LogAuditoria
+from apps.editais import cache as cache_editais
+from apps.editais.models import Edital
+
+from .models import Projeto, Submissao
+from .submissoes import SubmissaoRecusada, submeter
+
+
+class ListaSubmissoesConsultasTest(APITestCase):
+    """A listagem de submissões (admin) executa as mesmas consultas para qualquer tamanho."""
+
+    def setUp(self):
+        self.admin = Usuario.objects.create_user(
+            cpf='00000000001', email='admin@ypetec.test', password='x', name='Admin', role='ADMIN',
+        )
+        self.aluno = Usuario.objects.create_user(
+            cpf='00000000002', email='aluno@ypetec.test', password='x', name='Aluno',
+        )
+        agora = timezone.now()
+        self.edital = Edital.objects.create(
+            titulo='Edital', descricao='d', status=Edital.Status.PUBLICADO,
+            inicio=agora - timedelta(days=1), fim=agora + timedelta(days=1), criado_por=self.admin,
+        )
+        self.client.force_authenticate(self.admin)
+
+    def _criar_submissoes(self, quantidade):
+        projetos = Projeto.objects.bulk_create(
+            Projeto(
+                responsavel=self.aluno, titulo=f'Projeto {i}', resumo='r', area='TI',
+                status=Projeto.Status.SUBMETIDO,
+            )
+            for i in range(quantidade)
+        )
+        submissoes = Submissao.objects.bulk_create(
+            Submissao(projeto=projeto, edital=self.edital) for projeto in projetos
+        )
+        # Metade avaliada, para exercitar as anotações da última avaliação
+        Avaliacao.objects.bulk_create(
+            Avaliacao(
+                submissao=submissao, avaliador=self.admin,
+                resultado=Avaliacao.Resultado.APROVADO, comentarios='ok',
+            )
+            for submissao in submissoes[::2]
+        )
+
+    def test_consultas_constantes(self):
+        """Uma consulta (submissões, projeto, edital, avaliação) com 10, 100 e 1000 linhas."""
+        criadas = 0
+        for tamanho in (10, 100, 1000):
+            self._criar_submissoes(tamanho - criadas)
+            criadas = tamanho
+            with self.subTest(linhas=tamanho), self.assertNumQueries(1):
+                resposta = self.client.get('/api/submissions/')
+            self.assertEqual(resposta.status_code, 200)
+            dados = resposta.json()
+            self.assertEqual(len(dados), tamanho)
+            avaliadas = [item for item in dados if item['evaluation_status']]
+            self.assertEqual(len(avaliadas), (tamanho + 1) // 2)
+
+
+@override_settings(AUDITORIA_SINCRONA=True)
+class SubmeterTest(TestCase):
+    """Submissão por UPDATE condicional + INSERT ... ON CONFLICT, com o motivo das recusas."""
+
+    def setUp(self):
+        # A janela dos editais fica no cache entre testes (os IDs se repetem)
+        caches['default'].clear()
+        self.admin = Usuario.objects.create_user(
+            cpf='00000000001', email='admin@ypetec.test', password='x', name='Admin', role='ADMIN',
+        )
+        self.aluno = Usuario.objects.create_user(
+            cpf='00000000002', email='aluno@ypetec.test', password='x', name='Aluno',
+        )
+        agora = timezone.now()
+        self.edital = Edital.objects.create(
+            titulo='Edital', descricao='d', status=Edital.Status.PUBLICADO,
+            inicio=agora - timedelta(days=1), fim=agora + timedelta(days=1), criado_por=self.admin,
+        )
+        self.projeto = Projeto.objects.create(
+            responsavel=self.aluno, titulo='Projeto', resumo='r', area='TI',
+        )
+
+    def _submeter(self, usuario=None, projeto_id=None, edital_id=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return submeter(
+                usuario or self.aluno,
+                projeto_id or self.projeto.pk,
+                edital_id or self.edital.pk,
+            )
+
+    def _recusa(self, codigo, campo, mensagem, **kwargs):
+        with self.assertRaises(SubmissaoRecusada) as contexto:
+            self._submeter(**kwargs)
+        recusa = contexto.exception
+        self.assertEqual(recusa.codigo, codigo)
+        self.assertEqual(recusa.campo, campo)
+        self.assertEqual(recusa.mensagem, mensagem)
+        self.assertFalse(LogAuditoria.objects.exists())
+        return recusa
+
+    def test_submissao_realizada(self):
+        submissao = self._submeter()
+
+        self.assertEqual(submissao.status, Submissao.Status.ENVIADA)
+        self.assertTrue(
+            Submissao.objects.filter(pk=submissao.pk, projeto=self.projeto, edital=self.edital)
+            .exists()
+        )
+        self.projeto.refresh_from_db()
+        self.assertEqual(self.projeto.status, Projeto.Status.SUBMETIDO)
+        self.assertCountEqual(
+            LogAuditoria.objects.values_list('usuario_id', 'acao', 'entidade', 'entidade_id'),
+            [
+                (self.aluno.pk, LogAuditoria.Acao.CRIAR, 'Submissao', submissao.pk),
+                (self.aluno.pk, LogAuditoria.Acao.ATUALIZAR, 'Projeto', self.projeto.pk),
+                (self.aluno.pk, LogAuditoria.Acao.SUBMETER, 'Submissao', submissao.pk),
+            ],
+        )
+
+    def test_duplicada_desfaz_o_status_do_projeto(self):
+        Submissao.objects.create(projeto=self.projeto, edital=self.edital)
+        Projeto.objects.filter(pk=self.projeto.pk).update(status=Projeto.Status.AJUSTES)
+
+        self._recusa('duplicada', 'detail', 'Este projeto já foi submetido a este edital.')
+
+        self.projeto.refresh_from_db()
+        self.assertEqual(self.projeto.status, Projeto.Status.AJUSTES)
+        self.assertEqual(Submissao.objects.filter(projeto=self.projeto).count(), 1)
+
+    def test_edital_fechado(self):
+        Edital.objects.filter(pk=self.edital.pk).update(
+            fim=timezone.now() - timedelta(minutes=1),
+        )
+
+        self._recusa(
+            'edital_fechado', 'call_id', 'Este edital não está aberto para submissões.',
+        )
+
+        self.projeto.refresh_from_db()
+        self.assertEqual(self.projeto.status, Projeto.Status.PRE_SUBMISSAO)
+        self.assertFalse(Submissao.objects.exists())
+
+    def test_edital_inexistente(self):
+        self._recusa(
+            'edital_inexistente', 'call_id', 'Edital não encontrado.',
+            edital_id=self.edital.pk + 1,
+        )
+
+    def test_nao_responsavel(self):
+        self._recusa(
+            'nao_responsavel', 'project_id', 'Você não é responsável por este projeto.',
+            usuario=self.admin,
+        )
+
+        self.projeto.refresh_from_db()
+        self.assertEqual(self.projeto.status, Projeto.Status.PRE_SUBMISSAO)
+
+    def test_projeto_inexistente(self):
+        self._recusa(
+            'projeto_inexistente', 'project_id', 'Projeto não encontrado.',
+            projeto_id=self.projeto.pk + 1,
+        )
+
+    def test_status_que_nao_permite_submissao(self):
+        Projeto.objects.filter(pk=self.projeto.pk).update(status=Projeto.Status.INCUBADO)
+
+        self._recusa(
+            'status_projeto', 'project_id', 'Projeto com status "INCUBADO" não pode ser submetido.',
+        )
+
+    def test_edital_fechado_na_copia_recusa_sem_consultas(self):
+        Edital.objects.filter(pk=self.edital.pk).update(inicio=timezone.now() + timedelta(days=1))
+        cache_editais.invalidar()
+        cache_editais.janela_submissao(self.edital.pk)
+
+        with self.assertNumQueries(0), self.assertRaises(SubmissaoRecusada) as contexto:
+            submeter(self.aluno, self.projeto.pk, self.edital.pk)
+        self.assertEqual(contexto.exception.codigo, 'edital_fechado')
+
+    def test_copia_aberta_desatualizada_e_recusada_pelo_banco(self):
+        cache_editais.janela_submissao(self.edital.pk)
+        # Sem signals: a cópia continua vendo o edital aberto
+        Edital.objects.filter(pk=self.edital.pk).update(
+            fim=timezone.now() - timedelta(minutes=1),
+        )
+
+        self._recusa(
+            'edital_fechado', 'call_id', 'Este edital não está aberto para submissões.',
+        )
+        self.projeto.refresh_from_db()
+        self.assertEqual(self.projeto.status, Projeto.Status.PRE_SUBMISSAO)
+
+    def test_copia_fechada_desatualizada_e_recarregada_antes_de_recusar(self):
+        Edital.objects.filter(pk=self.edital.pk).update(
+            fim=timezone.now() - timedelta(minutes=1),
+        )
+        cache_editais.invalidar()
+        self.assertIsNone(cache_editais.janela_submissao(self.edital.pk))
+        # Prazo prorrogado sem signals (ex.: em um host que não compartilha o cache)
+        Edital.objects.filter(pk=self.edital.pk).update(fim=timezone.now() + timedelta(days=1))
+        cache_editais._janelas['carregada_em'] -= cache_editais.JANELAS_RECARGA_MINIMA + 1
+
+        submissao = self._submeter()
+
+        self.assertEqual(submissao.status, Submissao.Status.ENVIADA)
@@ -1,14 +1,19 @@
 """
 Views para projetos, submissões e relatórios.
 """
+from django.http import StreamingHttpResponse
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from apps.contas.permissions import IsAdmin, IsAluno, IsOwnerOrAdmin
+from apps.core.admissao import vaga
+from apps.core.autocompletar import LIMITE_PADRAO, sugerir
+from apps.core.exportacao import resposta_csv
 
 from .models import MembroEquipe, Projeto, RelatorioProgresso, Submissao
+from .relatorios import RelatorioProjetos, filtrar_projetos
 from .serializers import (
     MembroEquipeSerializer,
     ProjetoCreateSerializer,
@@ -29,15 +34,23 @@ class ProjetoViewSet(viewsets.ModelViewSet):
     POST   /api/projects/:id/disengage/      - Solicita desligamento
     GET    /api/students/me/incubated-projects/ - Projetos incubados (para mentoria)
     GET    /api/projects/report/             - Relatório completo (admin)
+    GET    /api/projects/autocomplete/?q=    - Sugestões por título
     """
 
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ('-id',)
 
     def get_queryset(self):
         user = self.request.user
         if user.role == 'ADMIN':
-            return Projeto.objects.all()
-        return Projeto.objects.filter(responsavel=user)
+            queryset = Projeto.objects.all()
+        else:
+            queryset = Projeto.objects.filter(responsavel=user)
+
+        # ProjetoListSerializer lê a última submissão/avaliação das anotações
+        if self.action == 'list':
+            queryset = queryset.com_ultima_submissao()
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -62,14 +75,36 @@ class ProjetoViewSet(viewsets.ModelViewSet):
         """
         queryset = Projeto.objects.filter(
             responsavel=request.user
-        ).prefetch_related(
-            'submissoes__edital',
-            'submissoes__avaliacoes'
-        ).order_by('-created_at')
+        ).com_ultima_submissao().order_by('-created_at')
 
         serializer = ProjetoListSerializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        GET /api/projects/autocomplete/?q=irriga&limit=10
+
+        Sugestões `[{id, label}]` por prefixo do título (e trecho, no
+        PostgreSQL) entre os projetos visíveis ao usuário.
+        """
+        user = request.user
+        if user.role == 'ADMIN':
+            queryset, escopo = Projeto.objects.all(), 'admin'
+        else:
+            queryset, escopo = Projeto.objects.filter(responsavel=user), f'usuario:{user.pk}'
+
+        sugestoes = sugerir(
+            queryset,
+            request.query_params.get('q', ''),
+            ['titulo'],
+            rotulo='titulo',
+            limite=request.query_params.get('limit', LIMITE_PADRAO),
+            trigrama=['titulo'],
+            escopo=escopo,
+        )
+        return Response(sugestoes)
+
     @action(detail=True, methods=['post'])
     def disengage(self, request, pk=None):
         """
@@ -127,17 +162,42 @@ class ProjetoViewSet(viewsets.ModelViewSet):
         """
         GET /api/projects/report
 
-        Relatório completo de projetos (admin).
+        Relatório de projetos (admin).
+
+        Query params:
+            fields: colunas separadas por vírgula (padrão: as do ProjetoSerializer)
+            output: json (padrão) | ndjson | csv — ndjson e csv são enviados em streaming
+            status, area, edital, created_from, created_to: filtros
+            page_size, cursor: paginação por cursor (apenas json)
         """
-        queryset = Projeto.objects.select_related(
-            'responsavel'
-        ).prefetch_related(
-            'submissoes__edital',
-            'submissoes__avaliacoes__avaliador'
-        ).order_by('-id')
-
-        serializer = ProjetoSerializer(queryset, many=True)
-        return Response(serializer.data)
+        try:
+            relatorio = RelatorioProjetos(request.query_params.get('fields'))
+            queryset = filtrar_projetos(Projeto.objects.all(), request.query_params)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = relatorio.preparar(queryset).order_by('-id')
+
+        saida = request.query_params.get('output', 'json')
+        if saida == 'csv':
+            return resposta_csv('projetos.csv', relatorio.campos, relatorio.linhas_csv(queryset))
+        if saida == 'ndjson':
+            response = StreamingHttpResponse(
+                relatorio.linhas_ndjson(queryset),
+                content_type='application/x-ndjson',
+            )
+            response['Content-Disposition'] = 'attachment; filename="projetos.ndjson"'
+            return response
+        if saida != 'json':
+            return Response(
+                {'detail': 'Parâmetro "output" deve ser json, ndjson ou csv.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(list(relatorio.linhas(page)))
+        return Response(list(relatorio.linhas(relatorio.iterar(queryset))))
 
 
 class SubmissaoViewSet(viewsets.ModelViewSet):
@@ -146,17 +206,18 @@ class SubmissaoViewSet(viewsets.ModelViewSet):
 
     POST /api/submissions/     - Cria submissão (aluno)
     GET  /api/submissions/     - Lista submissões (admin)
+
+    Listagem paginada por cursor com ?page_size= ou ?cursor=.
     """
 
     serializer_class = SubmissaoSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ('-submetido_em', '-id')
 
     def get_queryset(self):
         queryset = Submissao.objects.select_related(
             'projeto', 'edital'
-        ).prefetch_related(
-            'avaliacoes'
-        ).filter(
+        ).com_ultima_avaliacao().filter(
             projeto__status__in=[
                 Projeto.Status.SUBMETIDO,
                 Projeto.Status.APROVADO,
@@ -169,10 +230,11 @@ class SubmissaoViewSet(viewsets.ModelViewSet):
 
         # Filtro por status de avaliação
         status_filter = self.request.query_params.get('status')
+        # (usa a anotação da última avaliação, evitando JOIN + DISTINCT)
         if status_filter == 'pending':
-            queryset = queryset.filter(avaliacoes__isnull=True)
+            queryset = queryset.filter(ultima_avaliacao_resultado__isnull=True)
         elif status_filter == 'evaluated':
-            queryset = queryset.filter(avaliacoes__isnull=False).distinct()
+            queryset = queryset.filter(ultima_avaliacao_resultado__isnull=False)
 
         return queryset
 
@@ -189,8 +251,13 @@ class SubmissaoViewSet(viewsets.ModelViewSet):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        submissao = serializer.save()
+        # No pico antes do prazo, o excedente espera na fila ou recebe 503 + Retry-After
+        with vaga('submissao'):
+            submissao = serializer.save()
 
-        # Retorna a submissão criada
+        # Retorna a submissão criada (projeto, edital e avaliação em uma consulta)
+        submissao = Submissao.objects.select_related(
+            'projeto', 'edital'
+        ).com_ultima_avaliacao().get(pk=submissao.pk)
         output_serializer = SubmissaoSerializer(submissao)
         return Response(output_serializer.data, status=status.HTTP_201_CREATED)
@@ -3,15 +3,17 @@ Views de templates para o app Projetos.
 """
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
-from django.utils import timezone
 from django.views import View
 from django.views.generic import CreateView, DetailView, ListView
 
-from apps.editais.models import Edital
+from apps.core.admissao import Sobrecarga, vaga
+from apps.editais.cache import editais_da_janela, janela_submissao
 
-from .models import Projeto, Submissao
+from .models import Projeto
+from .submissoes import SubmissaoRecusada, submeter
 
 
 class AlunoRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
@@ -64,18 +66,12 @@ class SubmeterProjetoView(AlunoRequiredMixin, View):
     def get(self, request, projeto_pk):
         projeto = get_object_or_404(Projeto, pk=projeto_pk, responsavel=request.user)
 
-        # Apenas projetos PRE_SUBMISSAO podem ser submetidos
-        if projeto.status != Projeto.Status.PRE_SUBMISSAO:
+        if not projeto.pode_submeter:
             messages.warning(request, 'Este projeto já foi submetido a um edital.')
             return redirect('projetos:detalhe', pk=projeto_pk)
 
-        # Listar editais abertos
-        hoje = timezone.now()
-        editais = Edital.objects.filter(
-            status=Edital.Status.PUBLICADO,
-            inicio__lte=hoje,
-            fim__gte=hoje
-        )
+        # Listar editais abertos (cache de janelas)
+        editais = editais_da_janela('abertos')
 
         return render(request, self.template_name, {
             'projeto': projeto,
@@ -83,42 +79,30 @@ class SubmeterProjetoView(AlunoRequiredMixin, View):
         })
 
     def post(self, request, projeto_pk):
-        projeto = get_object_or_404(Projeto, pk=projeto_pk, responsavel=request.user)
         edital_pk = request.POST.get('edital')
 
         # Validações
-        if not edital_pk:
+        if not edital_pk or not edital_pk.isdigit():
             messages.error(request, 'Selecione um edital.')
             return redirect('projetos:submeter', projeto_pk=projeto_pk)
 
-        if projeto.status != Projeto.Status.PRE_SUBMISSAO:
-            messages.warning(request, 'Este projeto já foi submetido.')
-            return redirect('projetos:detalhe', pk=projeto_pk)
-
-        edital = get_object_or_404(Edital, pk=edital_pk)
-
-        # Verificar se edital está aberto
-        hoje = timezone.now()
-        if not (edital.status == Edital.Status.PUBLICADO and
-                edital.inicio <= hoje <= edital.fim):
-            messages.error(request, 'Este edital não está aberto para submissões.')
-            return redirect('projetos:submeter', projeto_pk=projeto_pk)
-
-        # Verificar se já existe submissão para este edital
-        if Submissao.objects.filter(projeto=projeto, edital=edital).exists():
-            messages.warning(request, 'Projeto já submetido a este edital.')
+        try:
+            with vaga('submissao'):
+                submissao = submeter(request.user, projeto_pk, int(edital_pk))
+        except Sobrecarga as sobrecarga:
+            resposta = render(request, '503.html', {'mensagem': sobrecarga.detail}, status=503)
+            resposta['Retry-After'] = str(sobrecarga.wait)
+            return resposta
+        except SubmissaoRecusada as recusa:
+            if recusa.codigo in ('projeto_inexistente', 'nao_responsavel', 'edital_inexistente'):
+                raise Http404(recusa.mensagem)
+            if recusa.codigo in ('edital_fechado', 'indeterminado'):
+                messages.error(request, recusa.mensagem)
+                return redirect('projetos:submeter', projeto_pk=projeto_pk)
+            messages.warning(request, recusa.mensagem)
             return redirect('projetos:detalhe', pk=projeto_pk)
 
-        # Criar submissão
-        Submissao.objects.create(
-            projeto=projeto,
-            edital=edital,
-            status=Submissao.Status.ENVIADA
-        )
-
-        # Atualizar status do projeto
-        projeto.status = Projeto.Status.SUBMETIDO
-        projeto.save()
-
-        messages.success(request, f'Projeto submetido ao edital "{edital.titulo}" com sucesso!')
+        edital = janela_submissao(submissao.edital_id)
+        titulo = edital.titulo if edital else submissao.edital.titulo
+        messages.success(request, f'Projeto submetido ao edital "{titulo}" com sucesso!')
         return redirect('projetos:detalhe', pk=projeto_pk)
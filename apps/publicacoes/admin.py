@@ -20,7 +20,7 @@ class PublicacaoAdmin(admin.ModelAdmin):
     search_fields = ['projeto__titulo', 'descricao']
     readonly_fields = ['publicado_em']
     date_hierarchy = 'publicado_em'
-    raw_id_fields = ['projeto', 'publicado_por']
+    autocomplete_fields = ['projeto', 'publicado_por']
 
     fieldsets = (
         (None, {'fields': ('projeto', 'logo', 'descricao')}),
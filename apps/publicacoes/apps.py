@@ -8,3 +8,7 @@ class PublicacoesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.publicacoes'
     verbose_name = 'Publicações'
+
+    def ready(self):
+        """Registra os signals do app."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,10 @@
+"""
+Cache do app publicacoes.
+
+O namespace `publicacoes` guarda dados derivados da vitrine (fragmentos da
+home, estado de requisições condicionais) e é invalidado pelos signals de
+Publicacao e de Projeto (ver signals.py).
+"""
+from apps.core.cache import CacheNamespace
+
+cache = CacheNamespace('publicacoes')
@@ -0,0 +1,127 @@
+"""
+Geração das versões do logo das publicações (card, hero, og:image).
+
+Este módulo contém:
+- gerar: gera (ou reaproveita) as versões WebP e JPEG do logo atual
+
+A geração roda fora do request, pela fila de tarefas (tarefas.gerar_derivados_logo).
+
+Cada versão é o logo ajustado ao tamanho fixo de TAMANHOS_LOGO (sem cortar,
+com margem), sem metadados (EXIF, ICC, XMP). Cada versão é sempre codificada
+e entregue ao storage, que decide o nome final. Com o storage padrão
+(core/storage.py) o nome é o sha256 da própria versão: gerar de novo para o
+mesmo logo reaproveita o arquivo já gravado, versões idênticas de
+publicações diferentes são gravadas uma vez só, e um logo trocado gera nomes
+novos — URLs antigas nunca servem uma imagem diferente. O nome pedido
+(`publicacoes/derivados/<hash do original>-<tamanho>.<formato>`) só define a
+pasta e a extensão nesse caso, e mantém os nomes únicos em outros storages.
+
+A geração é idempotente: `Publicacao.derivados['logo']` guarda o nome do
+original a que as versões se referem, e a gravação só acontece se o logo
+não mudou no meio do caminho. Um logo que não pode ser lido fica marcado
+em `derivados['invalido']` e não é tentado de novo (até ser trocado ou com
+`forcar`).
+"""
+import hashlib
+import logging
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .cache import cache
+from .models import FORMATOS_LOGO, TAMANHOS_LOGO, Publicacao
+
+logger = logging.getLogger(__name__)
+
+PASTA = 'publicacoes/derivados'
+EXTENSOES = {'webp': 'webp', 'jpeg': 'jpg'}
+QUALIDADE = {'webp': 80, 'jpeg': 85}
+FUNDO_JPEG = (255, 255, 255)
+
+
+def _hash_arquivo(arquivo):
+    digest = hashlib.sha256()
+    arquivo.open('rb')
+    try:
+        for bloco in arquivo.chunks():
+            digest.update(bloco)
+    finally:
+        arquivo.close()
+    return digest.hexdigest()[:20]
+
+
+def _abrir(arquivo):
+    """Imagem do logo já orientada pelo EXIF, em RGBA."""
+    arquivo.open('rb')
+    try:
+        imagem = Image.open(arquivo)
+        imagem = ImageOps.exif_transpose(imagem)
+        return imagem.convert('RGBA')
+    finally:
+        arquivo.close()
+
+
+def _codificar(imagem, tamanho, formato):
+    """Versão `tamanho` da imagem em `formato`, sem metadados."""
+    versao = ImageOps.pad(imagem, tamanho, method=Image.Resampling.LANCZOS, color=(0, 0, 0, 0))
+    if formato == 'jpeg':
+        fundo = Image.new('RGB', versao.size, FUNDO_JPEG)
+        fundo.paste(versao, mask=versao.getchannel('A'))
+        versao = fundo
+    saida = BytesIO()
+    # Sem exif/icc_profile: nada do original é copiado para a versão
+    if formato == 'webp':
+        versao.save(saida, 'WEBP', quality=QUALIDADE['webp'], method=6)
+    else:
+        versao.save(saida, 'JPEG', quality=QUALIDADE['jpeg'], optimize=True, progressive=True)
+    return saida.getvalue()
+
+
+def gerar(publicacao_id, forcar=False):
+    """
+    Gera as versões do logo da publicação e grava `derivados`.
+
+    Args:
+        publicacao_id: ID da publicação
+        forcar: Gera mesmo que as versões do logo atual já estejam prontas
+            (ou que ele tenha sido marcado como inválido)
+
+    Returns:
+        True se `derivados` foi atualizado
+    """
+    publicacao = Publicacao.objects.filter(pk=publicacao_id).first()
+    if not publicacao or not publicacao.logo:
+        return False
+    if not publicacao.derivados_pendentes and not forcar:
+        return False
+
+    logo = publicacao.logo
+    storage = logo.storage
+    prefixo = f'{PASTA}/{_hash_arquivo(logo)}'
+
+    versoes = {}
+    try:
+        imagem = _abrir(logo)
+        for nome_tamanho, tamanho in TAMANHOS_LOGO.items():
+            versoes[nome_tamanho] = {}
+            for formato in FORMATOS_LOGO:
+                nome = f'{prefixo}-{nome_tamanho}.{EXTENSOES[formato]}'
+                versoes[nome_tamanho][formato] = storage.save(
+                    nome, ContentFile(_codificar(imagem, tamanho, formato))
+                )
+    except (UnidentifiedImageError, OSError):
+        logger.warning('Logo inválido na publicação %s: %s', publicacao_id, logo.name, exc_info=True)
+        Publicacao.objects.filter(pk=publicacao_id, logo=logo.name).update(
+            derivados={'invalido': logo.name}
+        )
+        return False
+
+    # Só grava se o logo continua o mesmo (outra troca pode ter ocorrido)
+    atualizadas = Publicacao.objects.filter(pk=publicacao_id, logo=logo.name).update(
+        derivados={'logo': logo.name, 'versoes': versoes}
+    )
+    if atualizadas:
+        cache.invalidar()
+    return bool(atualizadas)
+
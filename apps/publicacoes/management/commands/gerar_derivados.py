@@ -0,0 +1,72 @@
+"""
+Comando: gera as versões do logo das publicações (card, hero, og:image).
+
+Necessário para publicações criadas antes das versões existirem ou cujo
+processamento em segundo plano foi interrompido. Sem --forcar, publicações
+já processadas (ou com logo inválido) são puladas. Com --enfileirar, as
+publicações pendentes só são colocadas na fila de tarefas, sem processar
+as imagens aqui (usado no start.sh, para não atrasar o boot); as que já têm
+tarefa pendente ou em execução não são enfileiradas de novo.
+
+Uso:
+    python manage.py gerar_derivados
+    python manage.py gerar_derivados --forcar
+    python manage.py gerar_derivados --enfileirar
+"""
+from django.core.management.base import BaseCommand
+
+from apps.publicacoes import derivados
+from apps.publicacoes.models import Publicacao
+from apps.publicacoes.tarefas import gerar_derivados_logo
+from apps.tarefas.models import Tarefa
+
+
+class Command(BaseCommand):
+    help = 'Gera as versões WebP/JPEG do logo das publicações.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--forcar',
+            action='store_true',
+            help='Regera as versões mesmo das publicações já processadas.',
+        )
+        parser.add_argument(
+            '--enfileirar',
+            action='store_true',
+            help='Apenas enfileira as publicações pendentes para o worker.',
+        )
+
+    def handle(self, *args, **options):
+        forcar = options['forcar']
+        publicacoes = (
+            Publicacao.objects.exclude(logo='').only('pk', 'logo', 'derivados').order_by('pk')
+        )
+        pendentes = [
+            publicacao.pk
+            for publicacao in publicacoes.iterator()
+            if forcar or publicacao.derivados_pendentes
+        ]
+
+        if options['enfileirar']:
+            na_fila = self._na_fila()
+            pendentes = [publicacao_id for publicacao_id in pendentes if publicacao_id not in na_fila]
+            for publicacao_id in pendentes:
+                gerar_derivados_logo.enfileirar(publicacao_id, forcar=forcar)
+            self.stdout.write(
+                self.style.SUCCESS(f'{len(pendentes)} publicações enfileiradas para gerar o logo.')
+            )
+            return
+
+        geradas = 0
+        for publicacao_id in pendentes:
+            if derivados.gerar(publicacao_id, forcar=forcar):
+                geradas += 1
+        self.stdout.write(self.style.SUCCESS(f'{geradas} publicações com versões do logo geradas.'))
+
+    def _na_fila(self):
+        """IDs das publicações com tarefa de gerar o logo ainda pendente ou em execução."""
+        args = Tarefa.objects.filter(
+            nome=gerar_derivados_logo.nome_tarefa,
+            status__in=[Tarefa.Status.PENDENTE, Tarefa.Status.EXECUTANDO],
+        ).values_list('args', flat=True)
+        return {argumentos[0] for argumentos in args if argumentos}
@@ -0,0 +1,85 @@
+"""
+Comando: move os logos antigos para o storage endereçado pelo conteúdo.
+
+Logos enviados antes de apps.core.storage.ConteudoEnderecadoStorage estão em
+`publicacoes/<nome original>`. Cada um é regravado como
+`publicacoes/ab/cd/<sha256>.<ext>` (arquivos iguais viram um só) e o
+`Publicacao.logo` é atualizado; as versões já geradas continuam valendo,
+pois o conteúdo é o mesmo. Depois, o arquivo antigo é removido se nenhuma
+publicação o referencia mais.
+
+Uso:
+    python manage.py migrar_logos --dry-run
+    python manage.py migrar_logos
+    python manage.py migrar_logos --manter-originais
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.storage import ConteudoEnderecadoStorage, nome_enderecado
+from apps.publicacoes.cache import cache
+from apps.publicacoes.models import Publicacao
+
+
+class Command(BaseCommand):
+    help = 'Regrava os logos das publicações com nomes derivados do conteúdo (sha256).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Apenas lista os logos que seriam migrados.',
+        )
+        parser.add_argument(
+            '--manter-originais',
+            action='store_true',
+            help='Não remove os arquivos antigos após a migração.',
+        )
+
+    def handle(self, *args, **options):
+        storage = Publicacao._meta.get_field('logo').storage
+        if not isinstance(storage, ConteudoEnderecadoStorage):
+            raise CommandError(
+                'O storage padrão não é ConteudoEnderecadoStorage (ver STORAGES em settings).'
+            )
+
+        pendentes = [
+            (pk, nome, derivados)
+            for pk, nome, derivados in Publicacao.objects.exclude(logo='')
+            .order_by('pk')
+            .values_list('pk', 'logo', 'derivados')
+            if not nome_enderecado(nome)
+        ]
+        if options['dry_run']:
+            for pk, nome, _ in pendentes:
+                self.stdout.write(f'Publicação {pk}: {nome}')
+            self.stdout.write(f'{len(pendentes)} logos seriam migrados.')
+            return
+
+        migrados = 0
+        antigos = set()
+        for pk, nome, derivados in pendentes:
+            if not storage.exists(nome):
+                self.stderr.write(f'Publicação {pk}: arquivo {nome} não encontrado, ignorada.')
+                continue
+            with storage.open(nome, 'rb') as arquivo:
+                novo = storage.save(nome, arquivo)
+
+            if (derivados or {}).get('logo') == nome:
+                derivados = {**derivados, 'logo': novo}
+            # Só altera se o logo não foi trocado enquanto o comando rodava
+            if Publicacao.objects.filter(pk=pk, logo=nome).update(logo=novo, derivados=derivados):
+                migrados += 1
+                antigos.add(nome)
+
+        removidos = 0
+        if not options['manter_originais']:
+            for nome in antigos:
+                if not Publicacao.objects.filter(logo=nome).exists():
+                    storage.delete(nome)
+                    removidos += 1
+
+        if migrados:
+            cache.invalidar()
+        self.stdout.write(self.style.SUCCESS(
+            f'{migrados} logos migrados; {removidos} arquivos antigos removidos.'
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publicacoes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publicacao',
+            name='derivados',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='derivados do logo'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projetos', '0007_submissao_unica_viva'),
+        ('publicacoes', '0002_publicacao_derivados'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='publicacao',
+            name='publicacoes_ativo_29bf39_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='publicacao',
+            name='publicacoes_publica_75ea09_idx',
+        ),
+        migrations.AddField(
+            model_name='publicacao',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='deletado em'),
+        ),
+        migrations.AddIndex(
+            model_name='publicacao',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['ativo', 'destaque'], name='publicacao_ativo_dest_vivo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publicacao',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['publicado_em'], name='publicacao_publicado_vivo_idx'),
+        ),
+    ]
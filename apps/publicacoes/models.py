@@ -3,17 +3,30 @@ Modelos de publicações do sistema YpeTec.
 
 Este módulo contém:
 - Publicacao: vitrine pública de projetos aprovados
+- TAMANHOS_LOGO / FORMATOS_LOGO: versões do logo geradas por derivados.py
 """
 from django.conf import settings
 from django.db import models
 
+from apps.core.models import NAO_DELETADOS, SoftDeleteModel
 
-class Publicacao(models.Model):
+# Versões do logo (largura, altura); card e hero compõem o srcset, og é o og:image
+TAMANHOS_LOGO = {
+    'card': (480, 270),
+    'hero': (1280, 720),
+    'og': (1200, 630),
+}
+TAMANHOS_SRCSET = ('card', 'hero')
+FORMATOS_LOGO = ('webp', 'jpeg')
+
+
+class Publicacao(SoftDeleteModel):
     """
     Publicação de um projeto na vitrine pública.
 
     Representa um projeto aprovado que foi publicado
-    para exibição pública no site.
+    para exibição pública no site. É excluída (e restaurada) junto com o
+    projeto (ver Projeto.soft_delete_cascade).
     """
 
     projeto = models.OneToOneField(
@@ -49,14 +62,30 @@ class Publicacao(models.Model):
         default=True,
         help_text='Se desmarcado, não aparece na vitrine.',
     )
+    # {'logo': nome do original, 'versoes': {tamanho: {formato: nome}}}
+    # ou, se o logo não pôde ser lido: {'invalido': nome do original}
+    derivados = models.JSONField(
+        'derivados do logo',
+        default=dict,
+        blank=True,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'publicação'
         verbose_name_plural = 'publicações'
         ordering = ['-publicado_em']
         indexes = [
-            models.Index(fields=['ativo', 'destaque']),
-            models.Index(fields=['publicado_em']),
+            models.Index(
+                fields=['ativo', 'destaque'],
+                condition=NAO_DELETADOS,
+                name='publicacao_ativo_dest_vivo_idx',
+            ),
+            models.Index(
+                fields=['publicado_em'],
+                condition=NAO_DELETADOS,
+                name='publicacao_publicado_vivo_idx',
+            ),
         ]
 
     def __str__(self):
@@ -69,6 +98,47 @@ class Publicacao(models.Model):
             return self.logo.url
         return None
 
+    @property
+    def derivados_prontos(self):
+        """True se os derivados correspondem ao logo atual."""
+        return bool(self.logo) and (self.derivados or {}).get('logo') == self.logo.name
+
+    @property
+    def derivados_pendentes(self):
+        """True se há logo sem derivados e ele ainda não foi recusado como inválido."""
+        if not self.logo or self.derivados_prontos:
+            return False
+        return (self.derivados or {}).get('invalido') != self.logo.name
+
+    def derivado_url(self, tamanho, formato='jpeg'):
+        """URL de uma versão do logo (None se ainda não foi gerada)."""
+        if not self.derivados_prontos:
+            return None
+        nome = self.derivados.get('versoes', {}).get(tamanho, {}).get(formato)
+        return self.logo.storage.url(nome) if nome else None
+
+    def srcset(self, formato):
+        """Valor de `srcset` com as versões card e hero no formato dado."""
+        partes = []
+        for tamanho in TAMANHOS_SRCSET:
+            url = self.derivado_url(tamanho, formato)
+            if url:
+                partes.append(f'{url} {TAMANHOS_LOGO[tamanho][0]}w')
+        return ', '.join(partes)
+
+    @property
+    def srcset_webp(self):
+        return self.srcset('webp')
+
+    @property
+    def srcset_jpeg(self):
+        return self.srcset('jpeg')
+
+    @property
+    def logo_card_url(self):
+        """Versão card em JPEG (ou o original, enquanto não há derivados)."""
+        return self.derivado_url('card') or self.logo_url
+
     @classmethod
     def vitrine(cls):
         """Retorna publicações ativas para a vitrine."""
@@ -5,15 +5,47 @@ from rest_framework import serializers
 
 from apps.projetos.models import Projeto
 
-from .models import Publicacao
+from .models import FORMATOS_LOGO, TAMANHOS_LOGO, TAMANHOS_SRCSET, Publicacao
+
+
+class LogoDerivadosMixin:
+    """
+    URLs absolutas das versões do logo (ver derivados.py).
+
+    `logo_srcset` traz os valores de `srcset` em WebP e JPEG (card e hero);
+    `logo_og_url` é a versão og:image. Enquanto as versões não foram geradas,
+    ambos são None e os clientes usam `logo_url`.
+    """
+
+    def _absoluta(self, url):
+        request = self.context.get('request')
+        if url and request:
+            return request.build_absolute_uri(url)
+        return url
+
+    def get_logo_srcset(self, obj):
+        if not obj.derivados_prontos:
+            return None
+        return {
+            formato: ', '.join(
+                f'{self._absoluta(obj.derivado_url(tamanho, formato))} {TAMANHOS_LOGO[tamanho][0]}w'
+                for tamanho in TAMANHOS_SRCSET
+            )
+            for formato in FORMATOS_LOGO
+        }
+
+    def get_logo_og_url(self, obj):
+        return self._absoluta(obj.derivado_url('og'))
 
 
-class PublicacaoSerializer(serializers.ModelSerializer):
+class PublicacaoSerializer(LogoDerivadosMixin, serializers.ModelSerializer):
     """Serializer para leitura de publicações."""
 
     projeto_titulo = serializers.CharField(source='projeto.titulo', read_only=True)
     projeto_area = serializers.CharField(source='projeto.area', read_only=True)
     logo_url = serializers.SerializerMethodField()
+    logo_srcset = serializers.SerializerMethodField()
+    logo_og_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Publicacao
@@ -24,6 +56,8 @@ class PublicacaoSerializer(serializers.ModelSerializer):
             'projeto_area',
             'logo',
             'logo_url',
+            'logo_srcset',
+            'logo_og_url',
             'descricao',
             'destaque',
             'ativo',
@@ -74,6 +108,9 @@ class PublicacaoCreateSerializer(serializers.ModelSerializer):
         """Cria publicação e atualiza status do projeto."""
         projeto = Projeto.objects.get(id=validated_data['project_id'])
 
+        # Publicação excluída antes (o projeto continua vivo): a nova a substitui
+        Publicacao.all_objects.filter(projeto=projeto).dead().hard_delete()
+
         publicacao = Publicacao.objects.create(
             projeto=projeto,
             logo=validated_data['logo'],
@@ -89,12 +126,14 @@ class PublicacaoCreateSerializer(serializers.ModelSerializer):
         return publicacao
 
 
-class PublicacaoListSerializer(serializers.ModelSerializer):
+class PublicacaoListSerializer(LogoDerivadosMixin, serializers.ModelSerializer):
     """Serializer simplificado para vitrine pública."""
 
     projeto_titulo = serializers.CharField(source='projeto.titulo', read_only=True)
     projeto_area = serializers.CharField(source='projeto.area', read_only=True)
     logo_url = serializers.SerializerMethodField()
+    logo_srcset = serializers.SerializerMethodField()
+    logo_og_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Publicacao
@@ -103,14 +142,12 @@ class PublicacaoListSerializer(serializers.ModelSerializer):
             'projeto_titulo',
             'projeto_area',
             'logo_url',
+            'logo_srcset',
+            'logo_og_url',
             'descricao',
             'publicado_em',
         ]
 
     def get_logo_url(self, obj):
-        if obj.logo:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.logo.url)
-            return obj.logo.url
-        return None
+        """Versão card do logo (o original enquanto ela não existe)."""
+        return self._absoluta(obj.logo_card_url)
@@ -0,0 +1,54 @@
+"""
+Signals do app publicacoes.
+
+Invalida o cache de publicações (ex.: fragmento da vitrine na home) sempre
+que uma publicação muda ou que o projeto publicado muda título/área.
+A exclusão lógica do projeto leva junto a publicação (core/exclusao.py),
+que também invalida o cache, assim como a restauração.
+A invalidação acontece após o commit, para que outro worker não guarde os
+dados anteriores já sob a versão nova do namespace.
+
+Um logo novo (ou trocado) enfileira a geração das suas versões (derivados.py).
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.exclusao import excluidos_logicamente, restaurados
+from apps.projetos.models import Projeto
+
+from .cache import cache
+from .models import Publicacao
+from .tarefas import gerar_derivados_logo
+
+# Campos do projeto exibidos junto com a publicação
+CAMPOS_PROJETO_EXIBIDOS = {'titulo', 'area'}
+
+
+@receiver(post_save, sender=Publicacao)
+@receiver(post_delete, sender=Publicacao)
+@receiver(excluidos_logicamente, sender=Publicacao)
+@receiver(restaurados, sender=Publicacao)
+def invalidar_cache_publicacoes(sender, **kwargs):
+    """Publicação criada, alterada ou removida: invalida o namespace (após o commit)."""
+    transaction.on_commit(cache.invalidar)
+
+
+@receiver(post_save, sender=Publicacao)
+def enfileirar_derivados_logo(sender, instance, raw=False, **kwargs):
+    """Logo sem versões geradas: enfileira a geração (na mesma transação)."""
+    if raw or not instance.derivados_pendentes:
+        return
+    gerar_derivados_logo.enfileirar(instance.pk)
+
+
+@receiver(post_save, sender=Projeto)
+def invalidar_cache_projeto_publicado(sender, instance, created, update_fields=None, **kwargs):
+    """Projeto publicado com título/área possivelmente alterados: invalida o namespace."""
+    if created:
+        return
+    if update_fields is not None and not CAMPOS_PROJETO_EXIBIDOS & set(update_fields):
+        return
+    if Publicacao.objects.filter(projeto_id=instance.pk).exists():
+        transaction.on_commit(cache.invalidar)
+
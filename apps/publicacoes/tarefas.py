@@ -0,0 +1,16 @@
+"""
+Tarefas em segundo plano do app publicacoes (ver apps/tarefas/fila.py).
+
+Este módulo contém:
+- gerar_derivados_logo: gera as versões do logo de uma publicação
+"""
+from apps.tarefas.fila import tarefa
+from apps.tarefas.models import Tarefa
+
+from . import derivados
+
+
+@tarefa(prioridade=Tarefa.Prioridade.BAIXA)
+def gerar_derivados_logo(publicacao_id, forcar=False):
+    """Gera as versões card/hero/og do logo (idempotente; ver derivados.gerar)."""
+    derivados.gerar(publicacao_id, forcar=forcar)
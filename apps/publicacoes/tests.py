@@ -0,0 +1,123 @@
+"""
+Testes do app publicacoes.
+"""
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.busca.models import DocumentoBusca
+from apps.contas.models import Usuario
+from apps.core import exclusao
+from apps.projetos.models import Projeto
+from apps.tarefas.models import Tarefa
+
+from .cache import cache
+from .models import Publicacao
+from .tarefas import gerar_derivados_logo
+
+
+@override_settings(TAREFAS_SINCRONAS=True, AUDITORIA_SINCRONA=True)
+class ExclusaoProjetoPublicadoTest(TestCase):
+    """A publicação acompanha a exclusão lógica e a restauração do projeto."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        midia = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, midia, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=midia))
+
+    def setUp(self):
+        self.admin = Usuario.objects.create_user(
+            cpf='00000000001', email='admin@ypetec.test', password='x', name='Admin', role='ADMIN',
+        )
+        self.projeto = Projeto.objects.create(
+            responsavel=self.admin, titulo='Projeto', resumo='r', area='TI',
+            status=Projeto.Status.INCUBADO,
+        )
+        self.publicacao = Publicacao(
+            projeto=self.projeto, descricao='Vitrine', publicado_por=self.admin,
+        )
+        self.publicacao.logo.save('logo.png', ContentFile(b'x'), save=False)
+        self.publicacao.save()
+
+    def _documento_publico(self):
+        return DocumentoBusca.objects.filter(
+            tipo=DocumentoBusca.Tipo.PUBLICACAO, objeto_id=self.publicacao.pk,
+        ).exists()
+
+    def test_exclusao_do_projeto_oculta_a_publicacao(self):
+        versao = cache.versao()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.projeto.delete()
+
+        self.assertFalse(Publicacao.vitrine().exists())
+        self.assertTrue(Publicacao.all_objects.filter(pk=self.publicacao.pk).exists())
+        self.assertFalse(self._documento_publico())
+        self.assertNotEqual(cache.versao(), versao)
+
+    def test_restauracao_do_projeto_restaura_a_publicacao(self):
+        self.projeto.delete()
+        self.projeto.restore()
+
+        self.assertTrue(Publicacao.vitrine().filter(pk=self.publicacao.pk).exists())
+        self.assertTrue(self._documento_publico())
+
+    def test_expurgo_mantem_projeto_com_publicacao_viva(self):
+        antigo = timezone.now() - timedelta(days=400)
+        Projeto.all_objects.filter(pk=self.projeto.pk).update(deleted_at=antigo)
+
+        removidos, mantidos = exclusao.expurgar(Projeto, timezone.now())
+
+        self.assertEqual(mantidos, [self.projeto.pk])
+        self.assertFalse(removidos)
+        self.assertTrue(Publicacao.objects.filter(pk=self.publicacao.pk).exists())
+
+
+@override_settings(TAREFAS_SINCRONAS=False, AUDITORIA_SINCRONA=True)
+class EnfileirarDerivadosTest(TestCase):
+    """`gerar_derivados --enfileirar` (rodado a cada boot) não duplica tarefas."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        midia = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, midia, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=midia))
+
+    def setUp(self):
+        admin = Usuario.objects.create_user(
+            cpf='00000000001', email='admin@ypetec.test', password='x', name='Admin', role='ADMIN',
+        )
+        projeto = Projeto.objects.create(
+            responsavel=admin, titulo='Projeto', resumo='r', area='TI',
+            status=Projeto.Status.INCUBADO,
+        )
+        self.publicacao = Publicacao(projeto=projeto, descricao='Vitrine', publicado_por=admin)
+        self.publicacao.logo.save('logo.png', ContentFile(b'x'), save=False)
+        self.publicacao.save()
+        Tarefa.objects.all().delete()
+
+    def _enfileirar(self):
+        call_command('gerar_derivados', enfileirar=True, stdout=StringIO())
+        return Tarefa.objects.filter(nome=gerar_derivados_logo.nome_tarefa)
+
+    def test_publicacao_ja_na_fila_nao_e_enfileirada_de_novo(self):
+        self._enfileirar()
+        tarefas = self._enfileirar()
+
+        self.assertEqual(tarefas.count(), 1)
+        self.assertEqual(tarefas.get().args, [self.publicacao.pk])
+
+    def test_tarefa_encerrada_nao_impede_novo_enfileiramento(self):
+        self._enfileirar().update(status=Tarefa.Status.FALHOU)
+
+        tarefas = self._enfileirar()
+
+        self.assertEqual(tarefas.filter(status=Tarefa.Status.PENDENTE).count(), 1)
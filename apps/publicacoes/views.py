@@ -7,7 +7,9 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
 from apps.contas.permissions import IsAdmin
+from apps.core.condicional import RespostaCondicionalMixin
 
+from .cache import cache
 from .models import Publicacao
 from .serializers import (
     PublicacaoCreateSerializer,
@@ -16,15 +18,21 @@ from .serializers import (
 )
 
 
-class PublicacaoViewSet(viewsets.ModelViewSet):
+class PublicacaoViewSet(RespostaCondicionalMixin, viewsets.ModelViewSet):
     """
     ViewSet para publicações.
 
     GET  /api/publications/     - Lista publicações (público)
     POST /api/publications/     - Cria publicação (admin)
+
+    Listagem paginada por cursor com ?page_size= ou ?cursor=.
+    Listagem e detalhe respondem 304 com If-None-Match / If-Modified-Since.
     """
 
     parser_classes = [MultiPartParser, FormParser]
+    cursor_ordering = ('-publicado_em', '-id')
+    cache_condicional = cache
+    campo_modificacao = 'publicado_em'
 
     def get_queryset(self):
         """Retorna publicações ativas por padrão."""
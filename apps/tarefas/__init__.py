@@ -0,0 +1 @@
+# App tarefas - fila de tarefas em segundo plano gravada no banco
@@ -0,0 +1,42 @@
+"""Configuração do Django Admin para o app tarefas."""
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Tarefa
+
+
+@admin.register(Tarefa)
+class TarefaAdmin(admin.ModelAdmin):
+    """Admin para Tarefa (acompanhamento da fila; tarefas são criadas pelo código)."""
+
+    list_display = [
+        'id',
+        'nome',
+        'status',
+        'prioridade',
+        'tentativas',
+        'max_tentativas',
+        'executar_em',
+        'concluida_em',
+    ]
+    list_filter = ['status', 'nome']
+    search_fields = ['nome']
+    date_hierarchy = 'criada_em'
+    readonly_fields = [
+        'nome', 'args', 'kwargs', 'prioridade', 'status', 'tentativas', 'max_tentativas',
+        'executar_em', 'trabalhador', 'erro', 'criada_em', 'iniciada_em', 'concluida_em',
+    ]
+    actions = ['reenfileirar']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description='Reenfileirar tarefas selecionadas')
+    def reenfileirar(self, request, queryset):
+        total = queryset.exclude(status=Tarefa.Status.EXECUTANDO).update(
+            status=Tarefa.Status.PENDENTE,
+            tentativas=0,
+            executar_em=timezone.now(),
+            trabalhador='',
+        )
+        self.message_user(request, f'{total} tarefas reenfileiradas.')
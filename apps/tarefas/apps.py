@@ -0,0 +1,15 @@
+"""Configuração do app tarefas."""
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class TarefasConfig(AppConfig):
+    """Configuração do app tarefas - fila de tarefas em segundo plano."""
+
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.tarefas'
+    verbose_name = 'Tarefas'
+
+    def ready(self):
+        """Registra as tarefas declaradas nos módulos `tarefas.py` dos apps."""
+        autodiscover_modules('tarefas')
@@ -0,0 +1,263 @@
+"""
+Fila de tarefas em segundo plano gravada no banco.
+
+Este módulo contém:
+- tarefa: decorador que registra uma função como tarefa
+- Reagendar: exceção para adiar a tarefa sem contar como falha (ex.: limite de envio)
+- enfileirar: grava uma execução pendente (um INSERT na transação atual)
+- reservar / executar / devolver: usados pelo worker (processar_tarefas)
+- recuperar_travadas / limpar: manutenção periódica feita pelo worker
+
+Uso:
+    # apps/<app>/tarefas.py (carregado pelo TarefasConfig.ready)
+    @tarefa(prioridade=Tarefa.Prioridade.ALTA)
+    def enviar_email(usuario_id):
+        ...
+
+    enviar_email.enfileirar(usuario.pk)
+
+Os argumentos precisam ser serializáveis em JSON (passe IDs, não instâncias).
+
+A reserva usa `SELECT ... FOR UPDATE SKIP LOCKED` quando o banco oferece
+(PostgreSQL): vários workers consomem a fila sem disputar as mesmas linhas.
+Nos demais bancos cada tarefa é reservada por um UPDATE condicional.
+
+Uma falha reagenda a tarefa com espera exponencial (TAREFAS_BACKOFF_BASE *
+2^(tentativa-1), até TAREFAS_BACKOFF_MAXIMO, com variação aleatória); após
+`max_tentativas` ela fica como FALHOU, com o traceback em `erro`.
+
+Configurações (settings):
+    TAREFAS_SINCRONAS: executa após o commit, no próprio processo (testes, scripts)
+    TAREFAS_BACKOFF_BASE / TAREFAS_BACKOFF_MAXIMO: espera entre tentativas (segundos)
+    TAREFAS_TIMEOUT: execução mais longa que isto é considerada interrompida (segundos)
+    TAREFAS_RETENCAO_DIAS: tarefas concluídas são removidas após estes dias
+"""
+import json
+import logging
+import random
+import traceback
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Tarefa
+
+logger = logging.getLogger(__name__)
+
+
+class Reagendar(Exception):
+    """
+    Levantada pela tarefa para executar de novo após `atraso` segundos.
+
+    Não conta como tentativa nem registra erro (ex.: limite de taxa atingido).
+    """
+
+    def __init__(self, atraso, motivo=''):
+        super().__init__(motivo or f'Reagendada em {atraso}s')
+        self.atraso = atraso
+
+
+# Função registrada e suas opções padrão
+Definicao = namedtuple('Definicao', ['funcao', 'prioridade', 'max_tentativas'])
+
+_registro = {}
+
+
+def tarefa(nome=None, prioridade=Tarefa.Prioridade.NORMAL, max_tentativas=5):
+    """
+    Registra a função como tarefa e adiciona `funcao.enfileirar(*args, **kwargs)`.
+
+    Args:
+        nome: Nome gravado na fila (padrão: `<módulo>.<função>`)
+        prioridade: Prioridade padrão (menor executa antes)
+        max_tentativas: Execuções antes de desistir
+    """
+
+    def decorador(funcao):
+        chave = nome or f'{funcao.__module__}.{funcao.__name__}'
+        _registro[chave] = Definicao(funcao, prioridade, max_tentativas)
+        funcao.nome_tarefa = chave
+        funcao.enfileirar = lambda *args, **kwargs: enfileirar(chave, args, kwargs)
+        return funcao
+
+    return decorador
+
+
+def enfileirar(nome, args=(), kwargs=None, prioridade=None, atraso=None):
+    """
+    Agenda a execução da tarefa `nome`.
+
+    Args:
+        nome: Nome registrado por @tarefa
+        args / kwargs: Argumentos (serializáveis em JSON)
+        prioridade: Substitui a prioridade padrão da tarefa
+        atraso: timedelta ou segundos até a tarefa poder executar
+
+    Returns:
+        Tarefa criada (None no modo síncrono)
+    """
+    definicao = _registro.get(nome)
+    if definicao is None:
+        raise LookupError(f'Tarefa não registrada: {nome}')
+    # Mesma conversão que a gravação em JSON faria (tuplas viram listas etc.)
+    args, kwargs = json.loads(json.dumps([list(args), kwargs or {}]))
+
+    if getattr(settings, 'TAREFAS_SINCRONAS', False):
+        transaction.on_commit(lambda: _executar_sincrona(nome, definicao, args, kwargs))
+        return None
+
+    return _gravar(nome, definicao, args, kwargs, prioridade, atraso)
+
+
+def _executar_sincrona(nome, definicao, args, kwargs):
+    try:
+        definicao.funcao(*args, **kwargs)
+    except Reagendar as adiamento:
+        # Nem o modo síncrono ignora o adiamento: a tarefa vai para a fila
+        _gravar(nome, definicao, args, kwargs, None, adiamento.atraso)
+
+
+def _gravar(nome, definicao, args, kwargs, prioridade, atraso):
+    executar_em = timezone.now()
+    if atraso:
+        executar_em += atraso if isinstance(atraso, timedelta) else timedelta(seconds=atraso)
+    return Tarefa.objects.create(
+        nome=nome,
+        args=args,
+        kwargs=kwargs,
+        prioridade=definicao.prioridade if prioridade is None else prioridade,
+        max_tentativas=definicao.max_tentativas,
+        executar_em=executar_em,
+    )
+
+
+def reservar(trabalhador, limite):
+    """
+    Marca até `limite` tarefas prontas como EXECUTANDO para `trabalhador`.
+
+    Returns:
+        list[Tarefa]: Tarefas reservadas, na ordem de execução
+    """
+    agora = timezone.now()
+    prontas = Tarefa.objects.filter(
+        status=Tarefa.Status.PENDENTE,
+        executar_em__lte=agora,
+    ).order_by('prioridade', 'executar_em', 'id')
+    reserva = {
+        'status': Tarefa.Status.EXECUTANDO,
+        'trabalhador': trabalhador,
+        'iniciada_em': agora,
+        'tentativas': F('tentativas') + 1,
+    }
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            ids = list(prontas.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limite])
+            Tarefa.objects.filter(pk__in=ids).update(**reserva)
+        else:
+            ids = [
+                pk for pk in prontas.values_list('pk', flat=True)[:limite]
+                if Tarefa.objects.filter(pk=pk, status=Tarefa.Status.PENDENTE).update(**reserva)
+            ]
+
+    return list(Tarefa.objects.filter(pk__in=ids).order_by('prioridade', 'executar_em', 'id'))
+
+
+def espera(tentativa):
+    """Espera (timedelta) antes da próxima tentativa após a `tentativa`-ésima falha."""
+    base = getattr(settings, 'TAREFAS_BACKOFF_BASE', 10)
+    maximo = getattr(settings, 'TAREFAS_BACKOFF_MAXIMO', 3600)
+    segundos = min(base * 2 ** (tentativa - 1), maximo)
+    return timedelta(seconds=segundos * random.uniform(0.8, 1.2))
+
+
+def executar(tarefa_reservada):
+    """
+    Executa uma tarefa reservada e grava o resultado.
+
+    Returns:
+        True se a função terminou sem erro, False se falhou e None se foi adiada (Reagendar)
+    """
+    definicao = _registro.get(tarefa_reservada.nome)
+    minhas = Tarefa.objects.filter(
+        pk=tarefa_reservada.pk,
+        status=Tarefa.Status.EXECUTANDO,
+        trabalhador=tarefa_reservada.trabalhador,
+    )
+    try:
+        if definicao is None:
+            raise LookupError(f'Tarefa não registrada: {tarefa_reservada.nome}')
+        definicao.funcao(*tarefa_reservada.args, **tarefa_reservada.kwargs)
+    except Reagendar as adiamento:
+        minhas.update(
+            status=Tarefa.Status.PENDENTE,
+            tentativas=F('tentativas') - 1,
+            trabalhador='',
+            executar_em=timezone.now() + timedelta(seconds=adiamento.atraso),
+        )
+        return None
+    except Exception:
+        erro = traceback.format_exc()
+        if tarefa_reservada.tentativas >= tarefa_reservada.max_tentativas:
+            logger.error('Tarefa %s falhou definitivamente:\n%s', tarefa_reservada, erro)
+            minhas.update(status=Tarefa.Status.FALHOU, erro=erro, concluida_em=timezone.now())
+        else:
+            logger.warning('Tarefa %s falhou; nova tentativa agendada:\n%s', tarefa_reservada, erro)
+            minhas.update(
+                status=Tarefa.Status.PENDENTE,
+                erro=erro,
+                executar_em=timezone.now() + espera(tarefa_reservada.tentativas),
+            )
+        return False
+
+    minhas.update(status=Tarefa.Status.CONCLUIDA, concluida_em=timezone.now())
+    return True
+
+
+def devolver(tarefas):
+    """Devolve à fila tarefas reservadas e não iniciadas (sem contar tentativa)."""
+    Tarefa.objects.filter(
+        pk__in=[t.pk for t in tarefas],
+        status=Tarefa.Status.EXECUTANDO,
+    ).update(status=Tarefa.Status.PENDENTE, tentativas=F('tentativas') - 1, trabalhador='')
+
+
+def recuperar_travadas():
+    """
+    Devolve à fila as tarefas em execução há mais de TAREFAS_TIMEOUT.
+
+    Cobre workers encerrados no meio de uma tarefa (deploy, falta de memória).
+
+    Returns:
+        int: Tarefas reagendadas ou marcadas como FALHOU
+    """
+    limite = timezone.now() - timedelta(seconds=getattr(settings, 'TAREFAS_TIMEOUT', 600))
+    travadas = Tarefa.objects.filter(status=Tarefa.Status.EXECUTANDO, iniciada_em__lt=limite)
+    erro = 'Execução interrompida (excedeu TAREFAS_TIMEOUT).'
+    falhas = travadas.filter(tentativas__gte=F('max_tentativas')).update(
+        status=Tarefa.Status.FALHOU, erro=erro, concluida_em=timezone.now()
+    )
+    reagendadas = travadas.update(status=Tarefa.Status.PENDENTE, erro=erro, trabalhador='')
+    return falhas + reagendadas
+
+
+def limpar(dias=None):
+    """
+    Remove as tarefas concluídas há mais de `dias` (padrão TAREFAS_RETENCAO_DIAS).
+
+    Tarefas que falharam ficam para análise no admin.
+
+    Returns:
+        int: Tarefas removidas
+    """
+    if dias is None:
+        dias = getattr(settings, 'TAREFAS_RETENCAO_DIAS', 7)
+    removidas, _ = Tarefa.objects.filter(
+        status=Tarefa.Status.CONCLUIDA,
+        concluida_em__lt=timezone.now() - timedelta(days=dias),
+    ).delete()
+    return removidas
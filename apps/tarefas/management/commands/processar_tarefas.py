@@ -0,0 +1,100 @@
+"""
+Comando: worker da fila de tarefas.
+
+Reserva lotes de tarefas prontas (prioridade, depois ordem de agendamento),
+executa uma a uma e, sem tarefas, espera `--intervalo` segundos. A cada
+minuto devolve à fila as tarefas de workers interrompidos e, a cada hora,
+remove as concluídas além de TAREFAS_RETENCAO_DIAS.
+
+SIGTERM/SIGINT terminam a tarefa atual, devolvem o resto do lote à fila e
+encerram. Vários workers (processos ou máquinas) podem rodar juntos.
+
+Uso:
+    python manage.py processar_tarefas
+    python manage.py processar_tarefas --lote 20 --intervalo 0.5
+    python manage.py processar_tarefas --uma-vez
+"""
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from apps.tarefas import fila
+
+# Intervalos da manutenção (segundos)
+INTERVALO_RECUPERACAO = 60
+INTERVALO_LIMPEZA = 60 * 60
+
+
+class Command(BaseCommand):
+    help = 'Executa as tarefas em segundo plano enfileiradas no banco.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=10,
+            help='Tarefas reservadas por vez (padrão: 10).',
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=1.0,
+            help='Espera (segundos) quando a fila está vazia (padrão: 1).',
+        )
+        parser.add_argument(
+            '--uma-vez',
+            action='store_true',
+            help='Executa as tarefas prontas e encerra.',
+        )
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1 or options['intervalo'] <= 0:
+            raise CommandError('--lote deve ser >= 1 e --intervalo > 0.')
+
+        trabalhador = f'{socket.gethostname()}:{os.getpid()}'
+        parar = threading.Event()
+        for sinal in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sinal, lambda *_: parar.set())
+
+        self.stdout.write(f'Worker {trabalhador} iniciado.')
+        proxima_recuperacao = proxima_limpeza = 0.0
+        executadas = falhas = 0
+
+        while not parar.is_set():
+            agora = time.monotonic()
+            if agora >= proxima_recuperacao:
+                recuperadas = fila.recuperar_travadas()
+                if recuperadas:
+                    self.stderr.write(f'{recuperadas} tarefas interrompidas devolvidas à fila.')
+                proxima_recuperacao = agora + INTERVALO_RECUPERACAO
+            if agora >= proxima_limpeza:
+                fila.limpar()
+                proxima_limpeza = agora + INTERVALO_LIMPEZA
+
+            lote = fila.reservar(trabalhador, options['lote'])
+            if not lote:
+                if options['uma_vez']:
+                    break
+                close_old_connections()
+                parar.wait(options['intervalo'])
+                continue
+
+            for indice, tarefa in enumerate(lote):
+                if parar.is_set():
+                    fila.devolver(lote[indice:])
+                    break
+                resultado = fila.executar(tarefa)
+                if resultado:
+                    executadas += 1
+                elif resultado is False:
+                    falhas += 1
+                close_old_connections()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Worker {trabalhador} encerrado: {executadas} tarefas executadas, {falhas} falhas.'
+        ))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:11
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tarefa',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=200, verbose_name='nome')),
+                ('args', models.JSONField(blank=True, default=list, verbose_name='argumentos')),
+                ('kwargs', models.JSONField(blank=True, default=dict, verbose_name='argumentos nomeados')),
+                ('prioridade', models.SmallIntegerField(default=5, verbose_name='prioridade')),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('EXECUTANDO', 'Executando'), ('CONCLUIDA', 'Concluída'), ('FALHOU', 'Falhou')], default='PENDENTE', max_length=20, verbose_name='status')),
+                ('tentativas', models.PositiveSmallIntegerField(default=0, verbose_name='tentativas')),
+                ('max_tentativas', models.PositiveSmallIntegerField(default=5, verbose_name='máximo de tentativas')),
+                ('executar_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='executar em')),
+                ('trabalhador', models.CharField(blank=True, max_length=100, verbose_name='trabalhador')),
+                ('erro', models.TextField(blank=True, verbose_name='erro')),
+                ('criada_em', models.DateTimeField(auto_now_add=True, verbose_name='criada em')),
+                ('iniciada_em', models.DateTimeField(blank=True, null=True, verbose_name='iniciada em')),
+                ('concluida_em', models.DateTimeField(blank=True, null=True, verbose_name='concluída em')),
+            ],
+            options={
+                'verbose_name': 'tarefa',
+                'verbose_name_plural': 'tarefas',
+                'ordering': ['-criada_em'],
+                'indexes': [models.Index(condition=models.Q(('status', 'PENDENTE')), fields=['prioridade', 'executar_em', 'id'], name='tarefa_pendentes_idx'), models.Index(fields=['status', 'concluida_em'], name='tarefa_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,120 @@
+"""
+Modelos da fila de tarefas do sistema YpeTec.
+
+Este módulo contém:
+- Tarefa: execução pendente (ou já feita) de uma função registrada em fila.py
+
+Enfileirar é um INSERT na transação da view: a tarefa só fica visível para o
+worker (`python manage.py processar_tarefas`) quando a transação é confirmada,
+e some junto com ela num rollback.
+"""
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Tarefa(models.Model):
+    """
+    Execução de uma tarefa em segundo plano.
+
+    Atributos:
+        nome: Nome da função registrada (ver fila.tarefa)
+        args / kwargs: Argumentos da chamada (JSON)
+        prioridade: Menor executa antes
+        status: Situação atual
+        tentativas: Execuções iniciadas até agora
+        max_tentativas: Após esse número de falhas a tarefa fica como FALHOU
+        executar_em: Não executa antes deste instante (atraso e backoff)
+        trabalhador: Worker que reservou a tarefa (host:pid)
+        erro: Traceback da última falha
+    """
+
+    class Status(models.TextChoices):
+        """Situação da tarefa."""
+        PENDENTE = 'PENDENTE', 'Pendente'
+        EXECUTANDO = 'EXECUTANDO', 'Executando'
+        CONCLUIDA = 'CONCLUIDA', 'Concluída'
+        FALHOU = 'FALHOU', 'Falhou'
+
+    class Prioridade(models.IntegerChoices):
+        """Prioridades usuais (menor executa antes)."""
+        ALTA = 0, 'Alta'
+        NORMAL = 5, 'Normal'
+        BAIXA = 9, 'Baixa'
+
+    nome = models.CharField(
+        'nome',
+        max_length=200,
+    )
+    args = models.JSONField(
+        'argumentos',
+        default=list,
+        blank=True,
+    )
+    kwargs = models.JSONField(
+        'argumentos nomeados',
+        default=dict,
+        blank=True,
+    )
+    prioridade = models.SmallIntegerField(
+        'prioridade',
+        default=Prioridade.NORMAL,
+    )
+    status = models.CharField(
+        'status',
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDENTE,
+    )
+    tentativas = models.PositiveSmallIntegerField(
+        'tentativas',
+        default=0,
+    )
+    max_tentativas = models.PositiveSmallIntegerField(
+        'máximo de tentativas',
+        default=5,
+    )
+    executar_em = models.DateTimeField(
+        'executar em',
+        default=timezone.now,
+    )
+    trabalhador = models.CharField(
+        'trabalhador',
+        max_length=100,
+        blank=True,
+    )
+    erro = models.TextField(
+        'erro',
+        blank=True,
+    )
+    criada_em = models.DateTimeField(
+        'criada em',
+        auto_now_add=True,
+    )
+    iniciada_em = models.DateTimeField(
+        'iniciada em',
+        null=True,
+        blank=True,
+    )
+    concluida_em = models.DateTimeField(
+        'concluída em',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'tarefa'
+        verbose_name_plural = 'tarefas'
+        ordering = ['-criada_em']
+        indexes = [
+            # Reserva: só as pendentes, na ordem em que o worker as consome
+            models.Index(
+                fields=['prioridade', 'executar_em', 'id'],
+                condition=Q(status='PENDENTE'),
+                name='tarefa_pendentes_idx',
+            ),
+            models.Index(fields=['status', 'concluida_em'], name='tarefa_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.nome} #{self.pk} ({self.get_status_display()})'
@@ -0,0 +1,213 @@
+"""
+Testes do app tarefas.
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import fila
+from .models import Tarefa
+
+# Chamadas recebidas pelas tarefas de teste
+chamadas = []
+
+
+@fila.tarefa(nome='tarefas.testes.registrar', max_tentativas=3)
+def registrar(valor):
+    chamadas.append(valor)
+
+
+@fila.tarefa(nome='tarefas.testes.falhar', max_tentativas=2)
+def falhar():
+    raise ValueError('falha de teste')
+
+
+@fila.tarefa(nome='tarefas.testes.adiar')
+def adiar():
+    raise fila.Reagendar(120, 'limite atingido')
+
+
+@override_settings(TAREFAS_SINCRONAS=False, TAREFAS_BACKOFF_BASE=10, TAREFAS_BACKOFF_MAXIMO=3600)
+class FilaTest(TestCase):
+    """Ciclo de vida de uma tarefa: enfileirar, reservar, executar, devolver e recuperar."""
+
+    def setUp(self):
+        chamadas.clear()
+
+    def _reservar_uma(self, nome, *args):
+        tarefa = fila.enfileirar(nome, args)
+        reservadas = fila.reservar('teste:1', 10)
+        self.assertEqual([t.pk for t in reservadas], [tarefa.pk])
+        return reservadas[0]
+
+    def test_enfileirar_grava_tarefa_pendente(self):
+        tarefa = registrar.enfileirar(7)
+
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, Tarefa.Status.PENDENTE)
+        self.assertEqual(tarefa.args, [7])
+        self.assertEqual(tarefa.max_tentativas, 3)
+        self.assertEqual(tarefa.tentativas, 0)
+        self.assertEqual(chamadas, [])
+
+    def test_enfileirar_tarefa_nao_registrada(self):
+        with self.assertRaises(LookupError):
+            fila.enfileirar('tarefas.testes.inexistente')
+
+    def test_reservar_respeita_prioridade_agendamento_e_limite(self):
+        baixa = fila.enfileirar('tarefas.testes.registrar', [1], prioridade=Tarefa.Prioridade.BAIXA)
+        alta = fila.enfileirar('tarefas.testes.registrar', [2], prioridade=Tarefa.Prioridade.ALTA)
+        fila.enfileirar('tarefas.testes.registrar', [3], atraso=60)
+
+        reservadas = fila.reservar('teste:1', 1)
+        self.assertEqual([t.pk for t in reservadas], [alta.pk])
+        self.assertEqual(reservadas[0].status, Tarefa.Status.EXECUTANDO)
+        self.assertEqual(reservadas[0].tentativas, 1)
+        self.assertEqual(reservadas[0].trabalhador, 'teste:1')
+
+        # A agendada para daqui a um minuto ainda não está pronta
+        self.assertEqual([t.pk for t in fila.reservar('teste:2', 10)], [baixa.pk])
+        self.assertEqual(fila.reservar('teste:3', 10), [])
+
+    def test_executar_conclui(self):
+        tarefa = self._reservar_uma('tarefas.testes.registrar', 'a')
+
+        self.assertIs(fila.executar(tarefa), True)
+
+        tarefa.refresh_from_db()
+        self.assertEqual(chamadas, ['a'])
+        self.assertEqual(tarefa.status, Tarefa.Status.CONCLUIDA)
+        self.assertIsNotNone(tarefa.concluida_em)
+
+    def test_reagendar_nao_conta_tentativa(self):
+        tarefa = self._reservar_uma('tarefas.testes.adiar')
+        antes = timezone.now()
+
+        self.assertIsNone(fila.executar(tarefa))
+
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, Tarefa.Status.PENDENTE)
+        self.assertEqual(tarefa.tentativas, 0)
+        self.assertEqual(tarefa.trabalhador, '')
+        self.assertEqual(tarefa.erro, '')
+        self.assertGreaterEqual(tarefa.executar_em, antes + timedelta(seconds=120))
+
+    def test_falha_reagenda_com_espera_exponencial(self):
+        tarefa = self._reservar_uma('tarefas.testes.falhar')
+        antes = timezone.now()
+
+        with self.assertLogs('apps.tarefas.fila', 'WARNING'):
+            self.assertIs(fila.executar(tarefa), False)
+
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, Tarefa.Status.PENDENTE)
+        self.assertEqual(tarefa.tentativas, 1)
+        self.assertIn('falha de teste', tarefa.erro)
+        # Primeira falha: TAREFAS_BACKOFF_BASE (10s) com variação de 20%
+        self.assertGreaterEqual(tarefa.executar_em, antes + timedelta(seconds=8))
+        self.assertLessEqual(tarefa.executar_em, timezone.now() + timedelta(seconds=12))
+
+    def test_falha_apos_max_tentativas(self):
+        tarefa = self._reservar_uma('tarefas.testes.falhar')
+        with self.assertLogs('apps.tarefas.fila', 'WARNING'):
+            fila.executar(tarefa)
+        Tarefa.objects.filter(pk=tarefa.pk).update(executar_em=timezone.now())
+        tarefa = fila.reservar('teste:1', 10)[0]
+        self.assertEqual(tarefa.tentativas, 2)
+
+        with self.assertLogs('apps.tarefas.fila', 'ERROR'):
+            self.assertIs(fila.executar(tarefa), False)
+
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, Tarefa.Status.FALHOU)
+        self.assertIsNotNone(tarefa.concluida_em)
+        self.assertEqual(fila.reservar('teste:1', 10), [])
+
+    def test_espera_dobra_ate_o_maximo(self):
+        for tentativa, segundos in ((1, 10), (2, 20), (4, 80), (20, 3600)):
+            with self.subTest(tentativa=tentativa):
+                espera = fila.espera(tentativa).total_seconds()
+                self.assertGreaterEqual(espera, segundos * 0.8)
+                self.assertLessEqual(espera, segundos * 1.2)
+
+    def test_devolver_nao_conta_tentativa(self):
+        tarefa = self._reservar_uma('tarefas.testes.registrar', 'b')
+
+        fila.devolver([tarefa])
+
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, Tarefa.Status.PENDENTE)
+        self.assertEqual(tarefa.tentativas, 0)
+        self.assertEqual(tarefa.trabalhador, '')
+        self.assertEqual(chamadas, [])
+
+    @override_settings(TAREFAS_TIMEOUT=600)
+    def test_recuperar_travadas(self):
+        recente = self._reservar_uma('tarefas.testes.registrar', 'recente')
+        travada = self._reservar_uma('tarefas.testes.registrar', 'travada')
+        esgotada = self._reservar_uma('tarefas.testes.registrar', 'esgotada')
+        antigo = timezone.now() - timedelta(seconds=601)
+        Tarefa.objects.filter(pk__in=[travada.pk, esgotada.pk]).update(iniciada_em=antigo)
+        Tarefa.objects.filter(pk=esgotada.pk).update(tentativas=3)
+
+        self.assertEqual(fila.recuperar_travadas(), 2)
+
+        status = dict(Tarefa.objects.values_list('pk', 'status'))
+        self.assertEqual(status[recente.pk], Tarefa.Status.EXECUTANDO)
+        self.assertEqual(status[travada.pk], Tarefa.Status.PENDENTE)
+        self.assertEqual(status[esgotada.pk], Tarefa.Status.FALHOU)
+
+    def test_limpar_remove_so_concluidas_antigas(self):
+        antiga, recente, falhou = (registrar.enfileirar(i) for i in range(3))
+        agora = timezone.now()
+        Tarefa.objects.filter(pk=antiga.pk).update(
+            status=Tarefa.Status.CONCLUIDA, concluida_em=agora - timedelta(days=8),
+        )
+        Tarefa.objects.filter(pk=recente.pk).update(
+            status=Tarefa.Status.CONCLUIDA, concluida_em=agora - timedelta(days=1),
+        )
+        Tarefa.objects.filter(pk=falhou.pk).update(
+            status=Tarefa.Status.FALHOU, concluida_em=agora - timedelta(days=8),
+        )
+
+        self.assertEqual(fila.limpar(dias=7), 1)
+        self.assertCountEqual(
+            Tarefa.objects.values_list('pk', flat=True), [recente.pk, falhou.pk],
+        )
+
+    def test_worker_executa_tarefas_prontas(self):
+        registrar.enfileirar('c')
+        registrar.enfileirar('d')
+
+        call_command('processar_tarefas', uma_vez=True, stdout=StringIO(), stderr=StringIO())
+
+        self.assertEqual(chamadas, ['c', 'd'])
+        self.assertFalse(Tarefa.objects.exclude(status=Tarefa.Status.CONCLUIDA).exists())
+
+
+@override_settings(TAREFAS_SINCRONAS=True)
+class FilaSincronaTest(TestCase):
+    """TAREFAS_SINCRONAS: a tarefa roda após o commit, sem passar pela fila."""
+
+    def setUp(self):
+        chamadas.clear()
+
+    def test_executa_apos_o_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNone(registrar.enfileirar('e'))
+            self.assertEqual(chamadas, [])
+
+        self.assertEqual(chamadas, ['e'])
+        self.assertFalse(Tarefa.objects.exists())
+
+    def test_reagendar_grava_na_fila(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            adiar.enfileirar()
+
+        tarefa = Tarefa.objects.get()
+        self.assertEqual(tarefa.nome, 'tarefas.testes.adiar')
+        self.assertEqual(tarefa.status, Tarefa.Status.PENDENTE)
+        self.assertGreater(tarefa.executar_em, timezone.now() + timedelta(seconds=60))
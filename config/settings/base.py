@@ -31,12 +31,14 @@ THIRD_PARTY_APPS = [
 
 LOCAL_APPS = [
     'apps.core',
+    'apps.tarefas',
     'apps.contas',
     'apps.editais',
     'apps.projetos',
     'apps.avaliacoes',
     'apps.mentorias',
     'apps.publicacoes',
+    'apps.busca',
     'apps.home',
 ]
 
@@ -50,12 +52,16 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core.middleware.AuditoriaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
 
+# Runner com `manage.py test --index-report` (uso dos índices parciais)
+TEST_RUNNER = 'apps.core.test_runner.RelatorioIndicesRunner'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -105,6 +111,25 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'uploads/'
 MEDIA_ROOT = BASE_DIR / 'uploads'
 
+# Uploads nomeados pelo sha256 do conteúdo, em subpastas por prefixo do hash
+# (apps.core.storage); `migrar_logos` converte os logos antigos
+STORAGES = {
+    'default': {
+        'BACKEND': 'apps.core.storage.ConteudoEnderecadoStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Envio dos uploads (apps.core.midia): '' pelo worker (sendfile), 'x-accel' (nginx) ou
+# 'x-sendfile' (Apache/lighttpd) quando há um proxy na frente
+MIDIA_SENDFILE = os.environ.get('MIDIA_SENDFILE', '')
+# Location `internal` do nginx apontando para MEDIA_ROOT (modo x-accel)
+MIDIA_X_ACCEL_PREFIXO = os.environ.get('MIDIA_X_ACCEL_PREFIXO', '/uploads-internos/')
+# max-age dos uploads cujo nome não deriva do conteúdo (segundos)
+MIDIA_MAX_AGE = int(os.environ.get('MIDIA_MAX_AGE', '3600'))
+
 # Autenticacao (templates)
 LOGIN_URL = '/auth/login/'
 LOGIN_REDIRECT_URL = '/'
@@ -118,8 +143,9 @@ AUTH_USER_MODEL = 'contas.Usuario'
 
 # Configuração do Django REST Framework
 REST_FRAMEWORK = {
+    # Leituras montam o usuário a partir das claims do token, sem consultar o banco
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.contas.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -127,6 +153,10 @@ REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
     ],
+    # Paginação por cursor opcional: só ativa com ?cursor= ou ?page_size=,
+    # mantendo arrays simples para o frontend legado
+    'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.CursorOpcionalPagination',
+    'PAGE_SIZE': 50,
     'EXCEPTION_HANDLER': 'rest_framework.views.exception_handler',
 }
 
@@ -151,13 +181,115 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'id',
 }
 
-# Cache (usado para tokens de reset de senha)
+# Cache compartilhado entre os workers do gunicorn
+# CACHE_BACKEND escolhe o backend:
+#   file   - arquivos em CACHE_DIR (padrão; compartilhado entre workers do mesmo host)
+#   db     - tabela no banco (requer `python manage.py createcachetable`)
+#   redis  - Redis em REDIS_URL (padrão quando REDIS_URL existe; requer o pacote redis)
+#   locmem - memória do processo (não compartilhado; apenas para testes)
+# Namespaces por app: apps.core.cache.CacheNamespace
+REDIS_URL = os.environ.get('REDIS_URL')
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'redis' if REDIS_URL else 'file')
+
+CACHE_BACKENDS = {
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_DIR', str(BASE_DIR / '.cache')),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'ypetec_cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    },
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ypetec',
+    },
+}
+
+# Dados gravados por um processo e lidos por outro, possivelmente em outro host (tokens
+# de redefinição de senha: a API grava, o worker da fila envia o email): com file ou
+# locmem, que não são vistos de outro host, ficam na tabela do backend db
+CACHE_BACKEND_COMPARTILHADO = CACHE_BACKEND if CACHE_BACKEND in ('db', 'redis') else 'db'
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-    }
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        'KEY_PREFIX': 'ypetec',
+        # Incrementar CACHE_VERSION descarta todas as chaves (ex.: mudança de formato)
+        'VERSION': int(os.environ.get('CACHE_VERSION', '1')),
+    },
+    'compartilhado': {
+        **CACHE_BACKENDS[CACHE_BACKEND_COMPARTILHADO],
+        'KEY_PREFIX': 'ypetec',
+        'VERSION': int(os.environ.get('CACHE_VERSION', '1')),
+    },
 }
 
+# Auditoria: logs gravados em lote por uma thread de cada worker (apps.core.auditoria)
+AUDITORIA_SINCRONA = os.environ.get('AUDITORIA_SINCRONA', 'False') == 'True'
+AUDITORIA_TAMANHO_LOTE = int(os.environ.get('AUDITORIA_TAMANHO_LOTE', '200'))
+AUDITORIA_INTERVALO = float(os.environ.get('AUDITORIA_INTERVALO', '2'))
+AUDITORIA_CAPACIDADE = int(os.environ.get('AUDITORIA_CAPACIDADE', '10000'))
+# Período exibido por padrão no admin e mantido na tabela principal (dias)
+AUDITORIA_DIAS_RECENTES = int(os.environ.get('AUDITORIA_DIAS_RECENTES', '90'))
+# Logs mais antigos que isto vão para arquivos JSONL comprimidos (arquivar_auditoria)
+AUDITORIA_RETENCAO_DIAS = int(os.environ.get('AUDITORIA_RETENCAO_DIAS', '730'))
+AUDITORIA_DIR_ARQUIVO = os.environ.get('AUDITORIA_DIR_ARQUIVO', str(BASE_DIR / 'arquivo' / 'auditoria'))
+# Cabeçalho (chave de request.META) com o IP do cliente
+AUDITORIA_CABECALHO_IP = 'REMOTE_ADDR'
+# Proxies confiáveis na frente do app: com X-Forwarded-For, o IP usado é o
+# N-ésimo a partir da direita (o anotado pelo proxy mais externo que controlamos)
+AUDITORIA_PROXIES_CONFIAVEIS = int(os.environ.get('AUDITORIA_PROXIES_CONFIAVEIS', '1'))
+
+# Fila de tarefas em segundo plano (apps.tarefas); worker: `python manage.py processar_tarefas`
+# TAREFAS_SINCRONAS executa cada tarefa após o commit, no próprio processo (testes, scripts)
+TAREFAS_SINCRONAS = os.environ.get('TAREFAS_SINCRONAS', 'False') == 'True'
+# Espera antes da nova tentativa: BASE * 2^(tentativa-1) segundos, até MAXIMO
+TAREFAS_BACKOFF_BASE = int(os.environ.get('TAREFAS_BACKOFF_BASE', '10'))
+TAREFAS_BACKOFF_MAXIMO = int(os.environ.get('TAREFAS_BACKOFF_MAXIMO', '3600'))
+# Tarefa em execução há mais que isto (segundos) volta para a fila (worker interrompido)
+TAREFAS_TIMEOUT = int(os.environ.get('TAREFAS_TIMEOUT', '600'))
+# Tarefas concluídas são removidas após estes dias
+TAREFAS_RETENCAO_DIAS = int(os.environ.get('TAREFAS_RETENCAO_DIAS', '7'))
+
+# Processos do gunicorn (lido também pelo start.sh e pelo Procfile)
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', '2'))
+
+# Controle de admissão (apps.core.admissao): requisições simultâneas por operação
+# (padrão: todos os workers síncronos menos um, que fica livre para o resto do site);
+# o excedente espera uma vez ADMISSAO_ESPERA segundos e depois recebe 503 + Retry-After
+ADMISSAO_VAGAS = {
+    'submissao': int(
+        os.environ.get('ADMISSAO_VAGAS_SUBMISSAO', max(1, WEB_CONCURRENCY - 1))
+    ),
+}
+ADMISSAO_ESPERA = float(os.environ.get('ADMISSAO_ESPERA', '0.5'))
+ADMISSAO_RETRY_AFTER = int(os.environ.get('ADMISSAO_RETRY_AFTER', '5'))
+ADMISSAO_TTL = int(os.environ.get('ADMISSAO_TTL', '30'))
+
+# Registros soft-deleted há mais que isto são removidos por purge_soft_deleted (dias)
+EXCLUSAO_RETENCAO_DIAS = int(os.environ.get('EXCLUSAO_RETENCAO_DIAS', '180'))
+
+# Email: SMTP do Resend por padrão (senha = RESEND_API_KEY); enviado pelo worker
+# da fila de tarefas com conexão persistente (apps.core.email)
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.resend.com')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', '587'))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', 'resend')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', os.environ.get('RESEND_API_KEY', ''))
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'True') == 'True'
+EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', '10'))
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'YpeTec <onboarding@resend.dev>')
+# Emails por minuto para um mesmo domínio de destino (0 desativa o limite)
+EMAIL_LIMITE_POR_DOMINIO = int(os.environ.get('EMAIL_LIMITE_POR_DOMINIO', '30'))
+# Segundos sem uso antes de reabrir a conexão SMTP do worker
+EMAIL_CONEXAO_OCIOSA = int(os.environ.get('EMAIL_CONEXAO_OCIOSA', '60'))
+
 # URL da aplicação frontend (para links de reset de senha)
 APP_URL = os.environ.get('APP_URL', 'http://localhost:3000')
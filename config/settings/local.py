@@ -33,7 +33,9 @@ else:
 CORS_ALLOW_ALL_ORIGINS = True
 
 # Email - console backend para desenvolvimento
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+# (EMAIL_BACKEND=django.core.mail.backends.filebased.EmailBackend grava em EMAIL_FILE_PATH)
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_FILE_PATH = os.environ.get('EMAIL_FILE_PATH', str(BASE_DIR / 'emails'))  # noqa: F405
 
 # Logging mais verboso em desenvolvimento
 LOGGING = {
@@ -56,6 +56,10 @@ CSRF_COOKIE_SECURE = True
 # Sem este header, SECURE_SSL_REDIRECT causa loop infinito de redirecionamento.
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 
+# Atrás do proxy, o IP do cliente (auditoria) vem do X-Forwarded-For, na posição
+# anotada pelo proxy (AUDITORIA_PROXIES_CONFIAVEIS a partir da direita)
+AUDITORIA_CABECALHO_IP = 'HTTP_X_FORWARDED_FOR'
+
 # Logging estruturado para produção
 LOGGING = {
     'version': 1,
@@ -90,7 +94,9 @@ LOGGING = {
 }
 
 # WhiteNoise - compressão e cache de arquivos estáticos
+# (uploads continuam no storage endereçado pelo conteúdo definido em base.py)
 STORAGES = {
+    **STORAGES,  # noqa: F405
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     },
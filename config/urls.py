@@ -4,10 +4,14 @@ Configuração de URLs do projeto YpeTec.
 A rota `api/` contém todas as rotas da API REST.
 As demais rotas são para templates (MVT).
 """
+import re
+
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from apps.core.midia import servir_midia
 
 urlpatterns = [
     # Admin Django
@@ -42,18 +46,16 @@ urlpatterns = [
     path('api/', include('apps.avaliacoes.urls')),
     path('api/', include('apps.mentorias.urls')),
     path('api/', include('apps.publicacoes.urls')),
+    path('api/', include('apps.busca.urls')),
+]
+
+# Uploads: Range, ETag e cache longo; envio por sendfile ou pelo proxy (ver core/midia.py)
+# NOTA: No Railway (filesystem efêmero), para produção permanente migrar para S3 ou Cloudinary.
+urlpatterns += [
+    re_path(rf'^{re.escape(settings.MEDIA_URL.lstrip("/"))}(?P<caminho>.+)$', servir_midia),
 ]
 
-# Servir arquivos estáticos e de mídia em desenvolvimento
+# Servir arquivos estáticos em desenvolvimento
+# (em produção o WhiteNoise cuida dos arquivos coletados em STATIC_ROOT)
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATICFILES_DIRS[0])
-else:
-    # Em produção no Railway (filesystem efêmero), servir uploads via Django.
-    # WhiteNoise já cuida dos arquivos estáticos coletados em STATIC_ROOT.
-    # NOTA: Para produção permanente, migrar para S3 ou Cloudinary.
-    from django.urls import re_path
-    from django.views.static import serve
-    urlpatterns += [
-        re_path(r'^uploads/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
-    ]
@@ -6,4 +6,17 @@ export DJANGO_SETTINGS_MODULE=${DJANGO_SETTINGS_MODULE:-config.settings.producti
 
 python manage.py collectstatic --no-input
 python manage.py migrate --no-input
-exec gunicorn config.wsgi:application --bind 0.0.0.0:${PORT:-8000} --workers 2 --timeout 120 --access-logfile - --error-logfile -
+python manage.py createcachetable
+# Versões dos logos pendentes: só enfileira (o worker gera; logos inválidos são pulados)
+python manage.py gerar_derivados --enfileirar
+# Worker da fila de tarefas (processar_tarefas) neste mesmo container, reiniciado se cair.
+# Com um serviço worker separado (railway.worker.toml), defina WORKER_EMBUTIDO=0 aqui.
+if [ "${WORKER_EMBUTIDO:-1}" = "1" ]; then
+  (
+    while true; do
+      python manage.py processar_tarefas || echo "processar_tarefas encerrou ($?); reiniciando." >&2
+      sleep 5
+    done
+  ) &
+fi
+exec gunicorn config.wsgi:application --bind 0.0.0.0:${PORT:-8000} --workers ${WEB_CONCURRENCY:-2} --timeout 120 --access-logfile - --error-logfile -